@@ -0,0 +1,96 @@
+"""
+bench_input.py
+
+Game.input() overhead per action: the engine is a no-op stand-in so only
+the FSM dispatch is timed. "before" is Game.py of the baseline commit,
+read with git show and run unchanged (a bound method per state, the state
+parsed from its name, allowed actions matched by a lowercase string loop),
+"after" is the transition table keyed by integer state and action code,
+through the string adapter, input_code and step.
+
+    python benchmarks/bench_input.py
+"""
+
+import pathlib
+import subprocess
+import timeit
+import types
+from euchre_core import Game
+from euchre_core import actions
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+NAMES = ["a", "b", "c", "d"]
+
+# one hand without bidding passes: order, down, a finished trick, score it
+SCRIPT = [("order", None), ("down", None), ("play", "9♣"), ("continue", None), ("continue", None)]
+CODES = [(actions.ACTION_CODES[a], d) for a, d in SCRIPT]
+IDS = [actions.encode_id(a, d) for a, d in SCRIPT]
+
+class NullEngine:
+    """Every trick ends on the first card, every hand on the first trick."""
+    seat = 0
+    dealer = 0
+    dealer_action = None
+    trump = None
+
+    def start_hand(self): pass
+    def next_player(self): pass
+    def order_up(self): pass
+    def go_alone(self): pass
+    def pick_up(self, card): pass
+    def turn_down_card(self): pass
+    def play_card(self, card): pass
+    def add_trick_taken(self, team): pass
+    def set_order(self, start_at): pass
+    def score_hand(self): pass
+    def inc_dealer(self): pass
+    def is_trick_finished(self): return True
+    def is_hand_finished(self): return True
+    def is_game_over(self): return False
+    def trick_winner(self): return 0
+
+# --- before: Game as of the baseline commit, loaded verbatim from git ---
+
+BASELINE = "e38d0db"
+
+def baseline_game():
+    """The Game class of BASELINE, run as a module of the installed package."""
+    source = subprocess.run(["git", "show", f"{BASELINE}:src/euchre_core/Game.py"],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    module = types.ModuleType("euchre_core._baseline_Game")
+    module.__package__ = "euchre_core"
+    exec(compile(source, f"{BASELINE}:src/euchre_core/Game.py", "exec"), module.__dict__)
+    return module.Game
+
+def started(cls):
+    game = cls(NullEngine(), NAMES)
+    game.input("start")
+    return game
+
+def run_strings(game, hands):
+    for _ in range(hands):
+        for action, data in SCRIPT: game.input(action, data)
+
+def run_codes(game, hands):
+    for _ in range(hands):
+        for code, data in CODES: game.input_code(code, data)
+
+def run_ids(game, hands):
+    for _ in range(hands):
+        for action_id in IDS: game.step(action_id)
+
+def report(name, run, cls, hands=20_000):
+    game = started(cls)
+    seconds = min(timeit.repeat(lambda: run(game, hands), number=1, repeat=5))
+    assert game.state == 1
+    per_action = seconds / (hands * len(SCRIPT)) * 1e9
+    print(f"{name:>12}: {per_action:7.1f} ns/action")
+    return per_action
+
+if __name__ == "__main__":
+    before = report("before", run_strings, baseline_game())
+    after = report("after", run_strings, Game)
+    codes = report("input_code", run_codes, Game)
+    ids = report("step", run_ids, Game)
+    print(f"     speedup: {before / after:7.2f}x (strings), {before / codes:.2f}x (codes), {before / ids:.2f}x (ids)")
@@ -0,0 +1,46 @@
+"""
+bench_memory.py
+
+Bytes per live game: many games are played to the middle of a hand (trump
+made, two tricks played) and kept alive, tracemalloc reports what they
+hold. Compares EuchreEngine with CompactEuchreEngine, alone and inside a
+Game.
+
+    python benchmarks/bench_memory.py
+"""
+
+import gc
+import random
+import tracemalloc
+from euchre_core import Game, EuchreEngine, CompactEuchreEngine
+from euchre_core.bots import random_bot
+
+NAMES = ["a", "b", "c", "d"]
+GAMES = 2000
+
+def mid_hand(engine_class, seed):
+    game = Game(engine_class(seed), NAMES)
+    rng = random.Random(seed)
+    while game.state != 5 or game.engine.tricks_played < 2:
+        game.input(*random_bot(game, rng))
+    return game
+
+def per_game(make):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live = [make(seed) for seed in range(GAMES)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before - (len(live) * 8 + 56)) / GAMES
+
+def main():
+    print(f"{GAMES} live games mid-hand, bytes each")
+    for engine_class in (EuchreEngine, CompactEuchreEngine):
+        engine = per_game(lambda seed: mid_hand(engine_class, seed).engine)
+        game = per_game(lambda seed: mid_hand(engine_class, seed))
+        print(f"{engine_class.__name__:>20}  engine {engine:7.0f}  game {game:7.0f}")
+
+if __name__ == "__main__":
+    main()
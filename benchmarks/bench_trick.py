@@ -0,0 +1,85 @@
+"""
+bench_trick.py
+
+Per-trick cost of the rules: build the card table for the trick, ask for
+the playable cards of each seat and find the trick winner. "before" is the
+per-trick construction the engine used to do, "after" indexes the tables
+precompiled in rules.py.
+
+    python benchmarks/bench_trick.py
+"""
+
+import timeit
+from euchre_core.CardTable import CardTable, OPPOSITE
+from euchre_core.rules import EFFECTIVE_SUIT
+
+SUITS = ["♠", "♥", "♣", "♦"]
+RANKS = ["9", "10", "J", "Q", "K", "A"]
+
+HANDS = [
+    ["9♣", "J♦", "A♠", "Q♣", "K♥"],
+    ["10♠", "9♦", "K♣", "J♠", "Q♥"],
+    ["A♦", "10♥", "9♠", "K♦", "Q♠"],
+    ["A♥", "J♣", "10♣", "K♠", "Q♦"],
+]
+TRICK = [(0, "Q♣"), (1, "K♣"), (2, "10♥"), (3, "10♣")]
+TRUMP = "♥"
+
+# --- before: the rules as they were computed per trick / per call ---
+
+def legacy_table(trump, lead):
+    dictionary = {}
+    for suit in SUITS:
+        for rank in RANKS:
+            value = RANKS.index(rank)
+            if suit == trump: value = value + 12
+            if lead != trump and suit == lead: value = value + 6
+            dictionary[f"{rank}{suit}"] = value
+    if trump is not None:
+        dictionary[f"J{trump}"] = 19
+        dictionary[f"J{OPPOSITE[trump]}"] = 18
+    return dictionary
+
+def legacy_effective_suit(card, trump):
+    red = {"♦", "♥"}
+    black = {"♣", "♠"}
+    suit = card[-1]
+    same = (suit in red and trump in red) or (suit in black and trump in black)
+    if trump is not None and card[:-1] == "J" and suit != trump and same:
+        return trump
+    return suit
+
+def legacy_trick():
+    table = legacy_table(TRUMP, TRICK[0][1][-1])
+    lead_card = TRICK[0][1]
+    for hand in HANDS:
+        playable = [c for c in hand if legacy_effective_suit(c, TRUMP) == legacy_effective_suit(lead_card, TRUMP)]
+    best_seat, best_card = TRICK[0]
+    for seat, card in TRICK[1:]:
+        if table[best_card] - table[card] < 0: best_seat, best_card = seat, card
+    return best_seat
+
+# --- after: index the precompiled tables ---
+
+def table_trick():
+    values = CardTable.of(TRUMP, TRICK[0][1][-1]).dictionary
+    effective = EFFECTIVE_SUIT[TRUMP]
+    lead_suit = effective[TRICK[0][1]]
+    for hand in HANDS:
+        playable = [c for c in hand if effective[c] == lead_suit]
+    best_seat, best_card = TRICK[0]
+    best_value = values[best_card]
+    for seat, card in TRICK[1:]:
+        if values[card] > best_value: best_seat, best_value = seat, values[card]
+    return best_seat
+
+def report(name, fn, number=100_000):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5))
+    print(f"{name:>8}: {seconds / number * 1e6:7.2f} us/trick")
+    return seconds
+
+if __name__ == "__main__":
+    assert legacy_trick() == table_trick()
+    before = report("before", legacy_trick)
+    after = report("after", table_trick)
+    print(f" speedup: {before / after:7.2f}x")
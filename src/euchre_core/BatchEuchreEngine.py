@@ -0,0 +1,213 @@
+"""
+BatchEuchreEngine.py
+
+Vectorized trick play for many deals at once. Each deal is a row of NumPy
+arrays (hand masks, trump, current trick, tricks taken, points) and every
+call to `step` plays one card in every unfinished deal. The rules are the
+ones EuchreEngine/MaskEngine use, expressed over the int tables of
+rules.py: legal-play masks, trick winner and score_hand scoring.
+
+Bidding is left to the caller: deal, then `order_up` or `make` with arrays
+produced by the heuristic under test, then `play` the hands out.
+
+Requires numpy (pip install .[batch]).
+"""
+
+from __future__ import annotations
+from typing import Callable, Optional
+import numpy as np
+from .EuchreError import EuchreError
+from .rules import NUM_CARDS, EFFECTIVE, SUIT_MASKS, VALUES
+
+EFFECTIVE_NP = np.array(EFFECTIVE, dtype=np.int8)         # [trump, card]
+SUIT_MASKS_NP = np.array(SUIT_MASKS, dtype=np.int32)      # [trump, suit]
+VALUES_NP = np.array(VALUES, dtype=np.int8)[:4, :4]       # [trump, lead, card]
+CARD_BITS = (1 << np.arange(NUM_CARDS, dtype=np.int32))   # [card]
+
+NO_CARD = -1
+NOBODY = -1
+
+class BatchEuchreEngine:
+    """Trick play for n deals held as arrays, one card per deal per step."""
+    def __init__(self, n: int, seed: Optional[int] = None):
+        self.n = n
+        self._rng = np.random.default_rng(seed)
+        self._rows = np.arange(n)
+        self.points = np.zeros((n, 2), dtype=np.int16)
+        self.dealer = np.zeros(n, dtype=np.int8)
+        self._clear()
+
+    def _clear(self):
+        n = self.n
+        self.hands = np.zeros((n, 4), dtype=np.int32)     # card masks per seat
+        self.upcard = np.full(n, NO_CARD, dtype=np.int8)
+        self.trump = np.zeros(n, dtype=np.int8)
+        self.maker = np.full(n, NOBODY, dtype=np.int8)
+        self.alone = np.full(n, NOBODY, dtype=np.int8)     # seat playing alone
+        self.seat = np.zeros(n, dtype=np.int8)             # seat to play
+        self.trick = np.full((n, 4), NO_CARD, dtype=np.int8)  # card played by each seat
+        self.lead = np.full(n, NO_CARD, dtype=np.int8)     # first card of the trick
+        self.played = np.zeros(n, dtype=np.int8)           # cards in the current trick
+        self.tricks_taken = np.zeros((n, 2), dtype=np.int8)
+        self.done = np.zeros(n, dtype=bool)
+
+    def deal(self):
+        """Shuffle and deal every row the way Deck deals: 5 rounds of 1 card, then the upcard."""
+        self._clear()
+        order = self._rng.random((self.n, NUM_CARDS)).argsort(axis=1)
+
+        for r in range(5):
+            for p in range(4):
+                card = order[:, NUM_CARDS - 1 - (r * 4 + p)]
+                self.hands[:, p] |= CARD_BITS[card]
+
+        self.upcard[:] = order[:, NUM_CARDS - 21]
+
+    def set_deals(self, hands, upcard, dealer=None):
+        """
+        Load explicit deals.
+
+        Args:
+            hands: (n, 4) hand masks.
+            upcard: (n,) upcard indices.
+            dealer: (n,) dealer seats, unchanged if None.
+        """
+        self._clear()
+        self.hands[:] = hands
+        self.upcard[:] = upcard
+        if dealer is not None: self.dealer[:] = dealer
+
+    def order_up(self, maker, discard, alone=None):
+        """
+        The upcard's suit becomes trump, the dealer picks it up and discards.
+
+        Args:
+            maker: (n,) seat that ordered up.
+            discard: (n,) card the dealer discards.
+            alone: (n,) seat going alone or -1.
+        """
+        dealer_hand = self.hands[self._rows, self.dealer]
+        if np.any((dealer_hand & CARD_BITS[discard]) == 0):
+            raise EuchreError("Discard is not in the dealer's hand.")
+
+        self.hands[self._rows, self.dealer] = (dealer_hand & ~CARD_BITS[discard]) | CARD_BITS[self.upcard]
+        self._declare(self.upcard // 6, maker, alone)
+
+    def make(self, trump, maker, alone=None):
+        """
+        Trump is named after the upcard was turned down.
+
+        Args:
+            trump: (n,) suit index.
+            maker: (n,) seat that named trump.
+            alone: (n,) seat going alone or -1.
+        """
+        if np.any(trump == self.upcard // 6):
+            raise EuchreError("Can not declare same suit as downcard.")
+        self._declare(trump, maker, alone)
+
+    def _declare(self, trump, maker, alone):
+        self.trump[:] = trump
+        self.maker[:] = maker
+        self.alone[:] = NOBODY if alone is None else alone
+        self.seat[:] = self._next_seat(self.dealer)
+
+    def _next_seat(self, seat):
+        seat = (seat + 1) % 4
+        sitting_out = (self.alone != NOBODY) & (seat == (self.alone + 2) % 4)
+        return np.where(sitting_out, (seat + 1) % 4, seat).astype(np.int8)
+
+    def legal_mask(self):
+        """(n,) mask of the cards the seat to play may play, 0 for finished rows."""
+        hand = self.hands[self._rows, self.seat]
+        lead = np.maximum(self.lead, 0)
+        follow = hand & SUIT_MASKS_NP[self.trump, EFFECTIVE_NP[self.trump, lead]]
+        playable = np.where((self.lead == NO_CARD) | (follow == 0), hand, follow)
+        return np.where(self.done, 0, playable)
+
+    def step(self, cards):
+        """
+        Play one card in every unfinished row; finished rows are ignored.
+
+        Args:
+            cards: (n,) card index for each row.
+
+        Raises:
+            EuchreError: If a card is not a legal play.
+        """
+        live = ~self.done
+        rows = self._rows[live]
+        cards = np.asarray(cards)[live]
+        seats = self.seat[live]
+
+        if np.any((self.legal_mask()[live] & CARD_BITS[cards]) == 0):
+            raise EuchreError("Card is not a legal play.")
+
+        self.hands[rows, seats] &= ~CARD_BITS[cards]
+        self.trick[rows, seats] = cards
+        self.lead[rows] = np.where(self.played[rows] == 0, cards, self.lead[rows])
+        self.played[rows] += 1
+        self.seat[rows] = self._next_seat(self.seat)[live]
+
+        players = np.where(self.alone == NOBODY, 4, 3)
+        finished = live & (self.played == players)
+        if np.any(finished): self._finish_tricks(self._rows[finished])
+
+    def _finish_tricks(self, rows):
+        trump = self.trump[rows]
+        lead_suit = EFFECTIVE_NP[trump, self.lead[rows]]
+        trick = self.trick[rows]
+        values = VALUES_NP[trump[:, None], lead_suit[:, None], np.maximum(trick, 0)]
+        values = np.where(trick == NO_CARD, -1, values)
+        winner = values.argmax(axis=1).astype(np.int8)
+
+        self.tricks_taken[rows, winner % 2] += 1
+        self.seat[rows] = winner
+        self.trick[rows] = NO_CARD
+        self.lead[rows] = NO_CARD
+        self.played[rows] = 0
+
+        hand_over = rows[self.tricks_taken[rows].sum(axis=1) >= 5]
+        if len(hand_over): self._score(hand_over)
+
+    def _score(self, rows):
+        makers = (self.maker[rows] % 2).astype(np.intp)
+        defenders = 1 - makers
+        made = self.tricks_taken[rows, makers]
+        alone_team = np.where(self.alone[rows] == NOBODY, -1, self.alone[rows] % 2)
+
+        euchred = self.tricks_taken[rows, defenders] > made
+        march = made >= 5
+        team = np.where(euchred, defenders, makers)
+        lone = alone_team == team
+        gained = np.where(euchred | march, np.where(lone, 4, 2), 1)
+
+        self.points[rows, team] += gained.astype(np.int16)
+        self.done[rows] = True
+
+    def play(self, policy: Callable[["BatchEuchreEngine", np.ndarray], np.ndarray]):
+        """
+        Step until every row is finished.
+
+        Args:
+            policy: Called with (engine, legal masks), returns (n,) cards.
+        """
+        while not self.done.all():
+            self.step(policy(self, self.legal_mask()))
+
+    def random_cards(self, legal):
+        """A uniformly random legal card for every row (any card for finished rows)."""
+        has = ((legal[:, None] >> np.arange(NUM_CARDS)) & 1).astype(bool)
+        scores = np.where(has, self._rng.random((self.n, NUM_CARDS)), -1.0)
+        return scores.argmax(axis=1)
+
+    def is_game_over(self):
+        return (self.points >= 10).any(axis=1)
+
+def lowest_cards(_: BatchEuchreEngine, legal):
+    """Deterministic policy, the lowest indexed legal card."""
+    low = legal & -legal
+    return np.log2(np.maximum(low, 1)).astype(np.intp)
+
+def random_cards(engine: BatchEuchreEngine, legal):
+    return engine.random_cards(legal)
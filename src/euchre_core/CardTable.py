@@ -13,28 +13,13 @@ Useful for determining trick winners and AI decisions.
 """
 
 from typing import Optional, Iterable
-
-OPPOSITE = {"♠":"♣", "♥":"♦", "♣":"♠", "♦":"♥"}
-SUITS = ["♠", "♥", "♣", "♦"]
-RANKS = ["9", "10", "J", "Q", "K", "A"]
+from .rules import OPPOSITE, RANKINGS, RANKS, TABLE_SUITS as SUITS, _ranking
 
 class CardTable:
-    def __init__(self, trump: str, lead: str):
-        self.dictionary = {}
-
-        for suit in SUITS:
-            for rank in RANKS:
-                value = RANKS.index(rank)
-                if suit == trump: value = value + 12
-                if lead != trump and suit == lead: value = value + 6
-
-                self.dictionary[f"{rank}{suit}"] = value
-
-        # Override right/left bower
-        if trump is not None:
-            self.dictionary[f"J{trump}"] = 19
-            self.dictionary[f"J{OPPOSITE[trump]}"] = 18
-
+    def __init__(self, trump: Optional[str], lead: Optional[str]):
+        # precompiled in rules.py, shared between tables, do not mutate
+        self.dictionary = RANKINGS.get((trump, lead))
+        if self.dictionary is None: self.dictionary = _ranking(trump, lead)
 
     def compare(self, left: str, right: str) -> int:
         """
@@ -51,7 +36,7 @@ class CardTable:
         """
 
         return self.dictionary[left] - self.dictionary[right]
-   
+
 
     def best_of(self, collection: Iterable[str]):
         collection = list(collection)
@@ -78,8 +63,17 @@ class CardTable:
 
         return worst
 
+    @staticmethod
+    def of(trump: Optional[str], lead: Optional[str]) -> "CardTable":
+        """
+        Shared CardTable for (trump, lead), avoids constructing one per trick.
+        """
+        return CARD_TABLES[(trump, lead)]
+
     def observation(self):
         sb = ""
         for k, v in sorted(self.dictionary.items(), key=lambda x: x[1]):
             sb = sb + f"{k}: {v}\n"
         return sb
+
+CARD_TABLES = {key: CardTable(*key) for key in RANKINGS}
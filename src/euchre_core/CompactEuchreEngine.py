@@ -0,0 +1,370 @@
+"""
+CompactEuchreEngine.py
+
+Small-footprint counterpart of EuchreEngine for keeping many engines
+resident (parked games, search trees). State lives in __slots__ and a few
+fixed-size buffers:
+
+    _hands   array("I") of 4 hand masks
+    _plays   bytearray(20), trick t seat i at t * 4 + i: seat << 5 | card,
+             NO_PLAY for an empty slot
+    _order   bytearray(4), the first _players bytes are player_order
+
+Cards, suits and seats are the small ints of masks.py, so apart from the
+buffers every field is a cached int. Strings are only produced by the
+public methods Game relies on; current_trick, player_order and get_hand
+are views built on access. There is no rng: hand k of a game deals
+deals.py index split_seed(seed, k) % NUM_DEALS, so deals differ from
+EuchreEngine for the same seed. The Zobrist hash is computed on access
+and equals EuchreEngine.hash for the same state.
+"""
+
+from __future__ import annotations
+import random
+from array import array
+from typing import Dict, List, Optional, Tuple
+from .EuchreEngine import EuchreEngine, team_of, partner_of
+from .EuchreError import EuchreError
+from .CardTable import CardTable
+from .cards import card_suit
+from . import deals
+from . import zobrist as Z
+from .masks import NO_TRUMP, CARDS, CARD_INDEX, bits, suit_index, suit_name, to_mask, from_mask, playable_mask, trick_winner
+from .seeds import split_seed
+
+NONE = 255    # no card / no seat
+NO_PLAY = 255
+
+class CompactEuchreEngine:
+    """Pure game engine with compact state, see the module docstring."""
+    __slots__ = (
+        "seed", "_hand_number", "_dealer", "_seat", "_maker", "_trump",
+        "_upcard", "_downcard", "_discard", "_alone", "_players", "_trick_size",
+        "_hands", "_plays", "_order", "_points", "_taken", "dealer_action",
+    )
+
+    def __init__(self, seed: Optional[int] = None):
+        self._hands = array("I", (0, 0, 0, 0))
+        self._plays = bytearray(20)
+        self._order = bytearray(4)
+        self._points = bytearray(2)
+        self._taken = bytearray(2)
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Return to the state of a new CompactEuchreEngine(seed)."""
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self._hand_number = 0
+        self._points[0] = self._points[1] = 0
+        self._dealer = 0
+        self._upcard = NONE
+        self.dealer_action = None
+        self._clear()
+
+    def _clear(self):
+        self._downcard = NONE
+        self._discard = NONE
+        self._alone = 0 # bit per seat that went alone
+        self._hands[0] = self._hands[1] = self._hands[2] = self._hands[3] = 0
+        self._plays[:] = b"\xff" * 20
+        self._trump = NO_TRUMP
+        self._maker = NONE
+        self._taken[0] = self._taken[1] = 0
+        self._trick_size = 0
+        self._seat = (self._dealer + 1) % 4
+        self._players = 4
+        for i in range(4): self._order[i] = (self._seat + i) % 4
+
+    def start_hand(self, deal: Optional[int] = None):
+        """
+        Deal the next hand of the game.
+
+        Args:
+            deal: Deal this deals.py deal index instead.
+        """
+        self._clear()
+        if deal is None: deal = split_seed(self.seed, self._hand_number) % deals.NUM_DEALS
+        self._hand_number += 1
+
+        hands, self._upcard = deals.masks_at(deal)
+        for seat in range(4): self._hands[seat] = hands[seat]
+
+    # -- views --
+
+    @property
+    def trump(self) -> Optional[str]: return suit_name(self._trump)
+
+    @trump.setter
+    def trump(self, suit):
+        index = suit_index(suit)
+        if self._downcard != NONE and index == self._downcard // 6:
+            raise EuchreError(f"Can not declare same suit ({suit}) as downcard ({CARDS[self._downcard]}).")
+        self._trump = index
+        self._maker = self._seat
+
+    @property
+    def maker(self) -> Optional[int]: return None if self._maker == NONE else self._maker
+
+    @property
+    def upcard(self) -> Optional[str]: return None if self._upcard == NONE else CARDS[self._upcard]
+
+    @property
+    def downcard(self) -> Optional[str]: return None if self._downcard == NONE else CARDS[self._downcard]
+
+    @property
+    def discard(self) -> Optional[str]: return None if self._discard == NONE else CARDS[self._discard]
+
+    @property
+    def seat(self) -> int: return self._seat
+
+    @seat.setter
+    def seat(self, value): self._seat = value % 4
+
+    @property
+    def dealer(self) -> int: return self._dealer
+
+    @property
+    def points(self) -> Tuple[int, int]: return (self._points[0], self._points[1])
+
+    @property
+    def tricks_played(self) -> int: return self._taken[0] + self._taken[1]
+
+    @property
+    def taken(self) -> Tuple[int, int]: return (self._taken[0], self._taken[1])
+
+    @property
+    def player_order(self) -> List[int]: return list(self._order[:self._players])
+
+    @property
+    def first_seat(self) -> int: return self._order[0]
+
+    def _trick(self, t: int) -> List[Tuple[int, int]]:
+        """(seat, card index) pairs of trick t."""
+        plays = self._plays
+        return [(plays[i] >> 5, plays[i] & 31) for i in range(t * 4, t * 4 + 4) if plays[i] != NO_PLAY]
+
+    @property
+    def current_trick(self) -> List[Tuple[int, str]]:
+        t = self.tricks_played
+        if t >= 5: return []
+        return [(seat, CARDS[card]) for seat, card in self._trick(t)]
+
+    @property
+    def tricks(self) -> List[List[Tuple[int, str]]]:
+        return [[(seat, CARDS[card]) for seat, card in self._trick(t)] for t in range(5)]
+
+    def get_hand(self, index) -> List[str]:
+        return from_mask(self._hands[index % 4])
+
+    def hand_mask(self, seat: int) -> int:
+        return self._hands[seat % 4]
+
+    # -- rules --
+
+    def is_team_alone(self, team: int) -> bool:
+        return bool(self._alone & (1 << team | 1 << partner_of(team)))
+
+    def turn_down_card(self):
+        self._downcard = self._upcard
+        self._upcard = NONE
+
+    def inc_dealer(self):
+        self._dealer = (self._dealer + 1) % 4
+
+    def order_up(self):
+        self._trump = self._upcard // 6
+        self._maker = self._seat
+
+    def pick_up(self, card):
+        index = CARD_INDEX[card]
+        hand = self._hands[self._dealer]
+        if not hand >> index & 1: raise EuchreError(f"Card '{card}' is not in the dealer's hand.")
+        self._hands[self._dealer] = (hand & ~(1 << index)) | (1 << self._upcard)
+        self._discard = index
+
+    def is_alone(self, seat):
+        return bool(self._alone >> seat & 1)
+
+    def go_alone(self):
+        self._alone |= 1 << self._seat
+        partner = partner_of(self._seat)
+        order = [seat for seat in self._order[:self._players] if seat != partner]
+        self._order[:len(order)] = bytes(order)
+        self._players = len(order)
+
+    def is_sitting_out(self, seat) -> bool:
+        return bool(self._alone >> partner_of(seat) & 1)
+
+    def next_player(self):
+        seat = (self._seat + 1) % 4
+        if self.is_sitting_out(seat): seat = (seat + 1) % 4
+        self._seat = seat
+
+    def set_order(self, start_at):
+        players = 0
+        for i in range(4):
+            seat = (start_at + i) % 4
+            if self.is_sitting_out(seat): continue
+            self._order[players] = seat
+            players += 1
+        self._players = players
+        self._seat = self._order[0]
+
+    def _playable_mask(self) -> int:
+        t = self.tricks_played
+        if t >= 5: return 0
+        lead = self._plays[t * 4] & 31 if self._trick_size else None
+        return playable_mask(self._hands[self._seat], lead, self._trump)
+
+    def playable_cards(self) -> List[str]:
+        return from_mask(self._playable_mask())
+
+    def play_card(self, card):
+        index = CARD_INDEX[card]
+        if not self._playable_mask() >> index & 1:
+            raise EuchreError(f"Card '{card}' is not a legal play.")
+
+        seat = self._seat
+        self._hands[seat] &= ~(1 << index)
+        self._plays[self.tricks_played * 4 + self._trick_size] = seat << 5 | index
+        self._trick_size += 1
+
+    def trick_winner(self):
+        return trick_winner(self._trick(self.tricks_played), self._trump)
+
+    def add_trick_taken(self, team: int):
+        self._taken[team] += 1
+        self._trick_size = 0
+
+    def is_trick_finished(self) -> bool:
+        return self._trick_size == self._players
+
+    def is_hand_finished(self) -> bool:
+        return self.tricks_played >= 5
+
+    def score_hand(self):
+        makers = team_of(self._maker)
+        defenders = (makers + 1) % 2
+        taken = self._taken
+
+        if taken[defenders] > taken[makers]:
+            self._points[defenders] += 4 if self.is_team_alone(defenders) else 2
+        elif taken[makers] < 5:
+            self._points[makers] += 1
+        else:
+            self._points[makers] += 4 if self.is_team_alone(makers) else 2
+
+    def is_game_over(self):
+        return self._points[0] >= 10 or self._points[1] >= 10
+
+    # -- hashing and conversion --
+
+    @property
+    def hash(self) -> int:
+        """Zobrist hash, equal to EuchreEngine.hash of the same state."""
+        key = Z.DEALER[self._dealer] ^ Z.SEAT[self._seat] ^ Z.LEADER[self._order[0]]
+        if self._trump != NO_TRUMP: key ^= Z.TRUMP[self._trump]
+        if self._maker != NONE: key ^= Z.MAKER[self._maker]
+        key ^= Z.POINTS[0][self._points[0]] ^ Z.POINTS[1][self._points[1]]
+        key ^= Z.TAKEN[0][self._taken[0]] ^ Z.TAKEN[1][self._taken[1]]
+        for seat in range(4):
+            if self._alone >> seat & 1: key ^= Z.ALONE[seat]
+            for card in bits(self._hands[seat]): key ^= Z.HAND[seat][card]
+        if self._upcard != NONE: key ^= Z.UPCARD[self._upcard]
+        if self._downcard != NONE: key ^= Z.DOWNCARD[self._downcard]
+        if self._discard != NONE: key ^= Z.DISCARD[self._discard]
+        for t in range(5):
+            for seat, card in self._trick(t): key ^= Z.PLAYED[t][seat][card]
+        return key
+
+    @classmethod
+    def from_engine(cls, engine: EuchreEngine) -> CompactEuchreEngine:
+        """Compact copy of an EuchreEngine's state (its rng is not carried over)."""
+        compact = cls(engine.seed)
+        compact._dealer = engine._dealer
+        compact._seat = engine._seat
+        compact._maker = NONE if engine._maker is None else engine._maker
+        compact._trump = suit_index(engine._trump)
+        compact._upcard = NONE if engine._upcard is None else CARD_INDEX[engine._upcard]
+        compact._downcard = NONE if engine._downcard is None else CARD_INDEX[engine._downcard]
+        compact._discard = NONE if engine._discard is None else CARD_INDEX[engine._discard]
+        compact.dealer_action = engine.dealer_action
+        for seat in engine._alone: compact._alone |= 1 << seat
+
+        order = engine.player_order
+        compact._order[:len(order)] = bytes(order)
+        compact._players = len(order)
+        for seat in range(4): compact._hands[seat] = to_mask(engine._hands[seat])
+        for team in (0, 1):
+            compact._points[team] = engine._points[team]
+            compact._taken[team] = engine._tricks_taken[team]
+        for t, trick in enumerate(engine._tricks):
+            for i, (seat, card) in enumerate(trick):
+                compact._plays[t * 4 + i] = seat << 5 | CARD_INDEX[card]
+        compact._trick_size = len(engine.current_trick) if not engine.is_hand_finished() else 0
+        return compact
+
+    def to_engine(self) -> EuchreEngine:
+        """EuchreEngine with this state, seeded with this engine's seed."""
+        engine = EuchreEngine(self.seed)
+        engine._dealer = self._dealer
+        engine._clear()
+        engine._seat = self._seat
+        engine._maker = self.maker
+        engine._trump = self.trump
+        engine._upcard = self.upcard
+        engine._downcard = self.downcard
+        engine._discard = self.discard
+        engine.dealer_action = self.dealer_action
+        engine._alone.extend(seat for seat in range(4) if self._alone >> seat & 1)
+        engine.player_order = self.player_order
+        for seat in range(4): engine._hands[seat].extend(self.get_hand(seat))
+        for t, trick in enumerate(self.tricks): engine._tricks[t].extend(trick)
+        engine._points[:] = self._points
+        engine._tricks_taken[:] = self._taken
+        if self._trick_size:
+            engine.card_table = CardTable.of(engine._trump, card_suit(engine.current_trick[0][1]))
+        engine.rehash()
+        return engine
+
+    # -- observations --
+
+    def observation(self) -> Dict:
+        return {
+            "seat": self._seat,
+            "dealer": self._dealer,
+            "maker": self.maker,
+            "player_order": self.player_order,
+            "hands": [self.get_hand(seat) for seat in range(4)],
+            "trump": self.trump,
+            "upcard": self.upcard,
+            "downcard": self.downcard,
+            "discard": self.discard,
+            "tricks": self.tricks,
+            "taken": list(self._taken),
+            "points": list(self._points),
+        }
+
+    def public_observation(self) -> Dict:
+        """See EuchreEngine.public_observation."""
+        return {
+            "seat": self._seat,
+            "dealer": self._dealer,
+            "maker": self.maker,
+            "alone": tuple(seat for seat in range(4) if self._alone >> seat & 1),
+            "player_order": tuple(self._order[:self._players]),
+            "hand_sizes": tuple(hand.bit_count() for hand in self._hands),
+            "trump": self.trump,
+            "upcard": self.upcard,
+            "downcard": self.downcard,
+            "tricks": tuple(tuple(trick) for trick in self.tricks),
+            "taken": (self._taken[0], self._taken[1]),
+            "points": (self._points[0], self._points[1]),
+        }
+
+    def private_observation(self, seat: int) -> Dict:
+        """See EuchreEngine.private_observation."""
+        return {
+            "hand": tuple(self.get_hand(seat)),
+            "discard": self.discard if seat == self._dealer else None,
+        }
@@ -5,38 +5,161 @@ EuchreEngine.py
 from __future__ import annotations
 import random
 from typing import List, Tuple, Dict, Optional, TypedDict, Literal
-from .cards import effective_suit, card_suit
-from .Deck import Deck
+from .cards import card_suit
 from .EuchreError import EuchreError
 from .CardTable import CardTable
+from .rules import EFFECTIVE_SUIT
+from . import zobrist as Z
+from .masks import CARDS, CARD_INDEX, bits, to_mask
+from . import deals
+from .actions import legal_actions
 import traceback
 
+# (seat, card, hand position, card_table, previous player_order, trick winner)
+UndoRecord = Tuple[int, str, int, CardTable, Optional[List[int]], Optional[int]]
+
+# Flat engine state, see EuchreEngine.snapshot for the field order
+Snapshot = Tuple
+
 class EuchreEngine:
     """Pure game engine. No bot logic here."""
+    __slots__ = (
+        "seed", "_rng", "_points", "_dealer", "_upcard", "_downcard", "_discard",
+        "_deck", "_alone", "_hands", "_tricks", "_tricks_taken", "_trump", "_seat",
+        "_maker", "player_order", "card_table", "dealer_action", "_zpublic", "_zprivate",
+    )
+
     def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self.dealer_action: Optional[str] = None # "up" or "down", set by Game
         self._rng = random.Random(seed)
         self._points = [0, 0]
         self._dealer = 0
+        self._upcard: Optional[str] = None
+
+        # buffers reused by every hand, see _clear
+        self._deck = list(CARDS)
+        self._alone = [] # list of players that have gone alone
+        self._hands = [[],[],[],[]] # array of hands returned from deck shuffle
+        self._tricks = [[] for _ in range(5)] # array of tricks
+        self._tricks_taken = [0,0] # count of tricks taken for each team
         self._clear()
+        self.rehash()
 
     def _clear(self):
+        """Reset the hand state in place, reusing the hand and trick lists."""
+        self._zpublic = 0 # zobrist hash of what every seat can see
+        self._zprivate = [0, 0, 0, 0] # zobrist hash of what only that seat can see
         self._downcard = None
-        self._alone = [] # list of players that have gone alone
+        self._alone.clear()
         self._discard = None # card discarded by dealer
-        self._hands = [[],[],[],[]] # array of hands returned from deck shuffle
-        self._tricks = [[] for _ in range(5)] # array of tricks
+        for hand in self._hands: hand.clear()
+        for trick in self._tricks: trick.clear()
         self._trump: Optional[str] = None # current trump
-        self._tricks_taken = [0,0] # count of tricks taken for each team
+        self._tricks_taken[0] = self._tricks_taken[1] = 0
         self._seat = (self._dealer + 1) % 4 # the current player performing an action
         self._maker: Optional[int] = None # the player that made trump
-        self.set_order(self._dealer + 1) # order of players performing actions
-        self.card_table = CardTable(None, None) # lookup table for card values        
+        self.player_order = [(i + self._seat) % 4 for i in range(0,4)] # order of players performing actions
+        self.card_table = CardTable.of(None, None) # lookup table for card values
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        Return to the state of a new EuchreEngine(seed) without allocating a
+        new engine.
+        """
+        self.seed = seed
+        self.dealer_action = None
+        self._rng.seed(seed)
+        self._points[0] = self._points[1] = 0
+        self._dealer = 0
+        self._upcard = None
+        self._clear()
+        self.rehash()
 
-    def start_hand(self):
-        self._clear()        
-        deck = Deck()
-        deck.shuffle(self._rng)
-        self._hands, self._upcard = deck.deal()
+    def start_hand(self, deal: Optional[int] = None):
+        """
+        Shuffle and deal in place. Deals the same cards as shuffling a new
+        Deck with the engine's rng.
+
+        Args:
+            deal: Deal this deals.py deal index instead, the rng is not used.
+        """
+        self._clear()
+        hands = self._hands
+
+        if deal is None:
+            deck = self._deck
+            deck[:] = CARDS
+            self._rng.shuffle(deck)
+            for k in range(20): hands[k & 3].append(deck[23 - k])
+            self._upcard = deck[3]
+        else:
+            masks, upcard = deals.masks_at(deal)
+            for hand, mask in zip(hands, masks):
+                for card in bits(mask): hand.append(CARDS[card])
+            self._upcard = CARDS[upcard]
+
+        self.rehash()
+
+    @property
+    def deal_index(self) -> int:
+        """deals.py index of the hand as dealt, the discard back in the dealer's hand."""
+        upcard = self._upcard or self._downcard
+        if upcard is None: raise EuchreError("no deal")
+        hands = [to_mask(hand) for hand in self._hands]
+        for trick in self._tricks:
+            for seat, card in trick: hands[seat] |= 1 << CARD_INDEX[card]
+        # after the played cards, the dealer may have played the upcard
+        if self._discard is not None:
+            hands[self._dealer] = hands[self._dealer] & ~(1 << CARD_INDEX[upcard]) | 1 << CARD_INDEX[self._discard]
+        return deals.index_masks(hands, CARD_INDEX[upcard])
+
+    @property
+    def hash(self) -> int:
+        """64-bit Zobrist hash of the full state, kept up to date incrementally."""
+        private = self._zprivate
+        return self._zpublic ^ private[0] ^ private[1] ^ private[2] ^ private[3]
+
+    def seat_hash(self, seat: int) -> int:
+        """
+        Zobrist hash of what seat can see: everything public, its own hand
+        and, for the dealer, the discard.
+        """
+        return self._zpublic ^ self._zprivate[seat % 4]
+
+    def rehash(self) -> None:
+        """Recompute the Zobrist hash from scratch."""
+        public = Z.DEALER[self._dealer] ^ Z.SEAT[self._seat] ^ Z.LEADER[self.player_order[0]]
+        public ^= Z.suit_key(self._trump) ^ Z.seat_key(Z.MAKER, self._maker)
+        public ^= Z.POINTS[0][self._points[0]] ^ Z.POINTS[1][self._points[1]]
+        public ^= Z.TAKEN[0][self._tricks_taken[0]] ^ Z.TAKEN[1][self._tricks_taken[1]]
+        for seat in self._alone: public ^= Z.ALONE[seat]
+        if self._upcard is not None: public ^= Z.card_key(Z.UPCARD, self._upcard)
+        if self._downcard is not None: public ^= Z.card_key(Z.DOWNCARD, self._downcard)
+        for t, trick in enumerate(self._tricks):
+            for seat, card in trick: public ^= Z.PLAYED[t][seat][CARD_INDEX[card]]
+
+        private = [0, 0, 0, 0]
+        for seat, hand in enumerate(self._hands):
+            for card in hand: private[seat] ^= Z.HAND[seat][CARD_INDEX[card]]
+        if self._discard is not None: private[self._dealer] ^= Z.card_key(Z.DISCARD, self._discard)
+
+        self._zpublic = public
+        self._zprivate = private
+
+    def _move_seat(self, seat: int) -> None:
+        self._zpublic ^= Z.SEAT[self._seat] ^ Z.SEAT[seat]
+        self._seat = seat
+
+    def _set_player_order(self, order: List[int]) -> None:
+        self._zpublic ^= Z.LEADER[self.player_order[0]] ^ Z.LEADER[order[0]]
+        self.player_order = order
+
+    def _set_trump(self, suit: Optional[str], maker: Optional[int]) -> None:
+        self._zpublic ^= Z.suit_key(self._trump) ^ Z.suit_key(suit)
+        self._zpublic ^= Z.seat_key(Z.MAKER, self._maker) ^ Z.seat_key(Z.MAKER, maker)
+        self._trump = suit
+        self._maker = maker
 
 
     @property
@@ -47,8 +170,7 @@ class EuchreEngine:
         if self._downcard is not None and suit == card_suit(self._downcard):
             raise EuchreError(f"Can not declare same suit ({suit}) as downcard ({self._downcard}).")
 
-        self._maker = self._seat
-        self._trump = suit
+        self._set_trump(suit, self._seat)
 
     @property
     def maker(self) -> Optional[int]: return self._maker
@@ -66,20 +188,29 @@ class EuchreEngine:
     def seat(self) -> int: return self._seat
 
     @seat.setter
-    def seat(self, value): self._seat = value % 4
+    def seat(self, value): self._move_seat(value % 4)
 
     @property
     def dealer(self) -> int: return self._dealer
 
+    @property
+    def points(self) -> Tuple[int, int]: return (self._points[0], self._points[1])
+
     @property
     def tricks_played(self): return sum(self._tricks_taken)
 
+    @property
+    def taken(self) -> Tuple[int, int]: return (self._tricks_taken[0], self._tricks_taken[1])
+
     @property
     def first_seat(self): return self.player_order[0]
 
     @property
     def current_trick(self): return self._tricks[self.tricks_played]
 
+    @property
+    def tricks(self): return self._tricks
+
     def get_hand(self, index): 
         return self._hands[index % 4].copy()
 
@@ -87,15 +218,17 @@ class EuchreEngine:
         return team in self._alone or partner_of(team) in self._alone
 
     def turn_down_card(self):
+        self._zpublic ^= Z.card_key(Z.UPCARD, self._upcard) ^ Z.card_key(Z.DOWNCARD, self._upcard)
         self._downcard = self._upcard
         self._upcard = None
 
     def inc_dealer(self):
+        self._zpublic ^= Z.DEALER[self._dealer]
         self._dealer = (self._dealer + 1) % 4
+        self._zpublic ^= Z.DEALER[self._dealer]
 
     def order_up(self):
-        self._trump = card_suit(self._upcard)
-        self._maker = self._seat
+        self._set_trump(card_suit(self._upcard), self._seat)
 
     def pick_up(self, card):
         dealers_hand = self._hands[self.dealer]   
@@ -103,30 +236,158 @@ class EuchreEngine:
         self._discard = card
         dealers_hand.append(self._upcard)     
 
+        hand_keys = Z.HAND[self._dealer]
+        self._zprivate[self._dealer] ^= (
+            hand_keys[CARD_INDEX[card]] ^ hand_keys[CARD_INDEX[self._upcard]] ^ Z.card_key(Z.DISCARD, card)
+        )
+
     def is_alone(self, seat):
         return seat in self._alone
 
     def go_alone(self): 
         self._alone.append(self.seat)
-        self.player_order.remove(partner_of(self.seat))
+        self._zpublic ^= Z.ALONE[self.seat]
+        partner = partner_of(self.seat)
+        self._set_player_order([seat for seat in self.player_order if seat != partner])
 
     def next_player(self):
-        self._seat = (self._seat + 1) % 4
+        seat = (self._seat + 1) % 4
+        if self.is_sitting_out(seat): seat = (seat + 1) % 4
+        self._move_seat(seat)
 
-    def play_card(self, card):
-        if len(self.current_trick) == 0:
-            self.card_table = CardTable(self._trump, card_suit(card))
+    def is_sitting_out(self, seat) -> bool:
+        """True when seat's partner went alone."""
+        return partner_of(seat) in self._alone
 
+    def play_card(self, card):
         if not card in self.playable_cards():
             raise EuchreError(f"Card '{card}' is not a legal play.")
+        self._place_card(card)
+
+    def _place_card(self, card):
+        """play_card without the legality check, for callers that only pass playable cards."""
+        if len(self.current_trick) == 0:
+            self.card_table = CardTable.of(self._trump, card_suit(card))
 
         hand = self._hands[self._seat]
         hand.remove(card)
         self.current_trick.append((self._seat, card))
 
+        index = CARD_INDEX[card]
+        self._zprivate[self._seat] ^= Z.HAND[self._seat][index]
+        self._zpublic ^= Z.PLAYED[self.tricks_played][self._seat][index]
+
+    def apply(self, card) -> UndoRecord:
+        """
+        Play card for the current seat and advance: the next seat plays, or
+        when the trick is complete it is scored and its winner leads.
+
+        Pass the returned record to `undo` to restore the prior state.
+        """
+        seat = self._seat
+        table = self.card_table
+        position = self._hands[seat].index(card) if card in self._hands[seat] else -1
+
+        try:
+            self.play_card(card)
+        except EuchreError:
+            self.card_table = table
+            raise
+
+        if not self.is_trick_finished():
+            self.next_player()
+            return (seat, card, position, table, None, None)
+
+        order = self.player_order
+        winner = self.trick_winner()
+        self.add_trick_taken(team_of(winner))
+        self.set_order(winner)
+        return (seat, card, position, table, order, winner)
+
+    def undo(self, record: UndoRecord) -> None:
+        """
+        Reverse the `apply` that returned record. Records must be undone
+        in reverse order of application.
+        """
+        seat, card, position, table, order, winner = record
+
+        if winner is not None:
+            team = team_of(winner)
+            self._zpublic ^= Z.TAKEN[team][self._tricks_taken[team]] ^ Z.TAKEN[team][self._tricks_taken[team] - 1]
+            self._tricks_taken[team] -= 1
+            self._set_player_order(order)
+
+        self.current_trick.pop()
+        self._hands[seat].insert(position, card)
+        self._move_seat(seat)
+        self.card_table = table
+
+        index = CARD_INDEX[card]
+        self._zprivate[seat] ^= Z.HAND[seat][index]
+        self._zpublic ^= Z.PLAYED[self.tricks_played][seat][index]
+
+    def snapshot(self) -> Snapshot:
+        """
+        Flat, fixed-size record of the engine state (the rng excluded).
+        The record holds only immutable values and shares the card_table.
+        """
+        hands, tricks = self._hands, self._tricks
+        return (
+            self._points[0], self._points[1], self._dealer, self._seat,
+            self._maker, self._trump, self._upcard, self._downcard, self._discard,
+            self.dealer_action, tuple(self._alone), tuple(self.player_order),
+            tuple(hands[0]), tuple(hands[1]), tuple(hands[2]), tuple(hands[3]),
+            tuple(tricks[0]), tuple(tricks[1]), tuple(tricks[2]), tuple(tricks[3]), tuple(tricks[4]),
+            self._tricks_taken[0], self._tricks_taken[1], self.card_table,
+            self._zpublic, tuple(self._zprivate),
+        )
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Return the engine to the state recorded by snapshot.
+        """
+        (p0, p1, self._dealer, self._seat,
+         self._maker, self._trump, self._upcard, self._downcard, self._discard,
+         self.dealer_action, alone, order,
+         h0, h1, h2, h3,
+         t0, t1, t2, t3, t4,
+         k0, k1, self.card_table,
+         self._zpublic, zprivate) = snapshot
+
+        self._points = [p0, p1]
+        self._alone = list(alone)
+        self.player_order = list(order)
+        self._hands = [list(h0), list(h1), list(h2), list(h3)]
+        self._tricks = [list(t0), list(t1), list(t2), list(t3), list(t4)]
+        self._tricks_taken = [k0, k1]
+        self._zprivate = list(zprivate)
+
+    def clone(self, copy_rng: bool = False) -> EuchreEngine:
+        """
+        Independent copy of the engine state.
+
+        Args:
+            copy_rng: Give the clone its own copy of the rng. By default the
+                clone shares this engine's rng, which is enough for rollouts
+                that never deal.
+        """
+        other = EuchreEngine.__new__(EuchreEngine)
+        other.restore(self.snapshot())
+        other.seed = self.seed
+        other._deck = list(CARDS)
+
+        if copy_rng:
+            other._rng = random.Random()
+            other._rng.setstate(self._rng.getstate())
+        else:
+            other._rng = self._rng
+
+        return other
+
     def score_hand(self):
         makers = team_of(self._maker)
         defenders = (makers + 1) % 2
+        before = list(self._points)
 
         if self._tricks_taken[defenders] > self._tricks_taken[makers]:
             if self.is_team_alone(defenders): self._points[defenders] += 4
@@ -137,7 +398,11 @@ class EuchreEngine:
             if self.is_team_alone(makers): self._points[makers] += 4
             else: self._points[makers] += 2
 
+        for team in (0, 1):
+            self._zpublic ^= Z.POINTS[team][before[team]] ^ Z.POINTS[team][self._points[team]]
+
     def add_trick_taken(self, team: int):
+        self._zpublic ^= Z.TAKEN[team][self._tricks_taken[team]] ^ Z.TAKEN[team][self._tricks_taken[team] + 1]
         self._tricks_taken[team] += 1
 
     def is_trick_finished(self) -> bool: 
@@ -147,53 +412,170 @@ class EuchreEngine:
         return self.tricks_played >= 5
 
     def set_order(self, start_at):
-        self.player_order = [(i + start_at) % 4 for i in range(0,4)]
-        self._seat = self.first_seat
+        order = [(i + start_at) % 4 for i in range(0,4)]
+        self._set_player_order([seat for seat in order if not self.is_sitting_out(seat)])
+        self._move_seat(self.first_seat)
 
-    def playable_cards(self):
-        if self.tricks_played >= 5: return []
+    def playable_cards(self) -> Tuple[str, ...]:
+        """The cards the seat to act may play, as a tuple the engine does not change."""
+        if self.tricks_played >= 5: return ()
 
         hand = self._hands[self._seat]
-        if len(self.current_trick) == 0: return hand
-        lead_card = self.current_trick[0][1]
-        playable = []
-
-        for card in hand:
-            if effective_suit(card, self._trump) == effective_suit(lead_card, self._trump):
-                playable.append(card)
+        if len(self.current_trick) == 0: return tuple(hand)
+        effective = EFFECTIVE_SUIT[self._trump]
+        lead_suit = effective[self.current_trick[0][1]]
+        playable = tuple(card for card in hand if effective[card] == lead_suit)
 
         if len(playable) > 0: return playable
-        return hand
+        return tuple(hand)
 
     def trick_winner(self):
+        values = self.card_table.dictionary
         best_seat, best_card = self.current_trick[0]
-        lead_suit = effective_suit(best_card, self._trump)
+        best_value = values[best_card]
 
         for seat, card in self.current_trick[1:]:
-            compare = self.card_table.compare(best_card, card)
-            if compare < 0: best_seat, best_card = seat, card
+            if values[card] > best_value: best_seat, best_value = seat, values[card]
 
         return best_seat
 
     def is_game_over(self):
         return self._points[0] >= 10 or self._points[1] >= 10
 
+    def play_out(self, policies, rng: random.Random, hand_only: bool = False) -> int:
+        """
+        Deal and play to the end of the game (or of the hand) in one loop,
+        making the same engine calls as Game but trusting the policies:
+        actions are not looked up or checked and cards are placed without
+        the playable check. Results equal driving a Game with the same
+        policies and rng, see tournament._play.
+
+        Start on a new engine, or after a finished hand to play the next.
+
+        Args:
+            policies: Two (one per team) or four (one per seat) callables
+                policy(game, rng) -> (action, data), see bots.py. They
+                receive a view with state, engine and legal_actions().
+            rng: Passed to the policies.
+            hand_only: Stop after one hand.
+
+        Returns:
+            int: Hands played.
+        """
+        if len(policies) == 2: policies = [policies[0], policies[1], policies[0], policies[1]]
+        view = _Rollout(self)
+        hands = 0
+
+        while True:
+            if hands or self.is_hand_finished(): self.inc_dealer()
+            self.start_hand()
+            self._bid(policies, rng, view)
+
+            view.state = 5
+            while not self.is_hand_finished():
+                self._place_card(policies[self._seat](view, rng)[1])
+                if not self.is_trick_finished():
+                    self.next_player()
+                else:
+                    winner = self.trick_winner()
+                    self.add_trick_taken(team_of(winner))
+                    self.set_order(winner)
+
+            self.score_hand()
+            hands += 1
+            if hand_only or self.is_game_over(): return hands
+
+    def _bid(self, policies, rng: random.Random, view: _Rollout) -> None:
+        """The bidding of play_out, from the deal to the first lead."""
+        dealer = self._dealer
+        view.state = 1
+        while True:
+            action, data = policies[self._seat](view, rng)
+            if action != "pass": break
+            self.next_player()
+            if self._seat == dealer: break
+
+        if action != "pass":
+            self.order_up()
+            if action == "alone": self.go_alone()
+            self.seat = dealer
+            view.state = 2
+            action, data = policies[dealer](view, rng)
+            self.dealer_action = action
+            if action == "up": self.pick_up(data)
+            self.set_order(dealer + 1)
+            return
+
+        self.turn_down_card()
+        view.state = 3
+        while True:
+            action, data = policies[self._seat](view, rng)
+            if action != "pass": break
+            self.next_player()
+            if self._seat == dealer: view.state = 4
+
+        self._set_trump(data, self._seat)
+        if action == "alone": self.go_alone()
+        self.set_order(dealer + 1)
+
     def observation(self):
+        # copies, the engine reuses its lists from hand to hand
         return {
             "seat": self._seat,
             "dealer": self._dealer,
             "maker": self._maker,
-            "player_order": self.player_order,
-            "hands": self._hands,
+            "player_order": list(self.player_order),
+            "hands": [hand.copy() for hand in self._hands],
             "trump": self._trump,
             "upcard": self._upcard,
             "downcard": self._downcard,
             "discard": self._discard,
-            "tricks": self._tricks,
-            "taken": self._tricks_taken,
+            "tricks": [trick.copy() for trick in self._tricks],
+            "taken": list(self._tricks_taken),
             "points": list(self._points),
         }
+
+    def public_observation(self) -> Dict:
+        """
+        The fields every seat may see, as immutable values that share no
+        state with the engine.
+        """
+        return {
+            "seat": self._seat,
+            "dealer": self._dealer,
+            "maker": self._maker,
+            "alone": tuple(self._alone),
+            "player_order": tuple(self.player_order),
+            "hand_sizes": tuple(len(hand) for hand in self._hands),
+            "trump": self._trump,
+            "upcard": self._upcard,
+            "downcard": self._downcard,
+            "tricks": tuple(tuple(trick) for trick in self._tricks),
+            "taken": tuple(self._tricks_taken),
+            "points": tuple(self._points),
+        }
+
+    def private_observation(self, seat: int) -> Dict:
+        """
+        The fields only seat may see: its hand and, for the dealer, the
+        discard.
+        """
+        return {
+            "hand": tuple(self._hands[seat]),
+            "discard": self._discard if seat == self._dealer else None,
+        }
     
+class _Rollout:
+    """The part of Game that policies read, for EuchreEngine.play_out."""
+    __slots__ = ("engine", "state")
+
+    def __init__(self, engine: EuchreEngine):
+        self.engine = engine
+        self.state = 0
+
+    def legal_actions(self):
+        return legal_actions(self.engine, self.state)
+
 def team_of(player: int):
     return (player % 2)    
 
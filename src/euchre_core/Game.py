@@ -8,28 +8,83 @@ maintains the finite state machine for a euchre game
 
 from .EuchreEngine import EuchreEngine, team_of
 from .EuchreError import EuchreError
-from .cards import card_suit
-from collections.abc import Callable
-from typing import Any
+from .actions import (ACTIONS, ACTION_CODES, START, PASS, ORDER, ALONE,
+                      UP, DOWN, MAKE, PLAY, CONTINUE, ACTION_IDS, ID_CODES, NUM_ACTION_IDS,
+                      legal_actions)
+from .Deck import SUITS
+from typing import Any, Optional
+
+# actions whose data is kept in last_data
+_KEEPS_DATA = frozenset((PLAY, MAKE))
+
+# seat view fields, marked in Game._dirty by the transition that changes them
+(_V_SEAT, _V_DEALER, _V_MAKER, _V_ALONE, _V_ORDER, _V_SIZES, _V_TRUMP,
+ _V_UPCARD, _V_DOWNCARD, _V_TRICKS, _V_TAKEN, _V_POINTS, _V_DISCARD) = (1 << i for i in range(13))
+_V_HAND = 1 << 13 # seat's hand is _V_HAND << seat
+_V_HANDS = 15 << 13
+_V_DEAL = (_V_SEAT | _V_MAKER | _V_ALONE | _V_ORDER | _V_SIZES | _V_TRUMP | _V_UPCARD
+           | _V_DOWNCARD | _V_TRICKS | _V_TAKEN | _V_DISCARD | _V_HANDS)
+
+_PUBLIC_FIELDS = (
+    (_V_SEAT, "seat", lambda engine: engine.seat),
+    (_V_DEALER, "dealer", lambda engine: engine.dealer),
+    (_V_MAKER, "maker", lambda engine: engine.maker),
+    (_V_ALONE, "alone", lambda engine: tuple(seat for seat in range(4) if engine.is_alone(seat))),
+    (_V_ORDER, "player_order", lambda engine: tuple(engine.player_order)),
+    (_V_TRUMP, "trump", lambda engine: engine.trump),
+    (_V_UPCARD, "upcard", lambda engine: engine.upcard),
+    (_V_DOWNCARD, "downcard", lambda engine: engine.downcard),
+    (_V_TRICKS, "tricks", lambda engine: tuple(tuple(trick) for trick in engine.tricks)),
+    (_V_TAKEN, "taken", lambda engine: engine.taken),
+    (_V_POINTS, "points", lambda engine: engine.points),
+)
 
 class Game():
     """
     Manages the overall flow and state of a Euchre game.
     """
 
-    def __init__(self, engine: EuchreEngine, names: list[str]):
+    def __init__(self, engine: EuchreEngine, names: list[str], log: Any = None):
         """
         Initialize the Game object with player names.
 
         Args:
             names (list of str): List of player names.
+            log (GameLog, optional): Receives every accepted input, see actionlog.py.
         """
         self._engine = engine
+        self.log = log
         self._names = names.copy()
-        self._state: Callable[[str, Any], None] = self.state_0
+        self._state: int = 0
         self.last_action: str | None = None
         self.last_data: str | None = None
         self.do_shuffle = True
+        self._legal: Optional[tuple] = None # cached legal_actions(), reset by input()
+        self._legal_mask: Optional[int] = None # cached legal_mask()
+
+        self.version = 0 # bumped by every accepted input and reset, see observation_delta
+        self._live = False # views below are current, kept so by each input
+        self._dirty = 0 # _V_ bits of the view fields the current input changed
+        self._public: dict = {} # public fields of the seat views
+        self._public_changes: dict = {} # field -> version it last changed at
+        self._private: list[dict] = [{}, {}, {}, {}]
+        self._private_changes: list[dict] = [{}, {}, {}, {}]
+
+    def reset(self, seed: Optional[int] = None, log: Any = None) -> None:
+        """
+        Start over as a new game on the same objects: the engine is reset
+        in place to the state of EuchreEngine(seed).
+
+        Args:
+            seed (Optional[int]): Engine seed of the new game.
+            log (GameLog, optional): Log of the new game.
+        """
+        self._engine.reset(seed)
+        self.log = log
+        self._state = 0
+        self.last_action = None
+        self.last_data = None
+        self._changed()
 
     @property
     def state(self) -> int:
@@ -39,7 +94,44 @@ class Game():
         Returns:
             int: Current state number.
         """
-        return int(self._state.__name__[6:])
+        return self._state
+
+    @property
+    def engine(self) -> EuchreEngine:
+        return self._engine
+
+    @property
+    def hash(self) -> int:
+        """
+        Zobrist hash of the engine state, see EuchreEngine.hash.
+        """
+        return self._engine.hash
+
+    def legal_actions(self) -> tuple[tuple[str, str | None], ...]:
+        """
+        Every (action, data) pair input() accepts in the current state,
+        with the concrete cards or suits. Computed once per state change.
+
+        Returns:
+            tuple of (action, data): Empty once the game is over.
+        """
+        if self._legal is None:
+            self._legal = legal_actions(self._engine, self._state)
+        return self._legal
+
+    def legal_mask(self) -> int:
+        """
+        legal_actions() as a bitmask over actions.py action ids: bit i is
+        set when id i is legal.
+
+        Returns:
+            int: 0 once the game is over.
+        """
+        if self._legal_mask is None:
+            mask = 0
+            for action in self.legal_actions(): mask |= 1 << ACTION_IDS[action]
+            self._legal_mask = mask
+        return self._legal_mask
 
     def observation(self):
         return {
@@ -49,6 +141,101 @@ class Game():
             "last_data": self.last_data
         }
 
+    def observation_for(self, seat: int) -> dict:
+        """
+        What seat may know: the public fields, its own hand and, when
+        dealing, the discard. Values are immutable and unchanged fields are
+        shared between calls.
+
+        Args:
+            seat (int): Seat the view is for.
+
+        Returns:
+            dict: The view, with the "version" it is current for.
+        """
+        self._sync_views()
+        return {**self._public, **self._private[seat], "version": self.version}
+
+    def observation_delta(self, since_version: int, seat: int) -> dict:
+        """
+        The fields of observation_for(seat) that changed after since_version.
+        Updating a view taken at since_version with the delta gives the
+        current view.
+
+        Args:
+            since_version (int): The "version" of the view the client holds.
+            seat (int): Seat the view is for.
+
+        Returns:
+            dict: The changed fields and the current "version".
+        """
+        self._sync_views()
+        delta = {key: self._public[key] for key, version in self._public_changes.items() if version > since_version}
+        private = self._private[seat]
+        for key, version in self._private_changes[seat].items():
+            if version > since_version: delta[key] = private[key]
+        delta["version"] = self.version
+        return delta
+
+    def _sync_views(self) -> None:
+        """
+        Build the seat views in full on first use and after a change made
+        outside input(), stamping the fields that differ. From then on each
+        input updates only the fields it marked, see _update_views.
+        """
+        if self._live: return
+        version = self.version
+
+        public = self._engine.public_observation()
+        public["state"] = self._state
+        public["last_action"] = self.last_action
+        public["last_data"] = self.last_data
+        _update(self._public, self._public_changes, public, version)
+
+        for seat in range(4):
+            _update(self._private[seat], self._private_changes[seat],
+                    self._engine.private_observation(seat), version)
+
+        self._live = True
+        self._dirty = 0
+
+    def _update_views(self) -> None:
+        """
+        Recompute the view fields the last input marked in _dirty.
+        """
+        dirty, self._dirty = self._dirty, 0
+        version, engine = self.version, self._engine
+        public, changes = self._public, self._public_changes
+
+        _set(public, changes, "state", self._state, version)
+        _set(public, changes, "last_action", self.last_action, version)
+        _set(public, changes, "last_data", self.last_data, version)
+        for bit, key, field in _PUBLIC_FIELDS:
+            if dirty & bit: _set(public, changes, key, field(engine), version)
+
+        private = self._private
+        if dirty & _V_HANDS:
+            for seat in range(4):
+                if dirty & _V_HAND << seat:
+                    _set(private[seat], self._private_changes[seat], "hand", tuple(engine.get_hand(seat)), version)
+        if dirty & _V_DISCARD:
+            for seat in range(4):
+                discard = engine.discard if seat == engine.dealer else None
+                _set(private[seat], self._private_changes[seat], "discard", discard, version)
+        if dirty & _V_SIZES:
+            sizes = (len(private[0]["hand"]), len(private[1]["hand"]), len(private[2]["hand"]), len(private[3]["hand"]))
+            _set(public, changes, "hand_sizes", sizes, version)
+
+    def _changed(self) -> None:
+        """
+        Invalidate what is derived from the game state, call after any
+        change made outside input(). The views are rebuilt on next read.
+        """
+        self._legal = None
+        self._legal_mask = None
+        self.version += 1
+        self._live = False
+
     def input(self, action: str, data: str | None = None,) -> None:
         """
         Process player input based on the current game state.
@@ -61,26 +248,79 @@ class Game():
         Raises:
             ActionException: If the action or player is invalid.
         """
-        prev_state = self.state
+        code = ACTION_CODES.get(action)
+        if code is None and isinstance(action, str):
+            code = ACTION_CODES.get(action.lower())
+        if code is None:
+            raise EuchreError("Unhandled Action " + str(action))
 
-        self.last_action = action
+        self.input_code(code, data)
 
-        if action in ["play", "make"]:
-            self.last_data = data
-        else:
-            self.last_data = None
+    def input_code(self, code: int, data: str | None = None) -> None:
+        """
+        Process input given as an actions.py action code, without the
+        string lookup of input(). input() and step() both end here.
 
-        self._state(action, data)
+        Args:
+            code (int): Action code, e.g. actions.PLAY.
+            data (Optional[str]): Card or suit for the action.
 
-    def state_0(self, action: str, __: Any) -> None:
+        Raises:
+            EuchreError: If the action is not allowed in the current state
+                or data is not a suit or card it accepts. The game is left
+                as it was.
         """
-        Initial state where the game starts.
+        handler = _TRANSITIONS[self._state][code]
+        if handler is None:
+            raise EuchreError("Unhandled Action " + ACTIONS[code])
+        self._check_data(code, data)
+
+        handler(self, data)
+        self.last_action = ACTIONS[code]
+        self.last_data = data if code in _KEEPS_DATA else None
+        self._legal = None
+        self._legal_mask = None
+        self.version += 1
+        if self._live: self._update_views()
+
+        if self.log is not None:
+            self.log.append(ACTIONS[code], data)
+
+    def _check_data(self, code: int, data: str | None) -> None:
+        """
+        Reject data the handler of code would fail on part way through.
+        Plays and the trump's suit against the down-card are checked by
+        the engine before it changes anything.
+        """
+        if code == UP:
+            engine = self._engine
+            if data not in engine.get_hand(engine.dealer):
+                raise EuchreError(f"'{data}' is not in the dealer's hand.")
+        elif code == MAKE or (code == ALONE and self._state >= 3):
+            if data not in SUITS:
+                raise EuchreError(f"'{data}' is not a suit.")
+
+    def step(self, action_id: int) -> None:
+        """
+        Process input given as an actions.py action id, see actions.encode_id.
 
         Args:
-            action (str): Expected action "start".
-            __: Unused parameter.
+            action_id (int): Id of the (action, data) pair.
+
+        Raises:
+            EuchreError: If the id is out of range or the action is not
+                allowed in the current state.
+        """
+        if not 0 <= action_id < NUM_ACTION_IDS:
+            raise EuchreError(f"Action id {action_id} out of range.")
+        self.input_code(*ID_CODES[action_id])
+
+    # -- transitions, looked up in _TRANSITIONS by (state, action code) --
+
+    def _start(self, _: Any) -> None:
+        """
+        State 0, "start": the game starts.
         """
-        self.allowed_actions(action, "start")
         self.enter_state_1()
 
     def enter_state_1(self) -> None:
@@ -88,52 +328,61 @@ class Game():
         Transition to state 1: Shuffle and deal cards.
         """
         self._engine.start_hand()
-        self._state = self.state_1
+        self._dirty |= _V_DEAL
+        self._state = 1
 
-    def state_1(self, action: str, __: Any) -> None:
+    def _pass_order(self, _: Any) -> None:
         """
-        State 1: Players decide to pass, order up, or go alone.
+        State 1, "pass": the next player decides on the up-card, the dealer
+        passing turns it down.
+        """
+        self._engine.next_player()
+        self._dirty |= _V_SEAT
+        if self._engine.seat == self._engine.dealer:
+            self.enter_state_3()
 
-        Args:
-            action (str): Action to perform ("pass", "order", "alone").
-            __: Unused parameter.
+    def _order(self, _: Any) -> None:
+        """
+        State 1, "order": the up-card is ordered to the dealer.
         """
-        self.allowed_actions(action, "pass", "order", "alone")
+        self._engine.order_up()
+        self._dirty |= _V_TRUMP | _V_MAKER
+        self.enter_state_2()
 
-        if action == "pass":
-            self._engine.next_player()
-            if self._engine.seat == self._engine.dealer:                
-                self.enter_state_3()
-        elif action == "order":  
-            self._engine.order_up()
-            self.enter_state_2()
-        elif action == "alone":
-            self._engine.order_up()
-            self._engine.go_alone()
-            self.enter_state_2()
+    def _order_alone(self, _: Any) -> None:
+        """
+        State 1, "alone": the up-card is ordered and the maker goes alone.
+        """
+        self._engine.order_up()
+        self._engine.go_alone()
+        self._dirty |= _V_TRUMP | _V_MAKER | _V_ALONE | _V_ORDER
+        self.enter_state_2()
 
     def enter_state_2(self) -> None:
         """
         Transition to state 2: Dealer's turn to decide.
         """
         self._engine.seat = self._engine.dealer
-        self._state = self.state_2
+        self._dirty |= _V_SEAT
+        self._state = 2
 
-    def state_2(self, action: str, card: str | None) -> None:
+    def _pick_up(self, card: str | None) -> None:
         """
-        State 2: Dealer decides to pick up the card or pass.
-
-        Args:
-            action (str): Action to perform ("down", "up").
-            card (Card): Card to swap if action is "up".
+        State 2, "up": the dealer swaps card for the up-card.
         """
-        self.allowed_actions(action, "down", "up")
-        self._engine.dealer_action = action
-
-        if action == "up": 
-            self._engine.pick_up(card)
+        self._engine.dealer_action = "up"
+        self._engine.pick_up(card)
+        self._engine.set_order(self._engine.dealer + 1)
+        self._dirty |= _V_HAND << self._engine.dealer | _V_DISCARD | _V_ORDER | _V_SEAT
+        self.enter_state_5()
 
-        self._engine.seat = self._engine.dealer + 1
+    def _leave_down(self, _: Any) -> None:
+        """
+        State 2, "down": the dealer leaves the up-card.
+        """
+        self._engine.dealer_action = "down"
+        self._engine.set_order(self._engine.dealer + 1)
+        self._dirty |= _V_ORDER | _V_SEAT
         self.enter_state_5()
 
     def enter_state_3(self):
@@ -142,74 +391,59 @@ class Game():
         and players begin selecting a trump suit.
         """
         self._engine.turn_down_card()
-        self._state = self.state_3
+        self._dirty |= _V_UPCARD | _V_DOWNCARD
+        self._state = 3
 
-    def state_3(self, action: str, suit: str | None) -> None:
+    def _pass_make(self, _: Any) -> None:
         """
-        State 3: Players decide to pass, make, or go alone for trump.
-
-        Args:
-            action (str): Action to perform ("pass", "make", "alone").
-            suit (str): Trump suit if "make" or "alone".
+        State 3, "pass": the next player names trump, the dealer passing
+        is stuck with it.
         """
-        self.allowed_actions(action, "pass", "make", "alone")
-
-        if action == "pass":
-            self._engine.next_player()
-            if self._engine.seat == self._engine.dealer:                
-                self.enter_state_4()
-        elif action == "make":
-            self._engine.trump = suit
-            self._engine.seat = self._engine.dealer + 1
-            self.enter_state_5()
-        elif action == "alone":
-            self._engine.go_alone()
-            self._engine.trump == suit
-            self._engine.seat = self._engine.dealer + 1
-            self.enter_state_5()
-
+        self._engine.next_player()
+        self._dirty |= _V_SEAT
+        if self._engine.seat == self._engine.dealer:
+            self.enter_state_4()
 
-    def enter_state_4(self) -> None:
+    def _make(self, suit: str | None) -> None:
         """
-        Transition to state 4: Dealer decides to make trump or go alone.
+        States 3 and 4, "make": suit becomes trump.
         """
-        self._state = self.state_4
+        self._engine.trump = suit
+        self._engine.set_order(self._engine.dealer + 1)
+        self._dirty |= _V_TRUMP | _V_MAKER | _V_ORDER | _V_SEAT
+        self.enter_state_5()
 
-    def state_4(self, action: str, suit: str | None) -> None:
+    def _make_alone(self, suit: str | None) -> None:
         """
-        State 4: Dealer decides to make trump or go alone.
-
-        Args:
-            action (str): Action to perform ("make", "alone").
-            suit (str): Trump suit.
+        States 3 and 4, "alone": suit becomes trump and the maker goes alone.
         """
-        self.allowed_actions(action, "make", "alone")
-
-        if action == "alone":
-            self.players.go_alone()
-
         self._engine.trump = suit
-        self._engine.seat = self._engine.dealer + 1
+        self._engine.go_alone()
+        self._engine.set_order(self._engine.dealer + 1)
+        self._dirty |= _V_TRUMP | _V_MAKER | _V_ALONE | _V_ORDER | _V_SEAT
         self.enter_state_5()
 
+    def enter_state_4(self) -> None:
+        """
+        Transition to state 4: Dealer decides to make trump or go alone.
+        """
+        self._state = 4
+
     def enter_state_5(self) -> None:
         """
         Transition to state 5: Players play tricks.
         """
-        self._state = self.state_5
+        self._state = 5
 
-    def state_5(self, action: str, card: str) -> None:
+    def _play(self, card: str) -> None:
         """
-        State 5: Players play cards and score tricks.
-
-        Args:
-            action (str): Expected action "play".
-            card (Card): Card to play.
+        State 5, "play": the seat to act plays card.
         """
-        self.allowed_actions(action, "play")
-        self._engine.play_card(card)               
+        seat = self._engine.seat
+        self._engine.play_card(card)
+        self._dirty |= _V_HAND << seat | _V_SIZES | _V_TRICKS | _V_SEAT
 
-        if not self._engine.is_trick_finished(): 
+        if not self._engine.is_trick_finished():
             self._engine.next_player()
         else:
             self.enter_state_6()
@@ -223,66 +457,39 @@ class Game():
         team = team_of(trick_winner)
         self._engine.add_trick_taken(team)
         self._engine.set_order(trick_winner)
+        self._dirty |= _V_TAKEN | _V_ORDER
 
-        self._state = self.state_6
+        self._state = 6
 
-    def state_6(self, action: str, __: Any) -> None:
+    def _next_trick(self, _: Any) -> None:
         """
-        State 6: Transition to the next trick.
-
-        Args:
-            action (str): Expected action "continue".
-            __: Unused parameter.
+        State 6, "continue": the next trick, or score the hand after the last.
         """
-        self.allowed_actions(action, "continue")
-
-        if not self._engine.is_hand_finished():           
+        if not self._engine.is_hand_finished():
             self.enter_state_5()
         else:
             self._engine.score_hand()
-            self._state = self.state_7
+            self._dirty |= _V_POINTS
+            self._state = 7
 
-    def state_7(self, action: str, __: Any) -> None:
+    def _next_hand(self, _: Any) -> None:
         """
-        State 7: Transition to the next hand.
-
-        Args:
-            action (str): Expected action "continue".
-            __: Unused parameter.
+        State 7, "continue": deal the next hand, unless the game is over.
         """
-        self.allowed_actions(action, "continue")
-
         if self._engine.is_game_over():
-            self._state = self.state_8
+            self._state = 8
         else:
             self._engine.inc_dealer()
+            self._dirty |= _V_DEALER
             self.enter_state_1()
 
-    def state_8(self, _: str, __: Any) -> None:
+    def _game_over(self, _: Any) -> None:
         """
         State 8: Game over, no transitions.
         """
         # pylint: disable=W0107
         pass
 
-    def allowed_actions(self, action: str, *allowed_actions: str) -> None:
-        """
-        Validate if the given action is allowed in the current state.
-
-        Args:
-            action (str): Action to validate.
-            allowed_actions (list of str): List of allowed actions.
-
-        Raises:
-            ActionException: If the action is not allowed.
-        """
-
-        for allowed in allowed_actions:
-            if action.lower() == allowed.lower():
-                return
-
-        raise EuchreError("Unhandled Action " + str(action))
-
     def __json__(self):
         return super().__json__() | {
             "hash": self.hash,
@@ -330,4 +537,43 @@ def card_or_none(deck, source):
     """
     if source is None:
         return None
-    return Card(deck, source)
\ No newline at end of file
+    return Card(deck, source)
+
+def _update(view: dict, changes: dict, fields: dict, version: int) -> None:
+    """
+    Copy the fields that differ from view into it, stamping them with version.
+    """
+    for key, value in fields.items():
+        _set(view, changes, key, value, version)
+
+def _set(view: dict, changes: dict, key: str, value: Any, version: int) -> None:
+    """
+    Set one view field, stamping it with version if it changed.
+    """
+    if key not in view or view[key] != value:
+        view[key] = value
+        changes[key] = version
+
+def _transition_table():
+    """
+    _TRANSITIONS[state][action code] -> Game method handling the action,
+    None where the action is not allowed. Every action is a no-op once the
+    game is over (state 8).
+    """
+    allowed = {
+        0: {START: Game._start},
+        1: {PASS: Game._pass_order, ORDER: Game._order, ALONE: Game._order_alone},
+        2: {UP: Game._pick_up, DOWN: Game._leave_down},
+        3: {PASS: Game._pass_make, MAKE: Game._make, ALONE: Game._make_alone},
+        4: {MAKE: Game._make, ALONE: Game._make_alone},
+        5: {PLAY: Game._play},
+        6: {CONTINUE: Game._next_trick},
+        7: {CONTINUE: Game._next_hand},
+        8: dict.fromkeys(range(len(ACTIONS)), Game._game_over),
+    }
+    return tuple(
+        tuple(allowed[state].get(code) for code in range(len(ACTIONS)))
+        for state in range(9)
+    )
+
+_TRANSITIONS = _transition_table()
@@ -0,0 +1,289 @@
+"""
+MaskEngine.py
+
+Integer/bitmask counterpart of EuchreEngine. Cards are ints, hands are
+24-bit masks and the rules run as mask operations (see masks.py). The
+public methods Game relies on accept and return strings so a MaskEngine
+can be dropped into Game, observations and hash included; simulations
+should use the *_index / *_mask methods and never touch strings.
+"""
+
+from __future__ import annotations
+import random
+from typing import Dict, List, Optional, Tuple
+from .EuchreEngine import team_of, partner_of
+from .EuchreError import EuchreError
+from . import masks, deals
+from . import zobrist as Z
+from .masks import NO_TRUMP, CARD_INDEX, CARDS
+
+class MaskEngine:
+    """Pure game engine over int cards and mask hands."""
+    def __init__(self, seed: Optional[int] = None):
+        self._rng = random.Random()
+        self._points = [0, 0]
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Return to the state of a new MaskEngine(seed)."""
+        self.seed = seed
+        self.dealer_action: Optional[str] = None # "up" or "down", set by Game
+        self._rng.seed(seed)
+        self._points[0] = self._points[1] = 0
+        self._dealer = 0
+        self._upcard: Optional[int] = None
+        self._clear()
+
+    def _clear(self):
+        self._downcard: Optional[int] = None
+        self._alone = [] # list of players that have gone alone
+        self._discard: Optional[int] = None # card discarded by dealer
+        self._hands = [0, 0, 0, 0] # hand masks
+        self._tricks: List[List[Tuple[int, int]]] = [[] for _ in range(5)] # (seat, card) per trick
+        self._trump = NO_TRUMP # current trump suit index
+        self._tricks_taken = [0, 0] # count of tricks taken for each team
+        self._seat = (self._dealer + 1) % 4 # the current player performing an action
+        self._maker: Optional[int] = None # the player that made trump
+        self.set_order(self._dealer + 1) # order of players performing actions
+
+    def start_hand(self, deal: Optional[int] = None):
+        """
+        Shuffle and deal; deals are identical to EuchreEngine for the same seed.
+
+        Args:
+            deal: Deal this deals.py deal index instead, the rng is not used.
+        """
+        self._clear()
+        if deal is not None:
+            hands, self._upcard = deals.masks_at(deal)
+            self._hands = list(hands)
+            return
+
+        cards = list(range(masks.NUM_CARDS))
+        self._rng.shuffle(cards)
+
+        for _ in range(5):
+            for p in range(4):
+                self._hands[p] |= 1 << cards.pop()
+
+        self._upcard = cards.pop()
+
+    @property
+    def trump(self) -> Optional[str]: return masks.suit_name(self._trump)
+
+    @trump.setter
+    def trump(self, suit):
+        self.trump_index = masks.suit_index(suit)
+
+    @property
+    def trump_index(self) -> int: return self._trump
+
+    @trump_index.setter
+    def trump_index(self, suit: int):
+        if self._downcard is not None and suit == masks.suit_of(self._downcard):
+            raise EuchreError(f"Can not declare same suit ({masks.suit_name(suit)}) as downcard ({CARDS[self._downcard]}).")
+
+        self._maker = self._seat
+        self._trump = suit
+
+    @property
+    def maker(self) -> Optional[int]: return self._maker
+
+    @property
+    def downcard(self) -> Optional[str]: return _name_or_none(self._downcard)
+
+    @property
+    def upcard(self) -> Optional[str]: return _name_or_none(self._upcard)
+
+    @property
+    def discard(self) -> Optional[str]: return _name_or_none(self._discard)
+
+    @property
+    def seat(self) -> int: return self._seat
+
+    @seat.setter
+    def seat(self, value): self._seat = value % 4
+
+    @property
+    def dealer(self) -> int: return self._dealer
+
+    @property
+    def points(self) -> Tuple[int, int]: return (self._points[0], self._points[1])
+
+    @property
+    def tricks_played(self): return self._tricks_taken[0] + self._tricks_taken[1]
+
+    @property
+    def taken(self) -> Tuple[int, int]: return (self._tricks_taken[0], self._tricks_taken[1])
+
+    @property
+    def tricks(self) -> List[List[Tuple[int, str]]]:
+        return [[(seat, CARDS[card]) for seat, card in trick] for trick in self._tricks]
+
+    @property
+    def first_seat(self): return self.player_order[0]
+
+    @property
+    def current_trick(self):
+        return [(seat, CARDS[card]) for seat, card in self._tricks[self.tricks_played]]
+
+    def get_hand(self, index):
+        return masks.from_mask(self._hands[index % 4])
+
+    def hand_mask(self, index) -> int:
+        return self._hands[index % 4]
+
+    def is_team_alone(self, team: int) -> bool:
+        return team in self._alone or partner_of(team) in self._alone
+
+    def turn_down_card(self):
+        self._downcard = self._upcard
+        self._upcard = None
+
+    def inc_dealer(self):
+        self._dealer = (self._dealer + 1) % 4
+
+    def order_up(self):
+        self._trump = masks.suit_of(self._upcard)
+        self._maker = self._seat
+
+    def pick_up(self, card):
+        self.pick_up_index(CARD_INDEX[card])
+
+    def pick_up_index(self, card: int):
+        hand = self._hands[self._dealer]
+        if not hand & (1 << card):
+            raise EuchreError(f"Card '{CARDS[card]}' is not in the dealer's hand.")
+
+        self._hands[self._dealer] = masks.pick_up(hand, self._upcard, card)
+        self._discard = card
+
+    def is_alone(self, seat):
+        return seat in self._alone
+
+    def go_alone(self):
+        self._alone.append(self.seat)
+        self.player_order.remove(partner_of(self.seat))
+
+    def next_player(self):
+        self._seat = (self._seat + 1) % 4
+        if self.is_sitting_out(self._seat): self._seat = (self._seat + 1) % 4
+
+    def is_sitting_out(self, seat) -> bool:
+        """True when seat's partner went alone."""
+        return partner_of(seat) in self._alone
+
+    def play_card(self, card):
+        self.play_index(CARD_INDEX[card])
+
+    def play_index(self, card: int):
+        if not self.playable_mask() & (1 << card):
+            raise EuchreError(f"Card '{CARDS[card]}' is not a legal play.")
+
+        self._hands[self._seat] ^= 1 << card
+        self._tricks[self.tricks_played].append((self._seat, card))
+
+    def score_hand(self):
+        makers = team_of(self._maker)
+        defenders = (makers + 1) % 2
+
+        if self._tricks_taken[defenders] > self._tricks_taken[makers]:
+            if self.is_team_alone(defenders): self._points[defenders] += 4
+            else: self._points[defenders] += 2
+        elif self._tricks_taken[makers] < 5:
+            self._points[makers] += 1
+        else:
+            if self.is_team_alone(makers): self._points[makers] += 4
+            else: self._points[makers] += 2
+
+    def add_trick_taken(self, team: int):
+        self._tricks_taken[team] += 1
+
+    def is_trick_finished(self) -> bool:
+        return len(self._tricks[self.tricks_played]) == len(self.player_order)
+
+    def is_hand_finished(self) -> bool:
+        return self.tricks_played >= 5
+
+    def set_order(self, start_at):
+        order = [(i + start_at) % 4 for i in range(0,4)]
+        self.player_order = [seat for seat in order if not self.is_sitting_out(seat)]
+        self._seat = self.first_seat
+
+    def playable_mask(self) -> int:
+        if self.tricks_played >= 5: return 0
+
+        trick = self._tricks[self.tricks_played]
+        lead = trick[0][1] if trick else None
+        return masks.playable_mask(self._hands[self._seat], lead, self._trump)
+
+    def playable_cards(self):
+        return masks.from_mask(self.playable_mask())
+
+    def trick_winner(self):
+        return masks.trick_winner(self._tricks[self.tricks_played], self._trump)
+
+    def is_game_over(self):
+        return self._points[0] >= 10 or self._points[1] >= 10
+
+    @property
+    def hash(self) -> int:
+        """Zobrist hash, equal to EuchreEngine.hash of the same state."""
+        key = Z.DEALER[self._dealer] ^ Z.SEAT[self._seat] ^ Z.LEADER[self.player_order[0]]
+        if self._trump != NO_TRUMP: key ^= Z.TRUMP[self._trump]
+        if self._maker is not None: key ^= Z.MAKER[self._maker]
+        key ^= Z.POINTS[0][self._points[0]] ^ Z.POINTS[1][self._points[1]]
+        key ^= Z.TAKEN[0][self._tricks_taken[0]] ^ Z.TAKEN[1][self._tricks_taken[1]]
+        for seat in self._alone: key ^= Z.ALONE[seat]
+        for seat in range(4):
+            for card in masks.bits(self._hands[seat]): key ^= Z.HAND[seat][card]
+        if self._upcard is not None: key ^= Z.UPCARD[self._upcard]
+        if self._downcard is not None: key ^= Z.DOWNCARD[self._downcard]
+        if self._discard is not None: key ^= Z.DISCARD[self._discard]
+        for t, trick in enumerate(self._tricks):
+            for seat, card in trick: key ^= Z.PLAYED[t][seat][card]
+        return key
+
+    def observation(self):
+        return {
+            "seat": self._seat,
+            "dealer": self._dealer,
+            "maker": self._maker,
+            "player_order": list(self.player_order),
+            "hands": [masks.from_mask(hand) for hand in self._hands],
+            "trump": self.trump,
+            "upcard": self.upcard,
+            "downcard": self.downcard,
+            "discard": self.discard,
+            "tricks": [[(seat, CARDS[card]) for seat, card in trick] for trick in self._tricks],
+            "taken": list(self._tricks_taken),
+            "points": list(self._points),
+        }
+
+    def public_observation(self) -> Dict:
+        """See EuchreEngine.public_observation."""
+        return {
+            "seat": self._seat,
+            "dealer": self._dealer,
+            "maker": self._maker,
+            "alone": tuple(self._alone),
+            "player_order": tuple(self.player_order),
+            "hand_sizes": tuple(hand.bit_count() for hand in self._hands),
+            "trump": self.trump,
+            "upcard": self.upcard,
+            "downcard": self.downcard,
+            "tricks": tuple(tuple(trick) for trick in self.tricks),
+            "taken": self.taken,
+            "points": self.points,
+        }
+
+    def private_observation(self, seat: int) -> Dict:
+        """See EuchreEngine.private_observation."""
+        return {
+            "hand": tuple(self.get_hand(seat)),
+            "discard": self.discard if seat == self._dealer else None,
+        }
+
+def _name_or_none(card: Optional[int]) -> Optional[str]:
+    if card is None: return None
+    return CARDS[card]
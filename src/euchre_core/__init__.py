@@ -1,5 +1,7 @@
 
 from .EuchreEngine import EuchreEngine, team_of, partner_of
+from .MaskEngine import MaskEngine
+from .CompactEuchreEngine import CompactEuchreEngine
 from .EuchreError import EuchreError
 from .cards import effective_suit, card_suit
 from .Game import Game
@@ -0,0 +1,303 @@
+"""
+actionlog.py
+
+Append-only log of Game inputs, and a streaming replay reader.
+
+A game is fully determined by its engine seed and the actions fed to
+Game.input, so the log stores only those. One log file holds any number
+of interleaved games:
+
+    header  "EULG", version, 3 pad bytes
+    BEGIN   u32 game id, u8 BEGIN, u8 0, u64 seed     (14 bytes)
+    action  u32 game id, u8 action code, u8 data code  (6 bytes)
+    END     u32 game id, u8 END, u8 0                  (6 bytes, optional)
+
+Codes are those of actions.py. The reader maps the file with mmap and
+walks records in place, so multi-GB logs are never loaded into memory.
+
+The writer keeps an index next to the log, at path + ".idx", so readers
+find games without scanning the log:
+
+    header  "EUIX", version, 3 pad bytes
+    entry   u8 kind, u32 game id, u64 seed, u64 log offset  (21 bytes)
+
+with one BEGIN and one END entry per game record of that kind, and a
+SESSION entry at the log offset each writer started appending from. A
+game's records all precede its END, or else the next SESSION, so replay
+stops there. Entries missing after a crash are recovered by scanning the
+log from the last indexed record, and a log without an index is scanned
+once in full.
+
+    with ActionLogWriter("games.log") as writer:
+        game = Game(EuchreEngine(seed), names, log=writer.open_game(seed))
+        ...
+    with ActionLogReader("games.log") as reader:
+        game = reader.replay_hand(game_id, 3)
+"""
+
+from __future__ import annotations
+import mmap
+import os
+import struct
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+from . import actions
+from .EuchreEngine import EuchreEngine
+from .EuchreError import EuchreError
+from .Game import Game
+
+VERSION = 1
+SESSION = 0xFD
+BEGIN = 0xFE
+END = 0xFF
+
+HEADER = struct.Struct("<4sB3x")
+RECORD = struct.Struct("<IBB")
+SEED = struct.Struct("<Q")
+INDEX_ENTRY = struct.Struct("<BIQQ")
+
+def index_path(path: str) -> str:
+    return path + ".idx"
+
+def _after(entry: Tuple[int, int, int, int]) -> int:
+    """Log offset just past the record an index entry points at."""
+    kind, _, _, offset = entry
+    if kind == SESSION: return offset
+    return offset + RECORD.size + (SEED.size if kind == BEGIN else 0)
+
+class GameLog:
+    """The log of one game, handed to Game(log=...)."""
+    __slots__ = ("game_id", "_writer")
+
+    def __init__(self, writer: ActionLogWriter, game_id: int):
+        self.game_id = game_id
+        self._writer = writer
+
+    def append(self, action: str, data: Optional[str] = None) -> None:
+        self._writer.write_record(self.game_id, *actions.encode(action, data))
+
+    def close(self) -> None:
+        """Mark the game finished so readers stop scanning for its actions."""
+        self._writer.write_record(self.game_id, END, 0)
+
+class ActionLogWriter:
+    """
+    Appends game logs to a file. Reopening an existing log continues after
+    its last game id.
+    """
+    def __init__(self, path: str):
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._next_id = 0
+        indexed, missing = False, []
+
+        if exists:
+            with ActionLogReader(path) as reader:
+                self._next_id = reader.next_id
+                indexed, missing = reader.indexed, reader.unindexed
+
+        self._file = open(path, "ab")
+        if not exists: self._file.write(HEADER.pack(b"EULG", VERSION))
+
+        # an index that is missing or does not match the log is rebuilt
+        self._index = open(index_path(path), "ab" if indexed else "wb")
+        if not indexed: self._index.write(HEADER.pack(b"EUIX", VERSION))
+        for entry in missing: self._index.write(INDEX_ENTRY.pack(*entry))
+        self._index.write(INDEX_ENTRY.pack(SESSION, 0, 0, self._file.tell()))
+
+    def write_record(self, game_id: int, code: int, data_code: int) -> None:
+        """
+        Append one action record, or the END record of a game. END is also
+        entered in the index.
+        """
+        if code == END: self._index.write(INDEX_ENTRY.pack(END, game_id, 0, self._file.tell()))
+        self._file.write(RECORD.pack(game_id, code, data_code))
+
+    def open_game(self, seed: int) -> GameLog:
+        """
+        Start the log of a game played on EuchreEngine(seed).
+        """
+        if seed is None or not 0 <= seed < 2 ** 64:
+            raise EuchreError("Logged games need an unsigned 64-bit engine seed.")
+
+        game_id = self._next_id
+        self._next_id += 1
+        self._index.write(INDEX_ENTRY.pack(BEGIN, game_id, seed, self._file.tell()))
+        self._file.write(RECORD.pack(game_id, BEGIN, 0) + SEED.pack(seed))
+        return GameLog(self, game_id)
+
+    def flush(self) -> None:
+        # log first: an index entry must never point past the end of the log
+        self._file.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+class ActionLogReader:
+    """
+    Memory-mapped reader for logs written by ActionLogWriter. Opening it
+    reads the game index, scanning only the records the index is missing.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.getsize(path) < HEADER.size: raise EuchreError("Not an action log.")
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = HEADER.unpack_from(self._map)
+        if magic != b"EULG": raise EuchreError("Not an action log.")
+        if version != VERSION: raise EuchreError(f"Unsupported action log version {version}.")
+
+        self._games: Dict[int, Tuple[int, int]] = {}
+        self._limits: Dict[int, int] = {} # game id -> offset its records end before
+        self.indexed = False # whether an index file was found and used
+        self.unindexed: list = [] # index entries found by scanning the log
+        try:
+            self._load_index()
+        except EuchreError:
+            self.close()
+            raise
+
+    def records(self, offset: int = HEADER.size,
+                stop: Optional[int] = None) -> Iterator[Tuple[int, int, int, int, Optional[int]]]:
+        """
+        Stream (offset, game id, action code, data code, seed) from offset
+        up to stop (the end of the log if None); seed is only set on BEGIN
+        records.
+        """
+        data = self._map
+        end = len(data) if stop is None else min(stop, len(data))
+        unpack = RECORD.unpack_from
+
+        while offset + RECORD.size <= end:
+            game_id, code, data_code = unpack(data, offset)
+            if code == BEGIN:
+                if offset + RECORD.size + SEED.size > len(data):
+                    raise EuchreError(f"Truncated BEGIN record of game {game_id} at offset {offset}.")
+                seed = SEED.unpack_from(data, offset + RECORD.size)[0]
+                yield offset, game_id, code, data_code, seed
+                offset += RECORD.size + SEED.size
+            else:
+                yield offset, game_id, code, data_code, None
+                offset += RECORD.size
+
+    def games(self) -> Dict[int, Tuple[int, int]]:
+        """game id -> (seed, offset of its BEGIN record), from the index."""
+        return self._games
+
+    def _load_index(self) -> None:
+        entries = self._read_index()
+        self.indexed = entries is not None
+        if entries is None: entries = []
+
+        # recover what the index is missing: records after its last entry
+        scan_from = _after(entries[-1]) if entries else HEADER.size
+        for offset, game_id, code, _, seed in self.records(scan_from):
+            if code == BEGIN or code == END:
+                entry = (code, game_id, seed or 0, offset)
+                entries.append(entry)
+                self.unindexed.append(entry)
+
+        games: Dict[int, Tuple[int, int]] = {}
+        limits: Dict[int, int] = {}
+        open_games: list = []
+        for kind, game_id, seed, offset in entries:
+            if kind == BEGIN:
+                games[game_id] = (seed, offset)
+                open_games.append(game_id)
+            elif kind == END:
+                limits[game_id] = offset
+            else:
+                # a new writer: no earlier game gets another record
+                for open_id in open_games: limits.setdefault(open_id, offset)
+                open_games = []
+
+        self._games, self._limits = games, limits
+
+    def _read_index(self) -> Optional[list]:
+        """The entries of the index file, None if it is missing or does not match the log."""
+        try:
+            with open(index_path(self.path), "rb") as index:
+                data = index.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < HEADER.size or HEADER.unpack_from(data) != (b"EUIX", VERSION): return None
+
+        # a partly written last entry is dropped
+        count = (len(data) - HEADER.size) // INDEX_ENTRY.size
+        entries = list(INDEX_ENTRY.iter_unpack(memoryview(data)[HEADER.size: HEADER.size + count * INDEX_ENTRY.size]))
+        # spot check the newest entries, the log may have lost its unflushed tail
+        for entry in entries[-8:]:
+            kind, game_id, _, offset = entry
+            if _after(entry) > len(self._map): return None
+            if kind != SESSION and RECORD.unpack_from(self._map, offset)[:2] != (game_id, kind): return None
+        return entries
+
+    @property
+    def next_id(self) -> int:
+        return max(self.games(), default=-1) + 1
+
+    def actions(self, game_id: int) -> Iterator[Tuple[str, Optional[str]]]:
+        """Stream the (action, data) inputs of one game."""
+        if game_id not in self.games(): raise EuchreError(f"Unknown game id {game_id}.")
+        _, start = self.games()[game_id]
+
+        stop = self._limits.get(game_id)
+        for _, record_id, code, data_code, _ in self.records(start + RECORD.size + SEED.size, stop):
+            if record_id != game_id: continue
+            if code == END: break
+            yield actions.decode(code, data_code)
+
+    def replay(self, game_id: int, stop: Optional[int] = None,
+               until: Optional[Callable[[Game], bool]] = None,
+               names: Sequence[str] = ("0", "1", "2", "3")) -> Game:
+        """
+        Rebuild a game on a fresh EuchreEngine by feeding its actions back.
+
+        Args:
+            game_id: Game to replay.
+            stop: Replay at most this many actions.
+            until: Stop as soon as until(game) is true after an action.
+        """
+        if game_id not in self.games(): raise EuchreError(f"Unknown game id {game_id}.")
+        seed, _ = self.games()[game_id]
+
+        game = Game(EuchreEngine(seed), list(names))
+        for count, (action, data) in enumerate(self.actions(game_id)):
+            if stop is not None and count >= stop: break
+            game.input(action, data)
+            if until is not None and until(game): break
+            if game.state == 8: break
+
+        return game
+
+    def replay_hand(self, game_id: int, hand: int) -> Game:
+        """
+        The game right after hand number `hand` (0 based) was dealt.
+        """
+        dealt = [-1]
+
+        def dealt_hand(game: Game) -> bool:
+            if game.state == 1 and game.last_action in ("start", "continue"):
+                dealt[0] += 1
+            return dealt[0] == hand
+
+        game = self.replay(game_id, until=dealt_hand)
+        if dealt[0] != hand: raise EuchreError(f"Game {game_id} has no hand {hand}.")
+        return game
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,101 @@
+"""
+actions.py
+
+Stable integer codes for Game actions and their data.
+
+An action is an (action, data) pair as accepted by Game.input. The action
+code is its index in ACTIONS; the data code is the masks.py card index
+(0..23) for cards, 24 + suit index for suits and NO_DATA when the action
+carries nothing.
+
+Action ids number every (action, data) pair in one flat space of
+NUM_ACTION_IDS, in ACTIONS order and then card or suit index order:
+
+    0 start, 1 pass, 2 order, 3 alone, 4..7 alone suit, 8..31 up card,
+    32 down, 33..36 make suit, 37..60 play card, 61 continue
+
+Game.step takes an id and Game.legal_mask has bit id set for each legal
+action, so policies can stay in ints end to end.
+"""
+
+from typing import Optional, Tuple
+from .masks import CARDS, CARD_INDEX, SUIT_INDEX, NUM_CARDS
+from .cards import card_suit
+from .Deck import SUITS
+from .EuchreError import EuchreError
+
+ACTIONS = ["start", "pass", "order", "alone", "up", "down", "make", "play", "continue"]
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+START, PASS, ORDER, ALONE, UP, DOWN, MAKE, PLAY, CONTINUE = range(len(ACTIONS))
+
+SUIT_BASE = NUM_CARDS
+NUM_DATA = SUIT_BASE + len(SUITS) # data codes are 0..NUM_DATA-1 or NO_DATA
+NO_DATA = 255
+
+# actions whose data Game reads, everything else carries NO_DATA
+_DATA_ACTIONS = {ALONE, UP, MAKE, PLAY}
+
+def _id_actions():
+    data = {ALONE: [None] + SUITS, UP: CARDS, MAKE: SUITS, PLAY: CARDS}
+    return tuple((action, item) for code, action in enumerate(ACTIONS) for item in data.get(code, [None]))
+
+ID_ACTIONS: Tuple[Tuple[str, Optional[str]], ...] = _id_actions() # id -> (action, data)
+ACTION_IDS = {action: i for i, action in enumerate(ID_ACTIONS)}   # (action, data) -> id
+ID_CODES = tuple((ACTION_CODES[action], data) for action, data in ID_ACTIONS) # id -> (code, data)
+NUM_ACTION_IDS = len(ID_ACTIONS)
+
+def encode_data(data: Optional[str]) -> int:
+    if data is None: return NO_DATA
+    if data in CARD_INDEX: return CARD_INDEX[data]
+    if data in SUIT_INDEX: return SUIT_BASE + SUIT_INDEX[data]
+    raise EuchreError(f"Unknown action data '{data}'.")
+
+def decode_data(code: int) -> Optional[str]:
+    if code == NO_DATA: return None
+    if code < SUIT_BASE: return CARDS[code]
+    return SUITS[code - SUIT_BASE]
+
+def encode(action: str, data: Optional[str] = None) -> Tuple[int, int]:
+    """(action, data) -> (action code, data code)."""
+    code = ACTION_CODES.get(action.lower())
+    if code is None: raise EuchreError("Unhandled Action " + str(action))
+    return code, encode_data(data) if code in _DATA_ACTIONS else NO_DATA
+
+def decode(code: int, data: int) -> Tuple[str, Optional[str]]:
+    """(action code, data code) -> (action, data)."""
+    return ACTIONS[code], decode_data(data)
+
+def encode_id(action: str, data: Optional[str] = None) -> int:
+    """(action, data) -> action id, data is ignored for actions without any."""
+    code = ACTION_CODES.get(action.lower())
+    if code is None: raise EuchreError("Unhandled Action " + str(action))
+    action_id = ACTION_IDS.get((ACTIONS[code], data if code in _DATA_ACTIONS else None))
+    if action_id is None: raise EuchreError(f"Unknown action data '{data}'.")
+    return action_id
+
+def decode_id(action_id: int) -> Tuple[str, Optional[str]]:
+    """action id -> (action, data)."""
+    if not 0 <= action_id < NUM_ACTION_IDS: raise EuchreError(f"Action id {action_id} out of range.")
+    return ID_ACTIONS[action_id]
+
+def legal_actions(engine, state: int) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Every (action, data) pair Game.input accepts in state, with the
+    concrete cards or suits of engine. Empty once the game is over.
+    """
+    if state == 0:
+        return (("start", None),)
+    if state == 1:
+        return (("pass", None), ("order", None), ("alone", None))
+    if state == 2:
+        return tuple(("up", card) for card in engine.get_hand(engine.dealer)) + (("down", None),)
+    if state in (3, 4):
+        suits = [suit for suit in SUITS if suit != card_suit(engine.downcard)]
+        bids = tuple(("make", suit) for suit in suits) + tuple(("alone", suit) for suit in suits)
+        return (("pass", None),) + bids if state == 3 else bids
+    if state == 5:
+        return tuple(("play", card) for card in engine.playable_cards())
+    if state in (6, 7):
+        return (("continue", None),)
+    return ()
@@ -0,0 +1,194 @@
+"""
+analysis.py
+
+Batch double-dummy analysis. A list of deals (hands, trump, leader) is
+packed into a shared memory block, worker processes solve ranges of it
+with solver.DoubleDummy and write their results into a second shared
+block, so only (start, stop) and a count go through pickling. Progress
+and throughput are reported as ranges complete.
+
+Records (little endian):
+
+    deal    u32 hand mask per seat, u8 trump, u8 leader, i8 sitting out
+            (NOBODY for none), 1 pad byte
+    result  u8 tricks team 0 takes, u8 best card index for the leader
+
+    results = solve_deals(deals, workers=8, progress=print)
+    results.tricks[i], results.best[i]
+
+    python -m euchre_core.analysis --deals 10000 --tablebase tablebase.bin
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+from . import deals as D
+from .EuchreError import EuchreError
+from .masks import to_mask, suit_index
+from .solver import DoubleDummy, NOBODY
+from .tablebase import Tablebase
+
+DEAL = struct.Struct("<4IBBbx")
+RESULT = struct.Struct("<BB")
+
+class Deal(NamedTuple):
+    hands: Tuple[int, int, int, int] # hand masks, the sitting-out seat's is ignored
+    trump: int                       # suit index
+    leader: int                      # seat to lead
+    sitting_out: int = NOBODY
+
+class Progress(NamedTuple):
+    done: int        # deals solved
+    total: int
+    elapsed: float   # seconds
+    nodes: int       # search nodes so far
+
+    @property
+    def rate(self) -> float:
+        """Deals per second."""
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+class Results(NamedTuple):
+    tricks: array  # "B", tricks team 0 takes per deal
+    best: array    # "B", best card index for the leader per deal
+    nodes: int
+
+def deal_of(engine) -> Deal:
+    """The Deal of an engine (EuchreEngine or MaskEngine) at the start of a trick."""
+    if engine.trump is None: raise EuchreError("Trump must be declared to solve trick play.")
+    if engine.is_hand_finished() or engine.current_trick: raise EuchreError("Not at the start of a trick.")
+
+    sitting_out = next((s for s in range(4) if engine.is_sitting_out(s)), NOBODY)
+    hands = tuple(0 if s == sitting_out else to_mask(engine.get_hand(s)) for s in range(4))
+    return Deal(hands, suit_index(engine.trump), engine.first_seat, sitting_out)
+
+def pack_deals(deals: Sequence[Deal], buffer=None) -> memoryview:
+    """Write deals as DEAL records into buffer (a new bytearray if None)."""
+    if buffer is None: buffer = bytearray(DEAL.size * len(deals))
+    for i, (hands, trump, leader, sitting_out) in enumerate(deals):
+        DEAL.pack_into(buffer, i * DEAL.size, *hands, trump, leader, sitting_out)
+    return memoryview(buffer)
+
+def _solve_into(deals, results, start: int, stop: int, tablebase: Optional[Tablebase]) -> int:
+    """Solve deal records start..stop-1 into result records, returns the nodes searched."""
+    nodes = 0
+    for i in range(start, stop):
+        h0, h1, h2, h3, trump, leader, sitting_out = DEAL.unpack_from(deals, i * DEAL.size)
+        hands = [h0, h1, h2, h3]
+        if sitting_out != NOBODY: hands[sitting_out] = 0
+
+        solver = DoubleDummy(trump, sitting_out, tablebase)
+        team0, best = solver.solve(hands, leader)
+        RESULT.pack_into(results, i * RESULT.size, team0, best)
+        nodes += solver.nodes
+    return nodes
+
+# -- worker process state, set by _attach --
+
+_deals: Optional[shared_memory.SharedMemory] = None
+_results: Optional[shared_memory.SharedMemory] = None
+_tablebase: Optional[Tablebase] = None
+
+def _attach(deals_name: str, results_name: str, tablebase: Optional[str]) -> None:
+    global _deals, _results, _tablebase
+    _deals = shared_memory.SharedMemory(deals_name)
+    _results = shared_memory.SharedMemory(results_name)
+    _tablebase = Tablebase(tablebase) if tablebase else None
+
+def _solve_range(start: int, stop: int) -> Tuple[int, int]:
+    return stop - start, _solve_into(_deals.buf, _results.buf, start, stop, _tablebase)
+
+def solve_deals(deals: Sequence[Deal], workers: Optional[int] = None, chunk: int = 64,
+                tablebase: Optional[str] = None,
+                progress: Optional[Callable[[Progress], None]] = None) -> Results:
+    """
+    Double-dummy solve every deal.
+
+    Args:
+        deals: Deals at the start of a trick, usually the first.
+        workers: Worker processes, defaults to os.cpu_count(); 0 solves inline.
+        chunk: Deals per task.
+        tablebase: Path of a tablebase.py table for the workers to map.
+        progress: Called with a Progress after every chunk.
+
+    Returns:
+        Results, indexed like deals.
+    """
+    total = len(deals)
+    began = time.perf_counter()
+    done = nodes = 0
+
+    def report(count: int, searched: int) -> None:
+        nonlocal done, nodes
+        done += count
+        nodes += searched
+        if progress is not None: progress(Progress(done, total, time.perf_counter() - began, nodes))
+
+    if workers == 0 or total == 0:
+        records = pack_deals(deals)
+        results = bytearray(RESULT.size * total)
+        table = Tablebase(tablebase) if tablebase else None
+        try:
+            for start in range(0, total, chunk):
+                stop = min(start + chunk, total)
+                report(stop - start, _solve_into(records, results, start, stop, table))
+        finally:
+            if table is not None: table.close()
+        return Results(array("B", results[0::2]), array("B", results[1::2]), nodes)
+
+    workers = workers or os.cpu_count() or 1
+    deals_shm = shared_memory.SharedMemory(create=True, size=DEAL.size * total)
+    results_shm = shared_memory.SharedMemory(create=True, size=RESULT.size * total)
+    try:
+        records = pack_deals(deals, deals_shm.buf)
+        records.release()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(deals_shm.name, results_shm.name, tablebase)) as pool:
+            tasks = [pool.submit(_solve_range, start, min(start + chunk, total)) for start in range(0, total, chunk)]
+            for task in as_completed(tasks):
+                report(*task.result())
+
+        results = bytes(results_shm.buf[:RESULT.size * total])
+        return Results(array("B", results[0::2]), array("B", results[1::2]), nodes)
+    finally:
+        deals_shm.close()
+        deals_shm.unlink()
+        results_shm.close()
+        results_shm.unlink()
+
+def random_deals(rng: random.Random, count: int) -> List[Deal]:
+    """count uniformly drawn deals with a random trump and leader."""
+    return [Deal(hands, rng.randrange(4), rng.randrange(4)) for hands, _ in D.sample_deals(rng, count)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Double-dummy solve a batch of random deals.")
+    parser.add_argument("--deals", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=64)
+    parser.add_argument("--tablebase", default=None, help="tablebase.py file to probe")
+    args = parser.parse_args(argv)
+
+    def show(p: Progress) -> None:
+        print(f"\r{p.done}/{p.total} deals  {p.rate:.0f} deals/s  {p.nodes / p.elapsed:.0f} nodes/s",
+              end="", file=sys.stderr, flush=True)
+
+    batch = random_deals(random.Random(args.seed), args.deals)
+    results = solve_deals(batch, args.workers, args.chunk, args.tablebase, show)
+    print(file=sys.stderr)
+
+    counts = [0] * 6
+    for tricks in results.tricks: counts[tricks] += 1
+    print("team 0 tricks: " + "  ".join(f"{t}: {n}" for t, n in enumerate(counts)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+bidding.py
+
+Monte Carlo hand strength for the bidding states. For a seat's hand, the
+upcard (state 1) or downcard (states 3 and 4), the dealer and a candidate
+trump, the unseen cards are dealt at random to the other seats and the
+hand is played out through EuchreEngine with a greedy card policy. The
+value of a bid is the mean of (own team points - other team points) the
+hand scores; passing is the 0 baseline.
+
+Results are memoized in a bounded LRU keyed by the canonical form of the
+hand (canonical.py), so suit-relabeled repeats of a position are free.
+Each key is simulated with an rng seeded from the key, so a cached and a
+fresh evaluation agree.
+
+    evaluator = BidEvaluator(samples=200)
+    values = evaluator.evaluate_game(game)  # {("order", None): 0.8, ...}
+"""
+
+from __future__ import annotations
+import random
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from .EuchreEngine import EuchreEngine, team_of
+from .EuchreError import EuchreError
+from .cards import card_suit
+from .rules import RANKINGS
+from .masks import NO_TRUMP, CARDS, CARD_INDEX, to_mask, from_mask, suit_index, suit_name
+from .canonical import canonical_hand
+from .Deck import SUITS
+
+Action = Tuple[str, Optional[str]]
+
+def _discard(hand: Sequence[str], trump: str) -> str:
+    """Dealer's discard: the lowest card by trump ranking."""
+    values = RANKINGS[(trump, None)]
+    return min(hand, key=values.__getitem__)
+
+def _greedy_card(engine: EuchreEngine) -> str:
+    """
+    Rollout policy: lead the strongest card; follow with the cheapest card
+    that takes the trick unless partner is winning, else the cheapest card.
+    """
+    playable = engine.playable_cards()
+    trick = engine.current_trick
+    if not trick:
+        return max(playable, key=RANKINGS[(engine._trump, None)].__getitem__)
+
+    values = engine.card_table.dictionary
+    winner = engine.trick_winner()
+    best = max(values[card] for _, card in trick)
+    cheapest = min(playable, key=values.__getitem__)
+    if team_of(winner) == team_of(engine.seat): return cheapest
+
+    winning = [card for card in playable if values[card] > best]
+    if not winning: return cheapest
+    return min(winning, key=values.__getitem__)
+
+class BidEvaluator:
+    """
+    Estimates the points of bidding, with an LRU of past estimates.
+    """
+    def __init__(self, samples: int = 200, cache_size: int = 65536, seed: int = 0):
+        """
+        Args:
+            samples: Deals simulated per estimate.
+            cache_size: Estimates kept in the LRU.
+            seed: Mixed into the per-position rng seeds.
+        """
+        self.samples = samples
+        self.seed = seed
+        self._engine = EuchreEngine()
+        self._estimate = lru_cache(maxsize=cache_size)(self._simulate)
+
+    def cache_info(self):
+        return self._estimate.cache_info()
+
+    def cache_clear(self) -> None:
+        self._estimate.cache_clear()
+
+    def evaluate(self, hand: Sequence[str], upcard: str, dealer: int, seat: int,
+                 trump: Optional[str] = None) -> Tuple[float, float]:
+        """
+        Expected points of making trump and of going alone.
+
+        Args:
+            hand: The seat's 5 cards.
+            upcard: The upcard, or the downcard when trump is given.
+            dealer: Dealer seat.
+            seat: Seat bidding.
+            trump: None to order up the upcard (state 1), else the suit
+                named in states 3 and 4.
+
+        Returns:
+            (make, alone) mean point differences for the seat's team.
+        """
+        if trump is not None and trump == card_suit(upcard):
+            raise EuchreError(f"Can not declare same suit ({trump}) as downcard ({upcard}).")
+
+        (mask, up, suit), _ = canonical_hand(to_mask(hand), CARD_INDEX[upcard], suit_index(trump))
+        return self._estimate(mask, up, suit, (dealer - seat) % 4)
+
+    def evaluate_game(self, game) -> Dict[Action, float]:
+        """
+        Expected points of every legal action of the seat to act in
+        states 1, 3 and 4, keyed like Game.legal_actions.
+        """
+        engine = game.engine
+        state = game.state
+        seat = engine.seat
+        hand = engine.get_hand(seat)
+        values: Dict[Action, float] = {}
+
+        if state == 1:
+            make, alone = self.evaluate(hand, engine.upcard, engine.dealer, seat)
+            values[("order", None)] = make
+            values[("alone", None)] = alone
+        elif state in (3, 4):
+            for suit in SUITS:
+                if suit == card_suit(engine.downcard): continue
+                make, alone = self.evaluate(hand, engine.downcard, engine.dealer, seat, suit)
+                values[("make", suit)] = make
+                values[("alone", suit)] = alone
+        else:
+            raise EuchreError(f"State {state} is not a bidding state.")
+
+        if state != 4: values[("pass", None)] = 0.0
+        return values
+
+    def best_action(self, game) -> Action:
+        values = self.evaluate_game(game)
+        return max(values, key=values.__getitem__)
+
+    def _simulate(self, hand: int, upcard: int, trump: int, dealer: int) -> Tuple[float, float]:
+        """
+        (make, alone) for a canonical position, seat 0 bidding with the
+        dealer at the given relative seat.
+        """
+        rng = random.Random(hash((self.seed, hand, upcard, trump, dealer)))
+        cards = from_mask(hand)
+        unseen = [CARDS[card] for card in range(len(CARDS)) if not (hand | 1 << upcard) >> card & 1]
+
+        totals = [0, 0]
+        for _ in range(self.samples):
+            rng.shuffle(unseen)
+            for i, alone in enumerate((False, True)):
+                totals[i] += self._play_out(cards, unseen, CARDS[upcard], suit_name(trump), dealer, alone)
+
+        return totals[0] / self.samples, totals[1] / self.samples
+
+    def _play_out(self, hand: List[str], unseen: List[str], upcard: str,
+                  trump: Optional[str], dealer: int, alone: bool) -> int:
+        engine = self._engine
+        engine._dealer = dealer
+        engine._points[0] = engine._points[1] = 0
+        engine._clear()
+
+        hands = engine._hands
+        hands[0].extend(hand)
+        for seat in (1, 2, 3):
+            hands[seat].extend(unseen[5 * seat - 5: 5 * seat])
+        engine._upcard = upcard
+        engine._seat = 0
+
+        if trump is None:
+            engine.order_up()
+            if alone: engine.go_alone()
+            engine.pick_up(_discard(hands[dealer], engine.trump))
+        else:
+            engine.turn_down_card()
+            engine.trump = trump
+            if alone: engine.go_alone()
+        engine.set_order(dealer + 1)
+
+        while not engine.is_hand_finished():
+            engine._place_card(_greedy_card(engine))
+            if engine.is_trick_finished():
+                winner = engine.trick_winner()
+                engine.add_trick_taken(team_of(winner))
+                engine.set_order(winner)
+            else:
+                engine.next_player()
+
+        engine.score_hand()
+        return engine._points[0] - engine._points[1]
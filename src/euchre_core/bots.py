@@ -0,0 +1,35 @@
+"""
+bots.py
+
+Reference bot policies. A policy is a module level callable
+`policy(game, rng) -> (action, data)` called whenever the seat it plays
+has a decision to make, rng is a random.Random owned by the driver so
+games stay reproducible. Module level functions pickle by reference, so
+policies can be shipped to tournament worker processes.
+"""
+
+import random
+from typing import Optional, Tuple
+from .bidding import BidEvaluator
+
+Action = Tuple[str, Optional[str]]
+
+_evaluator: Optional[BidEvaluator] = None # per process, built on first use
+
+def random_bot(game, rng: random.Random) -> Action:
+    """Uniformly random choice among the legal options."""
+    return rng.choice(game.legal_actions())
+
+def passive_bot(game, rng: random.Random) -> Action:
+    """Never bids unless forced, plays a random legal card."""
+    choices = game.legal_actions()
+    if ("pass", None) in choices: return ("pass", None)
+    return rng.choice([c for c in choices if c[0] != "alone"])
+
+def bidding_bot(game, rng: random.Random) -> Action:
+    """Bids the action with the best BidEvaluator estimate, plays a random legal card."""
+    global _evaluator
+    if game.state in (1, 3, 4):
+        if _evaluator is None: _evaluator = BidEvaluator(samples=100)
+        return _evaluator.best_action(game)
+    return rng.choice(game.legal_actions())
@@ -0,0 +1,96 @@
+"""
+canonical.py
+
+Suit isomorphism. Relabeling suits so that same-color pairs (OPPOSITE in
+rules.py) stay pairs, and trump moves along with the cards, maps any
+position to a strategically identical one: the left bower is still the
+jack of the suit paired with trump. There are 8 such relabelings, a
+permutation `perm` maps suit s to perm[s].
+
+The canonical form of a position is its smallest image under the 8
+relabelings, so equivalent hands and deals share one cache key:
+
+    (hand, upcard), perm = canonical_hand(hand, upcard)
+    value = cache.get((hand, upcard)) ...
+
+Cards are masks.py indices and hands masks, suits are Deck.SUITS indices
+with NO_TRUMP for no trump. Ranks never change, so a permuted mask is the
+suit blocks of 6 bits moved around.
+"""
+
+from itertools import permutations
+from typing import Iterable, List, Sequence, Tuple
+from .masks import NO_TRUMP, CARDS, CARD_INDEX, SUIT_INDEX, to_mask, from_mask, same_color_suit
+from .Deck import SUITS
+
+Perm = Tuple[int, int, int, int]
+
+SUIT_PERMUTATIONS: Tuple[Perm, ...] = tuple(
+    perm for perm in permutations(range(4))
+    if all(perm[same_color_suit(s)] == same_color_suit(perm[s]) for s in range(4))
+)
+IDENTITY: Perm = (0, 1, 2, 3)
+
+_BLOCK = 0x3F
+
+def invert(perm: Perm) -> Perm:
+    """The permutation undoing perm."""
+    inverse = [0, 0, 0, 0]
+    for suit, image in enumerate(perm): inverse[image] = suit
+    return tuple(inverse)
+
+def permute_suit(suit: int, perm: Perm) -> int:
+    return suit if suit == NO_TRUMP else perm[suit]
+
+def permute_card(card: int, perm: Perm) -> int:
+    return perm[card // 6] * 6 + card % 6
+
+def permute_mask(mask: int, perm: Perm) -> int:
+    return (
+        (mask & _BLOCK) << 6 * perm[0]
+        | (mask >> 6 & _BLOCK) << 6 * perm[1]
+        | (mask >> 12 & _BLOCK) << 6 * perm[2]
+        | (mask >> 18 & _BLOCK) << 6 * perm[3]
+    )
+
+def canonical_hand(hand: int, upcard: int, trump: int = NO_TRUMP) -> Tuple[Tuple[int, int, int], Perm]:
+    """
+    Canonical form of one hand seen with an upcard (and trump, once
+    declared).
+
+    Returns:
+        ((hand, upcard, trump), perm) where the form is the input relabeled by perm.
+    """
+    best = None
+    best_perm = IDENTITY
+    for perm in SUIT_PERMUTATIONS:
+        key = (permute_suit(trump, perm), permute_card(upcard, perm), permute_mask(hand, perm))
+        if best is None or key < best:
+            best, best_perm = key, perm
+
+    trump, upcard, hand = best
+    return (hand, upcard, trump), best_perm
+
+def canonical_deal(hands: Sequence[int], upcard: int, trump: int = NO_TRUMP) -> Tuple[Tuple[Tuple[int, ...], int, int], Perm]:
+    """
+    Canonical form of a full deal, seats are not relabeled.
+
+    Returns:
+        ((hands, upcard, trump), perm) where the form is the input relabeled by perm.
+    """
+    best = None
+    best_perm = IDENTITY
+    for perm in SUIT_PERMUTATIONS:
+        key = (permute_suit(trump, perm), permute_card(upcard, perm),
+               tuple(permute_mask(hand, perm) for hand in hands))
+        if best is None or key < best:
+            best, best_perm = key, perm
+
+    trump, upcard, hands = best
+    return (hands, upcard, trump), best_perm
+
+def canonical_cards(hand: Iterable[str], upcard: str, trump: str = None) -> Tuple[Tuple[List[str], str, str], Perm]:
+    """canonical_hand for string cards and suits."""
+    (mask, up, suit), perm = canonical_hand(to_mask(hand), CARD_INDEX[upcard],
+                                            NO_TRUMP if trump is None else SUIT_INDEX[trump])
+    return (from_mask(mask), CARDS[up], None if suit == NO_TRUMP else SUITS[suit]), perm
@@ -3,6 +3,10 @@ Cards.py
 """
 
 from typing import Dict, List
+from .rules import EFFECTIVE_SUIT, LEFT_BOWER
+
+RED = {"♦", "♥"}
+BLACK = {"♣", "♠"}
 
 def card_suit(card: str) -> str:
     return card[-1]
@@ -11,14 +15,13 @@ def card_rank(card: str) -> str:
     return card[:-1]
 
 def same_color(s1: str, s2: str) -> bool:
-    red = {"♦", "♥"}
-    black = {"♣", "♠"}
-    return (s1 in red and s2 in red) or (s1 in black and s2 in black)
+    return (s1 in RED and s2 in RED) or (s1 in BLACK and s2 in BLACK)
 
 def is_left_bower(card: str, trump: str) -> bool:
-    return card_rank(card) == "J" and card_suit(card) != trump and same_color(card_suit(card), trump)
+    return card == LEFT_BOWER.get(trump)
 
 def effective_suit(card: str, trump: str|None) -> str:
-    if trump is not None and is_left_bower(card, trump):
-        return trump
-    return card_suit(card)
\ No newline at end of file
+    suit = EFFECTIVE_SUIT.get(trump, {}).get(card)
+    if suit is not None: return suit
+    # not a deck card or suit, same answer as the rule itself
+    return trump if trump is not None and is_left_bower(card, trump) else card_suit(card)
\ No newline at end of file
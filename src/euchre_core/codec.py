@@ -0,0 +1,193 @@
+"""
+codec.py
+
+Versioned, fixed-layout binary encoding of a Game and its EuchreEngine.
+
+Record layout (version 3, little endian, RECORD.size == 65 bytes):
+
+    magic "EU", version, FSM state,
+    dealer, seat, maker, trump, upcard, downcard, discard,
+    alone (bit per seat), leader (first seat of player_order),
+    dealer action, last action (actions.py codes), last data (data code),
+    4 hands x 5 cards in hand order,
+    5 tricks x (leader seat, 4 cards in play order),
+    tricks taken per team, points per team
+
+Cards are masks.py indices, suits Deck.SUITS indices, 255 is "none".
+Seats within a trick are recovered from the trick leader, skipping the
+partner of a lone player. Hands keep their order, so a loaded game
+offers its cards in the same order as the original. The rng and player
+names are not part of the record: `loads` into an existing Game keeps
+its engine's rng and refills its lists in place. Only the current
+version loads; short or malformed data raises EuchreError.
+
+`dumps_many`/`loads_many` pack many records behind one header:
+magic "EB", version, u32 count.
+"""
+
+from __future__ import annotations
+import struct
+from typing import Iterator, List, Optional, Sequence
+from .EuchreEngine import EuchreEngine, partner_of
+from .EuchreError import EuchreError
+from .CardTable import CardTable
+from .actions import ACTIONS, ACTION_CODES, encode_data, decode_data
+from .Game import Game
+from .masks import CARDS, CARD_INDEX, SUIT_INDEX
+from .deals import HAND_SIZE
+from .Deck import SUITS
+
+VERSION = 3
+NONE = 255
+
+RECORD = struct.Struct("<2sBB BBBBBBB BB BBB 20s 25s 2B 2B")
+BULK_HEADER = struct.Struct("<2sBI")
+
+_EMPTY_HANDS = bytes([NONE] * 4 * HAND_SIZE)
+_EMPTY_TRICKS = bytes([NONE] * 25)
+
+def _card(card: Optional[str]) -> int:
+    return NONE if card is None else CARD_INDEX[card]
+
+def _card_or_none(code: int) -> Optional[str]:
+    return None if code == NONE else CARDS[code]
+
+def _action(action: Optional[str]) -> int:
+    return NONE if action is None else ACTION_CODES[action]
+
+def _unpack(unpack, data, *args):
+    """unpack(data, *args), raising EuchreError on short data."""
+    try:
+        return unpack(data, *args)
+    except struct.error as err:
+        raise EuchreError(f"Truncated game data: {err}.") from err
+
+def _pack_into(buffer, offset: int, game: Game) -> None:
+    engine = game.engine
+    alone = 0
+    for seat in engine._alone: alone |= 1 << seat
+
+    tricks = bytearray(_EMPTY_TRICKS)
+    for t, trick in enumerate(engine._tricks):
+        if not trick: continue
+        tricks[t * 5] = trick[0][0]
+        for i, (_, card) in enumerate(trick):
+            tricks[t * 5 + 1 + i] = CARD_INDEX[card]
+
+    hands = bytearray(_EMPTY_HANDS)
+    for seat, hand in enumerate(engine._hands):
+        for i, card in enumerate(hand):
+            hands[seat * HAND_SIZE + i] = CARD_INDEX[card]
+
+    RECORD.pack_into(
+        buffer, offset,
+        b"EU", VERSION, game.state,
+        engine._dealer, engine._seat,
+        NONE if engine._maker is None else engine._maker,
+        NONE if engine._trump is None else SUIT_INDEX[engine._trump],
+        _card(engine._upcard), _card(engine._downcard), _card(engine._discard),
+        alone, engine.player_order[0],
+        _action(engine.dealer_action), _action(game.last_action), encode_data(game.last_data),
+        bytes(hands),
+        bytes(tricks),
+        engine._tricks_taken[0], engine._tricks_taken[1],
+        engine._points[0], engine._points[1],
+    )
+
+def _apply(fields, game: Game) -> Game:
+    if fields[0] != b"EU": raise EuchreError("Not a game record.")
+    if fields[1] != VERSION: raise EuchreError(f"Unsupported record version {fields[1]}.")
+
+    (magic, version, state,
+     dealer, seat, maker, trump, upcard, downcard, discard,
+     alone, leader,
+     dealer_action, last_action, last_data,
+     hands,
+     tricks,
+     k0, k1, p0, p1) = fields
+
+    engine = game.engine
+    engine._dealer = dealer
+    engine._seat = seat
+    engine._maker = None if maker == NONE else maker
+    engine._trump = None if trump == NONE else SUITS[trump]
+    engine._upcard = _card_or_none(upcard)
+    engine._downcard = _card_or_none(downcard)
+    engine._discard = _card_or_none(discard)
+    engine._alone[:] = [s for s in range(4) if alone & (1 << s)]
+    engine.dealer_action = None if dealer_action == NONE else ACTIONS[dealer_action]
+
+    sitting_out = [partner_of(s) for s in engine._alone]
+    engine.player_order = [(leader + i) % 4 for i in range(4) if (leader + i) % 4 not in sitting_out]
+    for seat, hand in enumerate(engine._hands):
+        codes = hands[seat * HAND_SIZE: (seat + 1) * HAND_SIZE]
+        hand[:] = [CARDS[code] for code in codes if code != NONE]
+
+    engine.card_table = CardTable.of(None, None)
+    for t in range(5):
+        trick = engine._tricks[t]
+        trick.clear()
+        first = tricks[t * 5]
+        if first == NONE: continue
+        player = first
+        for code in tricks[t * 5 + 1: t * 5 + 5]:
+            if code == NONE: break
+            trick.append((player, CARDS[code]))
+            player = (player + 1) % 4
+            if player in sitting_out: player = (player + 1) % 4
+        engine.card_table = CardTable.of(engine._trump, trick[0][1][-1])
+
+    engine._tricks_taken[0], engine._tricks_taken[1] = k0, k1
+    engine._points[0], engine._points[1] = p0, p1
+    engine.rehash()
+
+    game._state = state
+    game.last_action = None if last_action == NONE else ACTIONS[last_action]
+    game.last_data = decode_data(last_data)
+    game._changed()
+    return game
+
+def dumps(game: Game) -> bytes:
+    """Encode one game as a RECORD.size byte record."""
+    buffer = bytearray(RECORD.size)
+    _pack_into(buffer, 0, game)
+    return bytes(buffer)
+
+def loads(data, game: Optional[Game] = None, names: Sequence[str] = ("0", "1", "2", "3")) -> Game:
+    """
+    Decode a record.
+
+    Args:
+        data: Bytes-like record.
+        game: Game to restore into, a new Game on a new EuchreEngine if None.
+        names: Player names for a new Game.
+    """
+    if game is None: game = Game(EuchreEngine(), list(names))
+    return _apply(_unpack(RECORD.unpack_from, data), game)
+
+def dumps_many(games: Sequence[Game]) -> bytes:
+    """Pack many games into one buffer."""
+    buffer = bytearray(BULK_HEADER.size + RECORD.size * len(games))
+    BULK_HEADER.pack_into(buffer, 0, b"EB", VERSION, len(games))
+
+    offset = BULK_HEADER.size
+    for game in games:
+        _pack_into(buffer, offset, game)
+        offset += RECORD.size
+
+    return bytes(buffer)
+
+def iter_loads(data, names: Sequence[str] = ("0", "1", "2", "3")) -> Iterator[Game]:
+    """Decode the games of a dumps_many buffer one at a time."""
+    magic, version, count = _unpack(BULK_HEADER.unpack_from, data)
+    if magic != b"EB": raise EuchreError("Not a game bundle.")
+    if version != VERSION: raise EuchreError(f"Unsupported bundle version {version}.")
+
+    end = BULK_HEADER.size + RECORD.size * count
+    if len(data) < end: raise EuchreError(f"Truncated game bundle: {count} games need {end} bytes.")
+    body = memoryview(data)[BULK_HEADER.size:end]
+    for fields in RECORD.iter_unpack(body):
+        yield _apply(fields, Game(EuchreEngine(), list(names)))
+
+def loads_many(data, names: Sequence[str] = ("0", "1", "2", "3")) -> List[Game]:
+    return list(iter_loads(data, names))
@@ -0,0 +1,133 @@
+"""
+deals.py
+
+Deal indexing. A deal is what Deck.deal hands out: four 5-card hands and
+the upcard, the 3 cards left in the kitty are unordered. Every deal maps
+to a unique index in range(NUM_DEALS) and back, NUM_DEALS < 2**49 so an
+index packs in 8 bytes.
+
+The index is a mixed-radix number: the rank of each hand among the
+C(remaining, 5) hands possible from the cards the previous hands left
+(colexicographic order of card positions), then the position of the
+upcard among the last 4 cards.
+
+    index = deal_index(engine._hands, engine.upcard)
+    hands, upcard = deal_at(index)
+    for hands, upcard in deals(shard_range(workers, worker)): ...
+
+Cards are masks.py indices at the mask level, strings at the string
+level; hands from deal_at come back in card index order.
+"""
+
+import random
+from typing import Iterable, Iterator, List, Sequence, Tuple
+from .EuchreError import EuchreError
+from .masks import NUM_CARDS, FULL_MASK, CARDS, CARD_INDEX, to_mask, from_mask, bits
+
+HAND_SIZE = 5
+
+BINOM = [[0] * (HAND_SIZE + 1) for _ in range(NUM_CARDS + 1)]
+for _n in range(NUM_CARDS + 1):
+    BINOM[_n][0] = 1
+    for _k in range(1, min(_n, HAND_SIZE) + 1):
+        BINOM[_n][_k] = BINOM[_n - 1][_k - 1] + BINOM[_n - 1][_k]
+
+# hands possible from the cards left before each hand is dealt: 24, 19, 14, 9
+RADIX = tuple(BINOM[NUM_CARDS - HAND_SIZE * i][HAND_SIZE] for i in range(4))
+KITTY = NUM_CARDS - 4 * HAND_SIZE # cards left after the hands, the upcard is one of them
+
+NUM_DEALS = RADIX[0] * RADIX[1] * RADIX[2] * RADIX[3] * KITTY
+NUM_HANDS = RADIX[0]
+
+DealMasks = Tuple[Tuple[int, int, int, int], int]
+
+def _position(remaining: int, card: int) -> int:
+    """Position of card among the cards of remaining, lowest first."""
+    return (remaining & ((1 << card) - 1)).bit_count()
+
+def _nth(remaining: int, position: int) -> int:
+    """Card at position among the cards of remaining."""
+    for _ in range(position): remaining &= remaining - 1
+    return (remaining & -remaining).bit_length() - 1
+
+def _rank(remaining: int, hand: int) -> int:
+    rank = 0
+    for j, card in enumerate(bits(hand), 1):
+        rank += BINOM[_position(remaining, card)][j]
+    return rank
+
+def _unrank(remaining: int, rank: int) -> int:
+    hand = 0
+    position = remaining.bit_count()
+    for j in range(HAND_SIZE, 0, -1):
+        position -= 1
+        while BINOM[position][j] > rank: position -= 1
+        rank -= BINOM[position][j]
+        hand |= 1 << _nth(remaining, position)
+    return hand
+
+def hand_index(hand: int) -> int:
+    """Index of a 5-card hand mask in range(NUM_HANDS)."""
+    return _rank(FULL_MASK, hand)
+
+def hand_at(index: int) -> int:
+    """Hand mask of a hand index."""
+    return _unrank(FULL_MASK, index)
+
+def index_masks(hands: Sequence[int], upcard: int) -> int:
+    """Index of a deal given as four hand masks and an int upcard."""
+    remaining = FULL_MASK
+    index = 0
+    for radix, hand in zip(RADIX, hands):
+        if hand & ~remaining or hand.bit_count() != HAND_SIZE:
+            raise EuchreError("Hands must be 5 distinct cards each.")
+        index = index * radix + _rank(remaining, hand)
+        remaining &= ~hand
+
+    if not remaining >> upcard & 1: raise EuchreError("The upcard is in a hand.")
+    return index * KITTY + _position(remaining, upcard)
+
+def masks_at(index: int) -> DealMasks:
+    """(hand masks, upcard) of a deal index."""
+    if not 0 <= index < NUM_DEALS: raise EuchreError(f"Deal index {index} out of range.")
+
+    index, up = divmod(index, KITTY)
+    ranks = [0, 0, 0, 0]
+    for i in range(3, -1, -1):
+        index, ranks[i] = divmod(index, RADIX[i])
+
+    remaining = FULL_MASK
+    hands = []
+    for rank in ranks:
+        hand = _unrank(remaining, rank)
+        hands.append(hand)
+        remaining &= ~hand
+
+    return (hands[0], hands[1], hands[2], hands[3]), _nth(remaining, up)
+
+def deal_index(hands: Sequence[Iterable[str]], upcard: str) -> int:
+    """Index of a deal as Deck.deal returns it."""
+    return index_masks([to_mask(hand) for hand in hands], CARD_INDEX[upcard])
+
+def deal_at(index: int) -> Tuple[List[List[str]], str]:
+    """(hands, upcard) of a deal index, in the shape of Deck.deal."""
+    hands, upcard = masks_at(index)
+    return [from_mask(hand) for hand in hands], CARDS[upcard]
+
+def deals(indices: Iterable[int]) -> Iterator[DealMasks]:
+    """The deals of indices, e.g. a range(start, stop) shard."""
+    for index in indices:
+        yield masks_at(index)
+
+def shard_range(shards: int, shard: int, total: int = NUM_DEALS) -> range:
+    """The slice of range(total) that shard (0 based) of shards covers."""
+    if not 0 <= shard < shards: raise EuchreError(f"Shard {shard} out of range.")
+    return range(total * shard // shards, total * (shard + 1) // shards)
+
+def sample_indices(rng: random.Random, count: int) -> List[int]:
+    """count deal indices drawn uniformly, with replacement."""
+    return [rng.randrange(NUM_DEALS) for _ in range(count)]
+
+def sample_deals(rng: random.Random, count: int) -> Iterator[DealMasks]:
+    """count deals drawn uniformly, with replacement, without shuffling a deck."""
+    return deals(sample_indices(rng, count))
@@ -0,0 +1,140 @@
+"""
+features.py
+
+Fixed-length feature vectors of a game as seen by one seat, for ML agents.
+Seats are relative to the seat the vector is for (0 = that seat, 1 = left
+opponent, 2 = partner, 3 = right opponent), cards are masks.py indices.
+
+    block           width   contents
+    HAND            24      cards in the seat's hand
+    PLAYED          4 x 24  cards played this hand, per relative seat
+    TRICK           4 x 24  cards in the current trick, per relative seat
+    UPCARD          24      the up-card while it is up or picked up
+    DOWNCARD        24      the up-card once turned down
+    DISCARD         24      the dealer's discard, only set for the dealer
+    TRUMP           5       one-hot trump suit, last slot for no trump yet
+    MAKER           5       one-hot relative maker, last slot for none
+    ALONE           4       relative seats that went alone
+    DEALER          4       one-hot relative dealer
+    TO_ACT          4       one-hot relative seat to act
+    STATE           9       one-hot Game FSM state, zero for a bare engine
+    SCORE           4       points (own team, other team) / 10,
+                            tricks taken (own team, other team) / 5
+
+`encode_batch` fills a preallocated (N, NUM_FEATURES) array: per game it
+only collects flat indices into two lists, and writes them with two NumPy
+assignments for the whole batch.
+
+Requires numpy (pip install .[batch]).
+"""
+
+from __future__ import annotations
+from typing import List, Optional, Sequence, Union
+import numpy as np
+from .EuchreError import EuchreError
+from .masks import CARD_INDEX, SUIT_INDEX, NUM_CARDS
+
+HAND = 0
+PLAYED = HAND + NUM_CARDS
+TRICK = PLAYED + 4 * NUM_CARDS
+UPCARD = TRICK + 4 * NUM_CARDS
+DOWNCARD = UPCARD + NUM_CARDS
+DISCARD = DOWNCARD + NUM_CARDS
+TRUMP = DISCARD + NUM_CARDS
+MAKER = TRUMP + 5
+ALONE = MAKER + 5
+DEALER = ALONE + 4
+TO_ACT = DEALER + 4
+STATE = TO_ACT + 4
+SCORE = STATE + 9
+NUM_FEATURES = SCORE + 4
+
+def _collect(hot: List[int], index: List[int], value: List[float], base: int, game, seat: Optional[int]) -> None:
+    """
+    Append the flat indices of the features of one game, read through the
+    engine's public and private observations so any engine works.
+    """
+    engine = getattr(game, "engine", game)
+    state = getattr(game, "state", None)
+    public = engine.public_observation()
+    to_act = public["seat"]
+    if seat is None: seat = to_act
+    private = engine.private_observation(seat)
+
+    for card in private["hand"]:
+        hot.append(base + HAND + CARD_INDEX[card])
+
+    taken = public["taken"]
+    current = taken[0] + taken[1]
+    for t, trick in enumerate(public["tricks"]):
+        for player, card in trick:
+            card = CARD_INDEX[card]
+            relative = (player - seat) % 4
+            hot.append(base + PLAYED + relative * NUM_CARDS + card)
+            if t == current: hot.append(base + TRICK + relative * NUM_CARDS + card)
+
+    if public["upcard"] is not None: hot.append(base + UPCARD + CARD_INDEX[public["upcard"]])
+    if public["downcard"] is not None: hot.append(base + DOWNCARD + CARD_INDEX[public["downcard"]])
+    if private["discard"] is not None: hot.append(base + DISCARD + CARD_INDEX[private["discard"]])
+
+    trump, maker = public["trump"], public["maker"]
+    hot.append(base + TRUMP + (4 if trump is None else SUIT_INDEX[trump]))
+    hot.append(base + MAKER + (4 if maker is None else (maker - seat) % 4))
+    for player in public["alone"]:
+        hot.append(base + ALONE + (player - seat) % 4)
+    hot.append(base + DEALER + (public["dealer"] - seat) % 4)
+    hot.append(base + TO_ACT + (to_act - seat) % 4)
+    if state is not None: hot.append(base + STATE + state)
+
+    team = seat % 2
+    points = public["points"]
+    index.extend((base + SCORE, base + SCORE + 1, base + SCORE + 2, base + SCORE + 3))
+    value.extend((points[team] / 10, points[1 - team] / 10, taken[team] / 5, taken[1 - team] / 5))
+
+def encode_batch(games: Sequence, seats: Union[None, int, Sequence[int]] = None,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Encode many games.
+
+    Args:
+        games: Game objects, or engines (EuchreEngine, MaskEngine,
+            CompactEuchreEngine).
+        seats: Seat each vector is for, one for all games, or None for the
+            seat to act in each game.
+        out: (N, NUM_FEATURES) array to fill, allocated as float32 if None.
+
+    Returns:
+        np.ndarray: out, one row per game.
+    """
+    n = len(games)
+    if out is None:
+        out = np.zeros((n, NUM_FEATURES), dtype=np.float32)
+    else:
+        if out.ndim != 2 or out.shape[0] < n or out.shape[1] != NUM_FEATURES:
+            raise EuchreError(f"Expected an ({n}, {NUM_FEATURES}) array, got {out.shape}.")
+        if not out.flags.c_contiguous: raise EuchreError("Output array must be C contiguous.")
+        out[:n] = 0
+
+    if seats is None or isinstance(seats, int): seats = [seats] * n
+    elif len(seats) != n: raise EuchreError(f"Expected {n} seats, got {len(seats)}.")
+
+    hot: List[int] = []
+    index: List[int] = []
+    value: List[float] = []
+    for row in range(n):
+        _collect(hot, index, value, row * NUM_FEATURES, games[row], seats[row])
+
+    flat = out.reshape(-1)
+    flat[hot] = 1
+    flat[index] = value
+    return out
+
+def encode(game, seat: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Encode one game as seen by seat (the seat to act if None).
+
+    Returns:
+        np.ndarray: A (NUM_FEATURES,) vector, out if given.
+    """
+    rows = None if out is None else out.reshape(1, NUM_FEATURES)
+    return encode_batch([game], seat, rows)[0]
@@ -0,0 +1,99 @@
+"""
+masks.py
+
+Integer card core. A card is an int 0..23 in `Deck` order
+(suit * 6 + rank) and a set of cards (a hand, the cards played, ...) is a
+24-bit mask with bit `i` set when card `i` is present. Suits are ints 0..3
+in `Deck.SUITS` order, `NO_TRUMP` (4) stands in for an undeclared trump.
+
+String cards are only converted at the boundary with `card_index`,
+`card_name`, `to_mask` and `from_mask`.
+"""
+
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from .Deck import SUITS, RANKS
+from .rules import NUM_CARDS, NO_TRUMP, EFFECTIVE, SUIT_MASKS, VALUES
+
+JACK = RANKS.index("J")
+FULL_MASK = (1 << NUM_CARDS) - 1
+
+CARDS: List[str] = [r + s for s in SUITS for r in RANKS]
+CARD_INDEX = {card: i for i, card in enumerate(CARDS)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
+def suit_of(card: int) -> int:
+    return card // 6
+
+def rank_of(card: int) -> int:
+    return card % 6
+
+def same_color_suit(suit: int) -> int:
+    """The other suit of the same color (♣ <-> ♠, ♦ <-> ♥)."""
+    return 3 - suit
+
+def card_index(card: str) -> int:
+    return CARD_INDEX[card]
+
+def card_name(card: int) -> str:
+    return CARDS[card]
+
+def suit_index(suit: Optional[str]) -> int:
+    if suit is None: return NO_TRUMP
+    return SUIT_INDEX[suit]
+
+def suit_name(suit: int) -> Optional[str]:
+    if suit == NO_TRUMP: return None
+    return SUITS[suit]
+
+def to_mask(cards: Iterable[str]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= 1 << CARD_INDEX[card]
+    return mask
+
+def from_mask(mask: int) -> List[str]:
+    return [CARDS[card] for card in bits(mask)]
+
+def bits(mask: int) -> Iterator[int]:
+    """Yield the card indices set in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def count(mask: int) -> int:
+    return bin(mask).count("1")
+
+def effective_suit(card: int, trump: int) -> int:
+    return EFFECTIVE[trump][card]
+
+def playable_mask(hand: int, lead_card: Optional[int], trump: int) -> int:
+    """
+    Cards of hand that may legally be played to a trick led by lead_card.
+
+    Args:
+        hand: Mask of the cards held.
+        lead_card: First card of the trick, None when leading.
+        trump: Trump suit index (NO_TRUMP if undeclared).
+    """
+    if lead_card is None: return hand
+    follow = hand & SUIT_MASKS[trump][EFFECTIVE[trump][lead_card]]
+    return follow if follow else hand
+
+def trick_winner(trick: Sequence[Tuple[int, int]], trump: int) -> int:
+    """
+    Seat that wins a trick of (seat, card) pairs.
+    """
+    best_seat, best_card = trick[0]
+    values = VALUES[trump][EFFECTIVE[trump][best_card]]
+    best_value = values[best_card]
+
+    for seat, card in trick[1:]:
+        if values[card] > best_value:
+            best_seat, best_value = seat, values[card]
+
+    return best_seat
+
+def pick_up(hand: int, upcard: int, discard: int) -> int:
+    """Dealer's hand after taking the upcard and discarding."""
+    return (hand & ~(1 << discard)) | (1 << upcard)
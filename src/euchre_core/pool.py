@@ -0,0 +1,85 @@
+"""
+pool.py
+
+Free lists of engines and games for bulk simulation. A released object
+is reset in place when it is next acquired, so a simulation loop keeps
+reusing the same few objects (and their hand and trick lists) instead of
+allocating new ones for every game.
+
+    pool = GamePool()
+    for seed in seeds:
+        with pool.game(seed) as game:
+            ...
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Sequence
+from .EuchreEngine import EuchreEngine
+from .Game import Game
+
+class EnginePool:
+    """Reusable EuchreEngine instances."""
+    def __init__(self, size: int = 0):
+        """
+        Args:
+            size: Engines to allocate up front.
+        """
+        self._free: List[EuchreEngine] = [EuchreEngine() for _ in range(size)]
+
+    def __len__(self) -> int:
+        """Engines waiting to be reused."""
+        return len(self._free)
+
+    def acquire(self, seed: Optional[int] = None) -> EuchreEngine:
+        """An engine in the state of EuchreEngine(seed)."""
+        if not self._free: return EuchreEngine(seed)
+        engine = self._free.pop()
+        engine.reset(seed)
+        return engine
+
+    def release(self, engine: EuchreEngine) -> None:
+        """Hand an engine back, it must not be used after this."""
+        self._free.append(engine)
+
+    @contextmanager
+    def engine(self, seed: Optional[int] = None) -> Iterator[EuchreEngine]:
+        engine = self.acquire(seed)
+        try:
+            yield engine
+        finally:
+            self.release(engine)
+
+class GamePool:
+    """Reusable Game instances, each with its own EuchreEngine."""
+    def __init__(self, size: int = 0, names: Sequence[str] = ("0", "1", "2", "3")):
+        """
+        Args:
+            size: Games to allocate up front.
+            names: Player names of every game.
+        """
+        self._names = list(names)
+        self._free: List[Game] = [Game(EuchreEngine(), self._names) for _ in range(size)]
+
+    def __len__(self) -> int:
+        """Games waiting to be reused."""
+        return len(self._free)
+
+    def acquire(self, seed: Optional[int] = None, log: Any = None) -> Game:
+        """A game in the state of Game(EuchreEngine(seed), names, log)."""
+        if not self._free: return Game(EuchreEngine(seed), self._names, log)
+        game = self._free.pop()
+        game.reset(seed, log)
+        return game
+
+    def release(self, game: Game) -> None:
+        """Hand a game back, it must not be used after this."""
+        self._free.append(game)
+
+    @contextmanager
+    def game(self, seed: Optional[int] = None, log: Any = None) -> Iterator[Game]:
+        game = self.acquire(seed, log)
+        try:
+            yield game
+        finally:
+            self.release(game)
@@ -0,0 +1,76 @@
+"""
+rules.py
+
+Rules tables, computed once at import. Holds every (trump, lead) card
+ranking, the effective suit of every card under every trump and the left
+bower of every trump, so that CardTable, playable_cards and trick_winner
+index into a table instead of rebuilding one per trick or per call.
+
+String tables are keyed by card strings ("J♠") and suits ("♠", or None
+for no trump). The int tables (EFFECTIVE, SUIT_MASKS, VALUES) are the same
+rules indexed by card/suit ints, see masks.py.
+"""
+
+from typing import Dict, Optional, Tuple
+from .Deck import SUITS, RANKS
+
+OPPOSITE = {"♠":"♣", "♥":"♦", "♣":"♠", "♦":"♥"}
+TABLE_SUITS = ["♠", "♥", "♣", "♦"] # insertion order of the ranking tables
+TRUMPS = SUITS + [None]
+
+NUM_CARDS = 24
+NO_TRUMP = 4
+_CARDS = [r + s for s in SUITS for r in RANKS]
+
+def _ranking(trump: Optional[str], lead: Optional[str]) -> Dict[str, int]:
+    table = {}
+
+    for suit in TABLE_SUITS:
+        for rank in RANKS:
+            value = RANKS.index(rank)
+            if suit == trump: value = value + 12
+            if lead != trump and suit == lead: value = value + 6
+
+            table[f"{rank}{suit}"] = value
+
+    # Override right/left bower
+    if trump is not None:
+        table[f"J{trump}"] = 19
+        table[f"J{OPPOSITE[trump]}"] = 18
+
+    return table
+
+# RANKINGS[(trump, lead)][card] -> card value, shared, do not mutate
+RANKINGS: Dict[Tuple[Optional[str], Optional[str]], Dict[str, int]] = {
+    (trump, lead): _ranking(trump, lead) for trump in TRUMPS for lead in TRUMPS
+}
+
+# LEFT_BOWER[trump] -> the left bower card, None when there is no trump
+LEFT_BOWER: Dict[Optional[str], Optional[str]] = {
+    trump: None if trump is None else f"J{OPPOSITE[trump]}" for trump in TRUMPS
+}
+
+# EFFECTIVE_SUIT[trump][card] -> suit the card follows
+EFFECTIVE_SUIT: Dict[Optional[str], Dict[str, str]] = {
+    trump: {card: trump if card == LEFT_BOWER[trump] else card[-1] for card in _CARDS}
+    for trump in TRUMPS
+}
+
+# Int tables, trump/lead index NO_TRUMP (4) stands for None.
+# EFFECTIVE[trump][card] -> effective suit index
+EFFECTIVE = tuple(
+    tuple(TRUMPS.index(EFFECTIVE_SUIT[trump][card]) for card in _CARDS)
+    for trump in TRUMPS
+)
+
+# SUIT_MASKS[trump][suit] -> mask of every card following suit
+SUIT_MASKS = tuple(
+    tuple(sum(1 << card for card in range(NUM_CARDS) if EFFECTIVE[trump][card] == suit) for suit in range(4))
+    for trump in range(5)
+)
+
+# VALUES[trump][lead][card] -> card value, same ordering as RANKINGS
+VALUES = tuple(
+    tuple(tuple(RANKINGS[(trump, lead)][card] for card in _CARDS) for lead in TRUMPS)
+    for trump in TRUMPS
+)
@@ -0,0 +1,17 @@
+"""
+seeds.py
+
+Seed splitting shared by the engines and the tournament runner: one
+64-bit seed per stream index, independent of how streams are scheduled.
+"""
+
+MASK64 = (1 << 64) - 1
+
+def split_seed(seed: int, index: int) -> int:
+    """
+    Derive an independent 64-bit seed for stream `index` (splitmix64).
+    """
+    z = (seed * 0x9E3779B97F4A7C15 + (index + 1) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
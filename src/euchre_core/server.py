@@ -0,0 +1,347 @@
+"""
+server.py
+
+Asyncio server hosting many Game tables over TCP or Unix sockets.
+
+Every table is an actor: a task draining its inbox of actions into
+Game.input_code, one at a time. Every connection has a reader task and a
+writer task. Tables never wait on a client: after an input they mark
+the subscribed connections dirty, and each connection's writer sends
+observation_delta since the version that client last got, so a slow
+client gets fewer, larger deltas instead of holding anyone back.
+
+Frames are a u32 length (of what follows) and a u8 message type:
+
+    client -> server
+    CREATE  u64 seed                         new table, answered by TABLE
+    JOIN    u32 table, u8 seat               answered by VIEW
+    ACTION  u32 table, u8 seat, u8 action code, u8 data code (actions.py)
+
+    server -> client
+    TABLE   u32 table
+    VIEW    u32 table, u8 seat, JSON observation_for(seat)
+    DELTA   u32 table, u8 seat, JSON observation_delta(...)
+    ERROR   u32 table, UTF-8 message
+
+A seat belongs to the first connection to JOIN it, until that connection
+closes, and a connection may only send ACTIONs for seats it joined.
+Actions other than start and continue are only taken from the seat to act,
+and only (action, data) pairs in Game.legal_actions() are applied, anything
+else is answered by an ERROR and leaves the table as it was. So is an
+ACTION while the table's inbox is full. A table is removed once its game
+is over, after its last deltas are sent, or once its last subscriber leaves.
+
+    server = EuchreServer()
+    await server.serve_tcp("127.0.0.1", 7331)
+    client = await server.connect_local()
+"""
+
+from __future__ import annotations
+import asyncio
+import json
+import socket
+import struct
+from typing import Dict, Optional, Set, Tuple
+from . import actions
+from .EuchreEngine import EuchreEngine
+from .EuchreError import EuchreError
+from .Game import Game
+
+CREATE, JOIN, ACTION = 1, 2, 3
+TABLE, VIEW, DELTA, ERROR = 16, 17, 18, 19
+
+FRAME = struct.Struct("<IB")
+SEED = struct.Struct("<Q")
+SEAT = struct.Struct("<IB")
+MOVE = struct.Struct("<IBBB")
+TABLE_ID = struct.Struct("<I")
+
+MAX_FRAME = 1 << 20
+INBOX_SIZE = 64 # queued actions per table, more are answered by an ERROR
+NAMES = ["0", "1", "2", "3"]
+
+# actions any seated player may send
+_ANY_SEAT = {actions.START, actions.CONTINUE}
+
+def frame(kind: int, body: bytes = b"") -> bytes:
+    return FRAME.pack(len(body) + 1, kind) + body
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """(message type, body) of the next frame, raises IncompleteReadError at EOF."""
+    size, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+    if not 0 < size <= MAX_FRAME: raise EuchreError(f"Bad frame size {size}.")
+    return kind, await reader.readexactly(size - 1)
+
+def _view_frame(kind: int, table_id: int, seat: int, view: dict) -> bytes:
+    body = json.dumps(view, ensure_ascii=False, separators=(",", ":")).encode()
+    return frame(kind, SEAT.pack(table_id, seat) + body)
+
+class Table:
+    """One Game and the actor task applying its actions."""
+    def __init__(self, server: EuchreServer, table_id: int, seed: int):
+        self.server = server
+        self.table_id = table_id
+        self.game = Game(EuchreEngine(seed), NAMES)
+        self.subscribers: Set[Connection] = set()
+        self.seats: Dict[int, Connection] = {} # seat -> owning connection
+        self.inbox: asyncio.Queue = asyncio.Queue(INBOX_SIZE)
+        self.closed = False
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while True:
+            connection, seat, code, data = await self.inbox.get()
+            try:
+                self.act(seat, code, data)
+            except EuchreError as err:
+                connection.send(frame(ERROR, TABLE_ID.pack(self.table_id) + str(err).encode()))
+                continue
+
+            for subscriber in self.subscribers:
+                subscriber.mark_dirty(self)
+            if self.game.state == 8:
+                self.server.remove_table(self)
+                return
+
+    def leave(self, connection: Connection) -> None:
+        """Drop connection and free its seats, the last one out removes the table."""
+        self.subscribers.discard(connection)
+        for seat in [seat for seat, owner in self.seats.items() if owner is connection]:
+            del self.seats[seat]
+        if not self.subscribers: self.server.remove_table(self)
+
+    def act(self, seat: int, code: int, data: Optional[str]) -> None:
+        game = self.game
+        if code not in _ANY_SEAT and seat != game.engine.seat:
+            raise EuchreError(f"Seat {seat} is not the seat to act.")
+
+        # checked up front: the engine trusts Game to pass it legal data
+        action = actions.ACTIONS[code]
+        legal = game.legal_actions()
+        if (action, data) not in legal:
+            if all(name != action for name, _ in legal): raise EuchreError("Unhandled Action " + action)
+            raise EuchreError(f"'{data}' is not a legal {action}.")
+        game.input_code(code, data)
+
+class Connection:
+    """A client connection: reader loop, coalescing writer loop."""
+    def __init__(self, server: EuchreServer, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.sent: Dict[Tuple[int, int], int] = {} # (table, seat) -> version the client holds
+        self._outbox: list = []
+        self._dirty: Dict[int, Table] = {} # tables changed since the last write
+        self._wake = asyncio.Event()
+
+    def send(self, data: bytes) -> None:
+        self._outbox.append(data)
+        self._wake.set()
+
+    def mark_dirty(self, table: Table) -> None:
+        self._dirty[table.table_id] = table
+        self._wake.set()
+
+    async def run(self) -> None:
+        writer = asyncio.create_task(self.write_loop())
+        try:
+            await self.read_loop()
+        except (asyncio.IncompleteReadError, ConnectionError, EuchreError):
+            pass
+        finally:
+            writer.cancel()
+            for table_id in {table_id for table_id, _ in self.sent}:
+                table = self.server.tables.get(table_id)
+                if table is not None: table.leave(self)
+            self.writer.close()
+
+    async def read_loop(self) -> None:
+        while True:
+            kind, body = await read_frame(self.reader)
+            if kind == ACTION:
+                table_id, seat, code, data_code = MOVE.unpack(body)
+                table = self.server.tables.get(table_id)
+                if (table is None or code >= len(actions.ACTIONS)
+                        or (data_code >= actions.NUM_DATA and data_code != actions.NO_DATA)):
+                    self.send(frame(ERROR, TABLE_ID.pack(table_id) + b"Unknown table, action or data."))
+                    continue
+                if (table_id, seat) not in self.sent:
+                    self.send(frame(ERROR, TABLE_ID.pack(table_id) + f"Seat {seat} is not joined.".encode()))
+                    continue
+                try:
+                    table.inbox.put_nowait((self, seat, code, actions.decode_data(data_code)))
+                except asyncio.QueueFull:
+                    self.send(frame(ERROR, TABLE_ID.pack(table_id) + b"Table inbox is full."))
+            elif kind == JOIN:
+                table_id, seat = SEAT.unpack(body)
+                table = self.server.tables.get(table_id)
+                if table is None or not 0 <= seat < 4:
+                    self.send(frame(ERROR, TABLE_ID.pack(table_id) + b"Unknown table or seat."))
+                    continue
+                if table.seats.setdefault(seat, self) is not self:
+                    self.send(frame(ERROR, TABLE_ID.pack(table_id) + f"Seat {seat} is taken.".encode()))
+                    continue
+                table.subscribers.add(self)
+                view = table.game.observation_for(seat)
+                self.sent[(table_id, seat)] = view["version"]
+                self.send(_view_frame(VIEW, table_id, seat, view))
+            elif kind == CREATE:
+                table = self.server.create_table(SEED.unpack(body)[0])
+                self.send(frame(TABLE, TABLE_ID.pack(table.table_id)))
+            else:
+                raise EuchreError(f"Unknown message type {kind}.")
+
+    async def write_loop(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            data, self._outbox = self._outbox, []
+            dirty, self._dirty = self._dirty, {}
+            for key, version in list(self.sent.items()):
+                table = dirty.get(key[0])
+                if table is None: continue
+                delta = table.game.observation_delta(version, key[1])
+                data.append(_view_frame(DELTA, key[0], key[1], delta))
+                if table.closed: del self.sent[key]
+                else: self.sent[key] = delta["version"]
+
+            self.writer.write(b"".join(data))
+            await self.writer.drain()
+
+class EuchreServer:
+    """Hosts tables and accepts connections."""
+    def __init__(self):
+        self.tables: Dict[int, Table] = {}
+        self._next_id = 0
+        self._servers: list = []
+        self._connections: Set[asyncio.Task] = set()
+
+    def create_table(self, seed: int) -> Table:
+        table = Table(self, self._next_id, seed)
+        self.tables[table.table_id] = table
+        self._next_id += 1
+        return table
+
+    def remove_table(self, table: Table) -> None:
+        """Forget table and stop its task, deltas already marked are still sent."""
+        if table.closed: return
+        table.closed = True
+        del self.tables[table.table_id]
+        if table.task is not asyncio.current_task(): table.task.cancel()
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            await Connection(self, reader, writer).run()
+        finally:
+            self._connections.discard(task)
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        server = await asyncio.start_server(self._accept, host, port)
+        self._servers.append(server)
+        return server
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        server = await asyncio.start_unix_server(self._accept, path)
+        self._servers.append(server)
+        return server
+
+    async def connect_local(self) -> Client:
+        """An in-process client on one end of a socket pair."""
+        ours, theirs = socket.socketpair()
+        reader, writer = await asyncio.open_connection(sock=ours)
+        self._connections.add(asyncio.create_task(self._accept(reader, writer)))
+        return Client(*await asyncio.open_connection(sock=theirs))
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        tasks = [table.task for table in self.tables.values()] + list(self._connections)
+        for task in tasks: task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+class Client:
+    """
+    Minimal client. A reader task keeps `views`, the latest view of every
+    (table, seat) joined, up to date; replies (TABLE, VIEW, ERROR) queue up
+    for `recv`. Any number of tasks can share a client.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.views: Dict[Tuple[int, int], dict] = {}
+        self.closed = False
+        self._replies: asyncio.Queue = asyncio.Queue()
+        self._changed = asyncio.Condition()
+        self._pump = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                kind, body = await read_frame(self.reader)
+                if kind == TABLE:
+                    table_id = TABLE_ID.unpack(body)[0]
+                    self._replies.put_nowait((kind, table_id, table_id))
+                elif kind == ERROR:
+                    table_id = TABLE_ID.unpack_from(body)[0]
+                    self._replies.put_nowait((kind, table_id, body[TABLE_ID.size:].decode()))
+                else:
+                    table_id, seat = SEAT.unpack_from(body)
+                    payload = json.loads(body[SEAT.size:])
+                    if kind == VIEW:
+                        self.views[(table_id, seat)] = payload
+                        self._replies.put_nowait((kind, table_id, payload))
+                    else:
+                        self.views[(table_id, seat)].update(payload)
+
+                async with self._changed:
+                    self._changed.notify_all()
+        except (asyncio.IncompleteReadError, ConnectionError, EuchreError):
+            pass
+        finally:
+            self.closed = True
+            async with self._changed:
+                self._changed.notify_all()
+
+    async def recv(self) -> Tuple[int, int, object]:
+        """
+        Next reply as (type, table, payload): the table id for TABLE, the
+        view for VIEW, the text of an ERROR.
+        """
+        return await self._replies.get()
+
+    async def _expect(self, kind: int):
+        while True:
+            got, _, payload = await self.recv()
+            if got == kind: return payload
+            if got == ERROR: raise EuchreError(payload)
+
+    async def create_table(self, seed: int) -> int:
+        self.writer.write(frame(CREATE, SEED.pack(seed)))
+        return await self._expect(TABLE)
+
+    async def join(self, table_id: int, seat: int) -> dict:
+        self.writer.write(frame(JOIN, SEAT.pack(table_id, seat)))
+        return await self._expect(VIEW)
+
+    def act(self, table_id: int, seat: int, action: str, data: Optional[str] = None) -> None:
+        """Send an action, its outcome arrives as a DELTA or an ERROR."""
+        code, data_code = actions.encode(action, data)
+        self.writer.write(frame(ACTION, MOVE.pack(table_id, seat, code, data_code)))
+
+    async def wait_version(self, table_id: int, seat: int, version: int) -> dict:
+        """Wait until the view of (table, seat) reaches version."""
+        view_key = (table_id, seat)
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.closed or self.views[view_key]["version"] >= version)
+        if self.views[view_key]["version"] < version: raise EuchreError("Connection closed.")
+        return self.views[view_key]
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._pump.cancel()
+        await asyncio.gather(self._pump, return_exceptions=True)
@@ -0,0 +1,195 @@
+"""
+solver.py
+
+Double-dummy solver for trick play. With every hand known, finds how many
+tricks each team takes under best play from both sides and the best card
+for the seat to move.
+
+The search is alpha-beta over team 0's trick count on the mask core
+(masks.py). Moves are ordered strongest first by the card ranking,
+touching cards of one effective suit (no outstanding card between them)
+are searched once, and completed-trick positions are stored in a
+transposition table keyed on the remaining hands and the leader. Given a
+Tablebase (tablebase.py), trick boundaries it covers are read from it
+instead of searched.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from . import masks
+from .masks import EFFECTIVE, SUIT_MASKS, VALUES, NO_TRUMP
+from .EuchreError import EuchreError
+if TYPE_CHECKING: from .tablebase import Tablebase
+
+NOBODY = -1
+
+def _suit_orders():
+    # ORDER[trump][suit] -> cards of the effective suit, strongest first
+    orders = []
+    for trump in range(4):
+        by_suit = []
+        for suit in range(4):
+            cards = [c for c in range(masks.NUM_CARDS) if EFFECTIVE[trump][c] == suit]
+            by_suit.append(tuple(sorted(cards, key=lambda c: -VALUES[trump][suit][c])))
+        orders.append(tuple(by_suit))
+    return tuple(orders)
+
+ORDER = _suit_orders()
+
+class Solution(NamedTuple):
+    tricks: Tuple[int, int] # final tricks per team, already taken included
+    best_card: str          # card for the seat to move
+    nodes: int              # positions searched
+
+class DoubleDummy:
+    """
+    Solver for one trump suit and sitting-out seat. The transposition
+    table is kept between calls, so reuse an instance for positions of
+    the same hand.
+    """
+    def __init__(self, trump: int, sitting_out: int = NOBODY, tablebase: Optional[Tablebase] = None):
+        if trump == NO_TRUMP: raise EuchreError("Trump must be declared to solve trick play.")
+        self.trump = trump
+        self.sitting_out = sitting_out
+        self.tablebase = tablebase
+        self.endgame = tablebase.tricks if tablebase is not None else 0
+        self.players = 4 if sitting_out == NOBODY else 3
+        self.next_seat = [(s + 1) % 4 if (s + 1) % 4 != sitting_out else (s + 2) % 4 for s in range(4)]
+        self.table: Dict[tuple, Tuple[int, int]] = {}
+        self.nodes = 0
+
+    def solve(self, hands: List[int], seat: int, trick: Sequence[Tuple[int, int]] = ()) -> Tuple[int, int]:
+        """
+        Solve a position given as masks.
+
+        Args:
+            hands: Hand mask per seat, the sitting-out seat holds 0 or is ignored.
+            seat: Seat to move.
+            trick: (seat, card) pairs already played to the current trick.
+
+        Returns:
+            (tricks team 0 takes from here, best card for seat)
+        """
+        hands = list(hands)
+        trick = list(trick)
+        maximize = seat % 2 == 0
+        alpha, beta = -1, 6
+        best_card = -1
+
+        for card in self._moves(hands, trick, seat):
+            value = self._play(hands, trick, seat, card, alpha, beta)
+            if best_card == -1 or (value > alpha if maximize else value < beta):
+                best_card = card
+            if maximize: alpha = max(alpha, value)
+            else: beta = min(beta, value)
+
+        return (alpha if maximize else beta), best_card
+
+    def _search(self, hands: List[int], trick: List[Tuple[int, int]], seat: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+
+        if not trick:
+            if not (hands[0] | hands[1] | hands[2] | hands[3]): return 0
+            left = hands[seat].bit_count()
+            if left <= self.endgame:
+                value = self.tablebase.probe(hands, seat, self.trump, self.sitting_out)
+                return value if seat % 2 == 0 else left - value
+
+            key = (hands[0], hands[1], hands[2], hands[3], seat)
+            entry = self.table.get(key)
+            if entry is not None:
+                lower, upper = entry
+                if lower >= beta: return lower
+                if upper <= alpha: return upper
+                if lower == upper: return lower
+                alpha, beta = max(alpha, lower), min(beta, upper)
+
+            value = self._expand(hands, trick, seat, alpha, beta)
+
+            lower, upper = entry if entry is not None else (0, 5)
+            if value <= alpha: upper = min(upper, value)
+            elif value >= beta: lower = max(lower, value)
+            else: lower = upper = value
+            self.table[key] = (lower, upper)
+            return value
+
+        return self._expand(hands, trick, seat, alpha, beta)
+
+    def _expand(self, hands, trick, seat, alpha, beta) -> int:
+        if seat % 2 == 0:
+            value = -1
+            for card in self._moves(hands, trick, seat):
+                value = max(value, self._play(hands, trick, seat, card, alpha, beta))
+                alpha = max(alpha, value)
+                if alpha >= beta: break
+        else:
+            value = 6
+            for card in self._moves(hands, trick, seat):
+                value = min(value, self._play(hands, trick, seat, card, alpha, beta))
+                beta = min(beta, value)
+                if alpha >= beta: break
+        return value
+
+    def _play(self, hands, trick, seat, card, alpha, beta) -> int:
+        hands[seat] ^= 1 << card
+        trick.append((seat, card))
+
+        if len(trick) < self.players:
+            value = self._search(hands, trick, self.next_seat[seat], alpha, beta)
+        else:
+            winner = masks.trick_winner(trick, self.trump)
+            won = 1 if winner % 2 == 0 else 0
+            value = won + self._search(hands, [], winner, alpha - won, beta - won)
+
+        trick.pop()
+        hands[seat] ^= 1 << card
+        return value
+
+    def _moves(self, hands, trick, seat) -> List[int]:
+        trump = self.trump
+        lead = trick[0][1] if trick else None
+        legal = masks.playable_mask(hands[seat], lead, trump)
+        live = hands[0] | hands[1] | hands[2] | hands[3]
+        for _, card in trick: live |= 1 << card
+
+        moves = []
+        for suit in range(4):
+            mine = legal & SUIT_MASKS[trump][suit]
+            if not mine: continue
+
+            touching = False
+            for card in ORDER[trump][suit]:
+                bit = 1 << card
+                if mine & bit:
+                    if not touching: moves.append(card)
+                    touching = True
+                elif live & bit:
+                    touching = False
+
+        values = VALUES[trump][EFFECTIVE[trump][lead] if lead is not None else trump]
+        moves.sort(key=lambda c: -values[c])
+        return moves
+
+def solve(engine, tablebase: Optional[Tablebase] = None) -> Solution:
+    """
+    Solve an engine (EuchreEngine or MaskEngine) in trick play.
+
+    Args:
+        tablebase: Endgame table to read the last tricks from.
+
+    Raises:
+        EuchreError: If trump is not declared or the hand is finished.
+    """
+    if engine.trump is None: raise EuchreError("Trump must be declared to solve trick play.")
+    if engine.is_hand_finished(): raise EuchreError("The hand is finished.")
+
+    sitting_out = next((s for s in range(4) if engine.is_sitting_out(s)), NOBODY)
+    hands = [0 if s == sitting_out else masks.to_mask(engine.get_hand(s)) for s in range(4)]
+    trick = [(seat, masks.card_index(card)) for seat, card in engine.current_trick]
+    taken = engine._tricks_taken
+
+    solver = DoubleDummy(masks.suit_index(engine.trump), sitting_out, tablebase)
+    team0, best = solver.solve(hands, engine.seat, trick)
+    remaining = 5 - taken[0] - taken[1]
+
+    return Solution((taken[0] + team0, taken[1] + remaining - team0), masks.card_name(best), solver.nodes)
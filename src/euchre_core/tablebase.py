@@ -0,0 +1,280 @@
+"""
+tablebase.py
+
+Endgame tablebase: the double-dummy trick count of every position with
+few tricks left, precomputed so the solver (and anything calling it)
+reads a leaf in O(1) instead of searching it.
+
+At a trick boundary only the relative order of the cards left matters.
+A position is canonicalized by
+
+    - taking trump as suit 0 and the other suits in index order,
+    - replacing each effective suit by its owners, strongest card first,
+    - numbering seats from the leader (0) in play order.
+
+so a position is a tuple of 4 owner tuples, e.g. ((0, 2), (1,), ...).
+Its index in a section is the rank of the suit lengths among the
+compositions of the card count, times the multiset permutations, plus the
+rank of the owner sequence. Relabeling the off-suits does not change the
+value, the generator solves one position per relabeling class.
+
+Tricks taken before do not enter the key: with every card known, the
+maximal trick count also decides whether a team makes, marches or gets
+euchred.
+
+File layout (little endian):
+
+    header  "EUTB", version, tricks, 2 pad bytes
+    values  u8 tricks the leader's team takes, one section per (tricks
+            left 1.., sitting out seat relative to the leader: none, 1,
+            2, 3) in that order
+
+    python -m euchre_core.tablebase tablebase.bin
+    with Tablebase("tablebase.bin") as table:
+        solve(engine, table)
+"""
+
+from __future__ import annotations
+import argparse
+import mmap
+import struct
+from functools import lru_cache
+from math import factorial
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+from .EuchreError import EuchreError
+from .solver import ORDER, NOBODY
+
+VERSION = 1
+MAX_TRICKS = 3 # 2 builds in about 10 s, 3 is ~170M positions
+SITTING_OUT = (NOBODY, 1, 2, 3)
+
+HEADER = struct.Struct("<4sBB2x")
+
+Position = Tuple[Tuple[int, ...], ...]
+
+def _play_order(out: int) -> Tuple[int, ...]:
+    return tuple(seat for seat in range(4) if seat != out)
+
+@lru_cache(maxsize=None)
+def _compositions(cards: int) -> Dict[Tuple[int, int, int, int], int]:
+    """Suit lengths summing to cards, mapped to their rank."""
+    lengths = [(a, b, c, cards - a - b - c)
+               for a in range(cards + 1) for b in range(cards + 1 - a) for c in range(cards + 1 - a - b)]
+    return {length: i for i, length in enumerate(lengths)}
+
+def _sequences(players: int, tricks: int) -> Iterator[Tuple[int, ...]]:
+    """Owner sequences (player numbers) holding tricks cards each, in lexicographic order."""
+    counts = [tricks] * players
+    sequence: List[int] = []
+
+    def extend():
+        if len(sequence) == players * tricks:
+            yield tuple(sequence)
+            return
+        for player in range(players):
+            if not counts[player]: continue
+            counts[player] -= 1
+            sequence.append(player)
+            yield from extend()
+            sequence.pop()
+            counts[player] += 1
+
+    return extend()
+
+@lru_cache(maxsize=None)
+def _sequence_ranks(players: int, tricks: int) -> Dict[Tuple[int, ...], int]:
+    return {sequence: i for i, sequence in enumerate(_sequences(players, tricks))}
+
+def _section_size(players: int, tricks: int) -> int:
+    return len(_compositions(players * tricks)) * factorial(players * tricks) // factorial(tricks) ** players
+
+def _sections(tricks: int) -> Dict[Tuple[int, int], int]:
+    """Offset of each (tricks left, sitting out) section from the start of the values."""
+    offsets = {}
+    offset = 0
+    for left in range(1, tricks + 1):
+        for out in SITTING_OUT:
+            offsets[(left, out)] = offset
+            offset += _section_size(len(_play_order(out)), left)
+    offsets[(tricks + 1, NOBODY)] = offset # end
+    return offsets
+
+def _local_index(position: Position, out: int, tricks: int) -> int:
+    """Index of a canonical position within its section."""
+    players = 3 if out != NOBODY else 4
+    player = (0, 1, 2, 3) if out == NOBODY else {seat: i for i, seat in enumerate(_play_order(out))}
+    lengths = (len(position[0]), len(position[1]), len(position[2]), len(position[3]))
+    sequence = tuple(player[owner] for suit in position for owner in suit)
+
+    ranks = _sequence_ranks(players, tricks)
+    return _compositions(players * tricks)[lengths] * len(ranks) + ranks[sequence]
+
+def canonical_position(hands: Sequence[int], leader: int, trump: int) -> Position:
+    """Canonical position of hand masks at a trick boundary, see the module docstring."""
+    h0, h1, h2, h3 = hands
+    live = h0 | h1 | h2 | h3
+    suits = (trump,) + tuple(suit for suit in range(4) if suit != trump)
+
+    position = []
+    for suit in suits:
+        owners = []
+        for card in ORDER[trump][suit]:
+            bit = 1 << card
+            if not live & bit: continue
+            seat = 0 if h0 & bit else 1 if h1 & bit else 2 if h2 & bit else 3
+            owners.append((seat - leader) % 4)
+        position.append(tuple(owners))
+    return tuple(position)
+
+def _trick_value(position: Position, out: int, tricks: int, lookup: Callable[[Position, int, int], int]) -> int:
+    """
+    Tricks the leader's team takes from position, one trick of minimax
+    over lookup of the positions with a trick less.
+    """
+    order = _play_order(out)
+    played: List[Tuple[int, int]] = []
+
+    def settle() -> int:
+        trumps = [j for s, j in played if s == 0]
+        if trumps: suit, j = 0, min(trumps)
+        else: suit, j = played[0][0], min(j for s, j in played if s == played[0][0])
+        winner = position[suit][j]
+        won = 1 if winner % 2 == 0 else 0
+        if tricks == 1: return won
+
+        gone = set(played)
+        rest = tuple(
+            tuple((owner - winner) % 4 for i, owner in enumerate(owners) if (s, i) not in gone)
+            for s, owners in enumerate(position)
+        )
+        value = lookup(rest, NOBODY if out == NOBODY else (out - winner) % 4, tricks - 1)
+        return won + (value if won else tricks - 1 - value)
+
+    hands = {seat: [(s, j) for s, owners in enumerate(position) for j, owner in enumerate(owners) if owner == seat]
+             for seat in order}
+
+    def play(turn: int) -> int:
+        seat = order[turn]
+        cards = hands[seat]
+        if turn:
+            follow = [card for card in cards if card[0] == played[0][0]]
+            if follow: cards = follow
+
+        maximize = seat % 2 == 0
+        best = -1
+        for s, j in cards:
+            if j and position[s][j - 1] == seat: continue # touching card of the same seat
+            played.append((s, j))
+            value = play(turn + 1) if turn + 1 < len(order) else settle()
+            played.pop()
+            if best < 0 or (value > best if maximize else value < best): best = value
+            if best == (tricks if maximize else 0): break
+        return best
+
+    return play(0)
+
+def _canonical_suits(position: Position) -> Position:
+    return (position[0],) + tuple(sorted(position[1:]))
+
+def build(path: str, tricks: int = 2) -> None:
+    """Solve every position with up to tricks tricks left and write the table to path."""
+    if not 1 <= tricks <= MAX_TRICKS: raise EuchreError(f"Tablebase tricks must be 1 to {MAX_TRICKS}.")
+    offsets = _sections(tricks)
+    values = bytearray(offsets[(tricks + 1, NOBODY)])
+
+    def lookup(position: Position, out: int, left: int) -> int:
+        return values[offsets[(left, out)] + _local_index(position, out, left)]
+
+    for left in range(1, tricks + 1):
+        for out in SITTING_OUT:
+            order = _play_order(out)
+            base = offsets[(left, out)]
+            ranks = _sequence_ranks(len(order), left)
+            copies = []
+
+            for lengths, composition in _compositions(len(order) * left).items():
+                for sequence, rank in ranks.items():
+                    owners = [order[player] for player in sequence]
+                    position = []
+                    start = 0
+                    for length in lengths:
+                        position.append(tuple(owners[start:start + length]))
+                        start += length
+                    position = tuple(position)
+
+                    index = base + composition * len(ranks) + rank
+                    canonical = _canonical_suits(position)
+                    if canonical == position: values[index] = _trick_value(position, out, left, lookup)
+                    else: copies.append((index, canonical))
+
+            for index, canonical in copies:
+                values[index] = lookup(canonical, out, left)
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(b"EUTB", VERSION, tricks))
+        file.write(values)
+
+class Tablebase:
+    """Read-only, memory-mapped view of a table written by build."""
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, tricks = HEADER.unpack_from(self._map)
+            if magic != b"EUTB": raise EuchreError("Not a tablebase.")
+            if version != VERSION: raise EuchreError(f"Unsupported tablebase version {version}.")
+            if not 1 <= tricks <= MAX_TRICKS: raise EuchreError("Corrupt tablebase header.")
+            self._offsets = _sections(tricks)
+            if len(self._map) != HEADER.size + self._offsets[(tricks + 1, NOBODY)]:
+                raise EuchreError("Truncated tablebase.")
+        except EuchreError:
+            self.close()
+            raise
+
+        self.tricks = tricks
+
+    def lookup(self, position: Position, out: int = NOBODY) -> int:
+        """Tricks the leader's team takes from a canonical position."""
+        left = sum(map(len, position)) // (3 if out != NOBODY else 4)
+        return self._map[HEADER.size + self._offsets[(left, out)] + _local_index(position, out, left)]
+
+    def probe(self, hands: Sequence[int], leader: int, trump: int, sitting_out: int = NOBODY) -> int:
+        """
+        Tricks the leader's team takes from a trick boundary.
+
+        Args:
+            hands: Hand mask per seat, the sitting-out seat's is ignored.
+            leader: Seat to lead.
+            trump: Trump suit index.
+            sitting_out: Seat whose partner went alone, or NOBODY.
+
+        Raises:
+            EuchreError: If the position has more tricks left than the table.
+        """
+        left = hands[leader].bit_count()
+        if not 1 <= left <= self.tricks: raise EuchreError(f"{left} tricks left is outside the tablebase.")
+        if sitting_out == NOBODY: return self.lookup(canonical_position(hands, leader, trump))
+
+        hands = [0 if seat == sitting_out else hand for seat, hand in enumerate(hands)]
+        return self.lookup(canonical_position(hands, leader, trump), (sitting_out - leader) % 4)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the endgame tablebase.")
+    parser.add_argument("path", help="file to write")
+    parser.add_argument("--tricks", type=int, default=2, help="tricks left covered (default 2)")
+    args = parser.parse_args(argv)
+    build(args.path, args.tricks)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+tournament.py
+
+Plays many games between bot policies across all cores.
+
+Every game has an index. Its engine seed is `split_seed(seed, index)`, so
+any single game is reproduced with `play_game(policies, split_seed(seed,
+index))` regardless of how the tournament was scheduled. Results are
+streamed back from a ProcessPoolExecutor with a bounded number of games in
+flight and folded into a TournamentStats as they arrive.
+
+    python -m euchre_core.tournament --games 10000 --seed 7 random_bot passive_bot
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence
+from .Game import Game
+from .pool import GamePool
+from .seeds import split_seed
+from . import bots
+
+MAX_HANDS = 1000 # guard against policies that never finish a game
+
+class GameResult(NamedTuple):
+    index: int
+    seed: int
+    points: tuple
+    hands: int
+    complete: bool = True # False when stopped at MAX_HANDS
+
+    @property
+    def winner(self) -> Optional[int]:
+        """Winning team, None for a game stopped at MAX_HANDS."""
+        if not self.complete: return None
+        return 0 if self.points[0] > self.points[1] else 1
+
+def play_game(policies: Sequence[Callable], seed: int, index: int = 0,
+              pool: Optional[GamePool] = None) -> GameResult:
+    """
+    Play one game to completion.
+
+    Args:
+        policies: Two policies (one per team) or four (one per seat).
+        seed: Engine seed, the bots' rng is split from it.
+        index: Game index recorded in the result.
+        pool: Reuse a game from this pool instead of allocating one.
+    """
+    if pool is None: pool = GamePool()
+    with pool.game(seed) as game:
+        return _play(policies, game, seed, index)
+
+def _play(policies: Sequence[Callable], game: Game, seed: int, index: int) -> GameResult:
+    if len(policies) == 2: policies = [policies[0], policies[1], policies[0], policies[1]]
+
+    engine = game.engine
+    rng = random.Random(split_seed(seed, 0))
+    hands = 0
+
+    game.input("start")
+    while game.state != 8:
+        state = game.state
+        if state in (6, 7):
+            if state == 7: hands += 1
+            if hands > MAX_HANDS: break
+            game.input("continue")
+        else:
+            game.input(*policies[engine.seat](game, rng))
+
+    return GameResult(index, seed, engine.points, hands, game.state == 8)
+
+def _play_range(policies, seed: int, start: int, stop: int) -> List[GameResult]:
+    pool = GamePool(1)
+    return [play_game(policies, split_seed(seed, i), i, pool) for i in range(start, stop)]
+
+def run_games(policies: Sequence[Callable], games: int, seed: int = 0,
+              workers: Optional[int] = None, batch: int = 64) -> Iterator[GameResult]:
+    """
+    Stream the results of games 0..games-1 as batches complete.
+
+    At most 2 * workers batches are in flight, so memory does not grow with
+    the number of games. Results arrive in batch submission order.
+
+    Args:
+        policies: Picklable policies, see play_game.
+        games: Number of games.
+        seed: Tournament seed.
+        workers: Worker processes, defaults to os.cpu_count(); 0 plays inline.
+        batch: Games per task.
+    """
+    if workers == 0:
+        for start in range(0, games, batch):
+            yield from _play_range(policies, seed, start, min(start + batch, games))
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        for start in range(0, games, batch):
+            pending.append(pool.submit(_play_range, policies, seed, start, min(start + batch, games)))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+@dataclass
+class TournamentStats:
+    games: int = 0
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    points: List[int] = field(default_factory=lambda: [0, 0])
+    hands: int = 0
+    incomplete: int = 0 # games stopped at MAX_HANDS, counted in no team's wins
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        if result.complete: self.wins[result.winner] += 1
+        else: self.incomplete += 1
+        self.points[0] += result.points[0]
+        self.points[1] += result.points[1]
+        self.hands += result.hands
+
+    def win_rate(self, team: int) -> float:
+        return self.wins[team] / self.games if self.games else 0.0
+
+def tournament(policies: Sequence[Callable], games: int, seed: int = 0,
+               workers: Optional[int] = None, batch: int = 64,
+               on_result: Optional[Callable[[GameResult], None]] = None) -> TournamentStats:
+    """
+    Play `games` games and aggregate the results as they stream in.
+
+    Args:
+        on_result: Optional callback for each GameResult (logging, progress).
+    """
+    stats = TournamentStats()
+    for result in run_games(policies, games, seed, workers, batch):
+        stats.add(result)
+        if on_result is not None: on_result(result)
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a euchre bot tournament.")
+    parser.add_argument("policies", nargs="+", help="bot function names from euchre_core.bots (2 or 4)")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    policies = [getattr(bots, name) for name in args.policies]
+    stats = tournament(policies, args.games, args.seed, args.workers, args.batch)
+
+    print(f"games: {stats.games}  hands: {stats.hands}  incomplete: {stats.incomplete}")
+    for team in (0, 1):
+        print(f"team {team}: wins {stats.wins[team]} ({stats.win_rate(team):.3f})  points {stats.points[team]}")
+
+if __name__ == "__main__":
+    main()
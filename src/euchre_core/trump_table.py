@@ -0,0 +1,135 @@
+"""
+trump_table.py
+
+Precomputed trump features of every 5-card hand. There are NUM_HANDS
+(42,504) hands and 4 trump suits, the builder writes one fixed-size
+record per (hand, trump) to a file that TrumpTable maps read-only, so
+any number of worker processes share one copy through the page cache.
+
+File layout (little endian):
+
+    header  "EUTT", version, 3 pad bytes, u32 hand count
+    record  per hand index (deals.hand_index), per trump suit index:
+            u8 trumps, u8 bowers (bit 0 right, bit 1 left),
+            u8 off-suit aces, u8 off-suit voids, u16 strength, 2 pad bytes
+
+Strength is sum(card rank among trumps, 1 for the 9 up to 7 for the right
+bower) + 2 per off-suit ace + 1 per void when holding trump.
+
+    python -m euchre_core.trump_table trump_table.bin
+    table = TrumpTable("trump_table.bin")
+    table.lookup(hand_mask, trump).strength
+"""
+
+from __future__ import annotations
+import argparse
+import mmap
+import struct
+from typing import Iterable, NamedTuple
+from . import deals
+from .EuchreError import EuchreError
+from .masks import FULL_MASK, JACK, SUIT_INDEX, EFFECTIVE, bits, rank_of, same_color_suit, to_mask
+
+VERSION = 1
+ACE = 5
+
+HEADER = struct.Struct("<4sB3xI")
+RECORD = struct.Struct("<BBBBH2x")
+
+class TrumpFeatures(NamedTuple):
+    trumps: int     # cards of the trump suit, bowers included
+    right: bool     # holds the jack of trump
+    left: bool      # holds the jack of the same color suit
+    off_aces: int   # aces of the other suits
+    voids: int      # other suits without a card
+    strength: int
+
+def features_of(hand: int, trump: int) -> TrumpFeatures:
+    """Compute the features of a hand mask under a trump suit index."""
+    effective = EFFECTIVE[trump]
+    right = trump * 6 + JACK
+    left = same_color_suit(trump) * 6 + JACK
+
+    trumps = off_aces = strength = 0
+    suits = 0
+    for card in bits(hand):
+        suit = effective[card]
+        suits |= 1 << suit
+        if suit == trump:
+            trumps += 1
+            if card == right: strength += 7
+            elif card == left: strength += 6
+            else: strength += rank_of(card) + 1 - (rank_of(card) > JACK)
+        elif rank_of(card) == ACE:
+            off_aces += 1
+
+    voids = 3 - (suits & ~(1 << trump)).bit_count()
+    strength += 2 * off_aces + (voids if trumps else 0)
+    return TrumpFeatures(trumps, bool(hand >> right & 1), bool(hand >> left & 1), off_aces, voids, strength)
+
+def build(path: str) -> None:
+    """Write the table of every hand to path."""
+    buffer = bytearray(HEADER.size + RECORD.size * 4 * deals.NUM_HANDS)
+    HEADER.pack_into(buffer, 0, b"EUTT", VERSION, deals.NUM_HANDS)
+
+    for index in range(deals.NUM_HANDS):
+        hand = deals.hand_at(index)
+        offset = HEADER.size + RECORD.size * 4 * index
+        for trump in range(4):
+            f = features_of(hand, trump)
+            RECORD.pack_into(buffer, offset + RECORD.size * trump,
+                             f.trumps, f.right | f.left << 1, f.off_aces, f.voids, f.strength)
+
+    with open(path, "wb") as file:
+        file.write(buffer)
+
+class TrumpTable:
+    """Read-only, memory-mapped view of a table written by build."""
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, hands = HEADER.unpack_from(self._map)
+            if magic != b"EUTT": raise EuchreError("Not a trump table.")
+            if version != VERSION: raise EuchreError(f"Unsupported trump table version {version}.")
+            if hands != deals.NUM_HANDS or len(self._map) != HEADER.size + RECORD.size * 4 * hands:
+                raise EuchreError("Truncated trump table.")
+        except EuchreError:
+            self.close()
+            raise
+
+    def lookup(self, hand: int, trump: int) -> TrumpFeatures:
+        """Features of a 5-card hand mask under a trump suit index."""
+        if hand & ~FULL_MASK or hand < 0 or hand.bit_count() != deals.HAND_SIZE:
+            raise EuchreError(f"Hand mask {hand:#x} is not {deals.HAND_SIZE} distinct cards.")
+        if not 0 <= trump < 4: raise EuchreError(f"Bad trump suit index {trump}.")
+        offset = HEADER.size + RECORD.size * (4 * deals.hand_index(hand) + trump)
+        trumps, bowers, off_aces, voids, strength = RECORD.unpack_from(self._map, offset)
+        return TrumpFeatures(trumps, bool(bowers & 1), bool(bowers & 2), off_aces, voids, strength)
+
+    def features(self, hand: Iterable[str], trump: str) -> TrumpFeatures:
+        """lookup for string cards and suit."""
+        hand = list(hand)
+        if len(hand) != deals.HAND_SIZE: raise EuchreError(f"Expected {deals.HAND_SIZE} cards, got {len(hand)}.")
+        if trump not in SUIT_INDEX: raise EuchreError(f"Unknown suit {trump}.")
+        return self.lookup(to_mask(hand), SUIT_INDEX[trump])
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the trump feature table.")
+    parser.add_argument("path", help="file to write")
+    args = parser.parse_args(argv)
+    build(args.path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+zobrist.py
+
+Zobrist keys for hashing engine state. Every (feature, value) pair gets a
+fixed random 64-bit key and a state hash is the xor of the keys of its
+features, so a change to one feature updates the hash with one or two
+xors. The keys come from a fixed seed and are stable across processes.
+
+Cards are indexed as in masks.py, seats 0..3, suits in Deck.SUITS order.
+"""
+
+import random
+from .masks import CARD_INDEX, SUIT_INDEX, NUM_CARDS
+
+_rng = random.Random(0x5EED_E0C4E)
+
+def _keys(*shape):
+    if len(shape) == 1: return tuple(_rng.getrandbits(64) for _ in range(shape[0]))
+    return tuple(_keys(*shape[1:]) for _ in range(shape[0]))
+
+HAND = _keys(4, NUM_CARDS)          # [seat][card] card held by seat
+PLAYED = _keys(5, 4, NUM_CARDS)     # [trick][seat][card] card played
+UPCARD = _keys(NUM_CARDS)
+DOWNCARD = _keys(NUM_CARDS)
+DISCARD = _keys(NUM_CARDS)
+TRUMP = _keys(4)
+MAKER = _keys(4)
+ALONE = _keys(4)
+SEAT = _keys(4)                     # seat to act
+LEADER = _keys(4)                   # first seat of player_order
+DEALER = _keys(4)
+TAKEN = _keys(2, 16)                # [team][tricks taken]
+POINTS = _keys(2, 64)               # [team][points]
+
+def card_key(table, card: str) -> int:
+    return table[CARD_INDEX[card]]
+
+def suit_key(suit) -> int:
+    """TRUMP key of suit, 0 (no contribution) for None."""
+    return 0 if suit is None else TRUMP[SUIT_INDEX[suit]]
+
+def seat_key(table, seat) -> int:
+    """Key of an optional seat (maker), 0 for None."""
+    return 0 if seat is None else table[seat]
@@ -10,6 +10,7 @@ class FakeEngine:
         self.seat = 0
         self.dealer = 0
         self._tricks_taken = [0, 0]
+        self.hand = ["9♣", "A♠"] # every seat's hand, Game checks the dealer's pick-up against it
 
         # return values you control in tests
         self._is_trick_finished = False
@@ -33,6 +34,9 @@ class FakeEngine:
         self.calls.append(("next_player",))
         self.seat = (self.seat + 1) % 4
 
+    def get_hand(self, seat):
+        return self.hand
+
     def order_up(self):
         self.calls.append(("order_up",))
 
@@ -0,0 +1,162 @@
+"""
+tests/test_actionlog.py
+"""
+
+import os
+import random
+import pytest
+from euchre_core import EuchreEngine, EuchreError, Game
+from euchre_core import actionlog
+from euchre_core.actionlog import ActionLogWriter, ActionLogReader
+from euchre_core.bots import random_bot
+from euchre_core import actions, codec
+
+
+def step(game, rng):
+    if game.state in (6, 7): game.input("continue")
+    else: game.input(*random_bot(game, rng))
+
+
+def test_encode_decode_round_trip():
+    for action, data in [("play", "J♦"), ("make", "♣"), ("alone", "♥"), ("alone", None), ("pass", None)]:
+        assert actions.decode(*actions.encode(action, data)) == (action, data)
+    assert actions.encode("continue", "ignored") == (actions.CONTINUE, actions.NO_DATA)
+    with pytest.raises(EuchreError):
+        actions.encode("shuffle")
+
+
+def test_replay_rebuilds_interleaved_games(tmp_path):
+    path = str(tmp_path / "games.log")
+    seeds = [11, 22, 33]
+    rngs = [random.Random(s) for s in seeds]
+    snapshots = [[] for _ in seeds]
+
+    with ActionLogWriter(path) as writer:
+        games = [Game(EuchreEngine(s), ["a", "b", "c", "d"], log=writer.open_game(s)) for s in seeds]
+        for game in games: game.input("start")
+
+        # interleave the games record by record
+        while any(g.state != 8 for g in games):
+            for i, game in enumerate(games):
+                if game.state == 8: continue
+                step(game, rngs[i])
+                snapshots[i].append(codec.dumps(game))
+        for game in games: game.log.close()
+
+    with ActionLogReader(path) as reader:
+        assert sorted(reader.games()) == [0, 1, 2]
+        for i in range(3):
+            assert codec.dumps(reader.replay(i)) == snapshots[i][-1]
+            middle = len(snapshots[i]) // 2
+            # replay `start` plus `middle + 1` steps
+            assert codec.dumps(reader.replay(i, stop=middle + 2)) == snapshots[i][middle]
+
+
+def test_replay_hand_and_reopen(tmp_path):
+    path = str(tmp_path / "games.log")
+    rng = random.Random(4)
+
+    with ActionLogWriter(path) as writer:
+        game = Game(EuchreEngine(4), ["a", "b", "c", "d"], log=writer.open_game(4))
+        game.input("start")
+        deals = [codec.dumps(game)]
+        while game.state != 8:
+            step(game, rng)
+            if game.state == 1 and game.last_action == "continue": deals.append(codec.dumps(game))
+
+    with ActionLogReader(path) as reader:
+        for hand, deal in enumerate(deals):
+            assert codec.dumps(reader.replay_hand(0, hand)) == deal
+        with pytest.raises(EuchreError):
+            reader.replay_hand(0, len(deals))
+
+    with ActionLogWriter(path) as writer:
+        assert writer.open_game(5).game_id == 1
+
+
+def test_rejected_inputs_are_not_logged(tmp_path):
+    path = str(tmp_path / "games.log")
+    with ActionLogWriter(path) as writer:
+        game = Game(EuchreEngine(1), ["a", "b", "c", "d"], log=writer.open_game(1))
+        game.input("start")
+        with pytest.raises(EuchreError):
+            game.input("play", "9♣")
+        game.input("pass")
+
+    with ActionLogReader(path) as reader:
+        assert list(reader.actions(0)) == [("start", None), ("pass", None)]
+
+
+def test_seed_required(tmp_path):
+    with ActionLogWriter(str(tmp_path / "games.log")) as writer:
+        with pytest.raises(EuchreError):
+            writer.open_game(None)
+
+
+def play_logged(writer, seed, moves=None):
+    rng = random.Random(seed)
+    game = Game(EuchreEngine(seed), ["a", "b", "c", "d"], log=writer.open_game(seed))
+    game.input("start")
+    while game.state != 8 and (moves is None or moves > 0):
+        step(game, rng)
+        if moves is not None: moves -= 1
+    return game
+
+
+def test_reader_uses_the_index_without_scanning(tmp_path):
+    path = str(tmp_path / "games.log")
+    with ActionLogWriter(path) as writer:
+        for seed in range(3): play_logged(writer, seed).log.close()
+
+    with ActionLogReader(path) as reader:
+        assert [seed for seed, _ in reader.games().values()] == [0, 1, 2]
+        assert reader.indexed and reader.unindexed == []
+        assert [offset for _, offset in reader.games().values()] == [
+            offset for offset, _, code, _, _ in reader.records() if code == actionlog.BEGIN]
+
+
+def test_missing_or_stale_index_is_rebuilt(tmp_path):
+    path = str(tmp_path / "games.log")
+    with ActionLogWriter(path) as writer:
+        play_logged(writer, 1, moves=10)
+    with ActionLogWriter(path) as writer:
+        play_logged(writer, 2, moves=10)
+
+    with ActionLogReader(path) as reader:
+        expected = reader.games()
+    os.remove(actionlog.index_path(path))
+    with ActionLogReader(path) as reader:
+        assert not reader.indexed and reader.games() == expected
+
+    # the next writer writes the index again, with the entries a crash lost
+    with ActionLogWriter(path) as writer:
+        assert writer.open_game(3).game_id == 2
+    with open(actionlog.index_path(path), "r+b") as index:
+        index.truncate(os.path.getsize(actionlog.index_path(path)) - actionlog.INDEX_ENTRY.size - 3)
+    with ActionLogReader(path) as reader:
+        assert reader.indexed and sorted(reader.games()) == [0, 1, 2]
+        assert [game_id for _, game_id, _, _ in reader.unindexed] == [2]
+
+
+def test_game_without_end_stops_at_the_next_writer(tmp_path):
+    path = str(tmp_path / "games.log")
+    with ActionLogWriter(path) as writer:
+        game = play_logged(writer, 7, moves=6)
+    with ActionLogWriter(path) as writer:
+        # a stray record for game 0 from a later writer is not part of it
+        writer.write_record(0, actions.PASS, actions.NO_DATA)
+
+    with ActionLogReader(path) as reader:
+        assert codec.dumps(reader.replay(0)) == codec.dumps(game)
+        assert len(list(reader.actions(0))) == 7
+
+
+def test_truncated_begin_record_is_an_error(tmp_path):
+    path = str(tmp_path / "games.log")
+    with ActionLogWriter(path) as writer:
+        writer.open_game(1)
+    with open(path, "r+b") as log:
+        log.truncate(actionlog.HEADER.size + actionlog.RECORD.size + 3)
+
+    with pytest.raises(EuchreError, match="Truncated BEGIN"):
+        ActionLogReader(path)
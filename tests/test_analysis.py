@@ -0,0 +1,73 @@
+"""
+tests/test_analysis.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreError
+from euchre_core import analysis as A
+from euchre_core import tablebase as TB
+from euchre_core.masks import card_name
+from euchre_core.solver import solve
+from test_solver import trick_play_engine
+
+
+def engine_deals(count, alone=False):
+    engines = [trick_play_engine(seed, tricks_to_play=1, alone=alone) for seed in range(count)]
+    return engines, [A.deal_of(engine) for engine in engines]
+
+
+@pytest.mark.parametrize("alone", [False, True])
+def test_inline_matches_solve(alone):
+    engines, deals = engine_deals(8, alone)
+    results = A.solve_deals(deals, workers=0)
+
+    for i, engine in enumerate(engines):
+        expected = solve(engine)
+        assert results.tricks[i] + engine._tricks_taken[0] == expected.tricks[0]
+    assert len(results.best) == len(deals)
+
+
+def test_worker_processes_match_inline():
+    deals = A.random_deals(random.Random(3), 24)
+    reports = []
+    pooled = A.solve_deals(deals, workers=2, chunk=5, progress=reports.append)
+    inline = A.solve_deals(deals, workers=0)
+
+    assert pooled.tricks == inline.tricks
+    assert pooled.best == inline.best
+    assert pooled.nodes == inline.nodes
+    assert [r.done for r in reports] == sorted(r.done for r in reports)
+    assert reports[-1].done == reports[-1].total == 24
+    assert reports[-1].rate > 0
+
+
+def test_best_card_keeps_the_value():
+    engines, deals = engine_deals(4)
+    results = A.solve_deals(deals, workers=0)
+    for i, engine in enumerate(engines):
+        before = engine._tricks_taken[0]
+        engine.apply(card_name(results.best[i]))
+        assert solve(engine).tricks[0] == before + results.tricks[i]
+
+
+def test_tablebase_gives_the_same_results(tmp_path):
+    path = tmp_path / "tablebase.bin"
+    TB.build(str(path), 1)
+    deals = A.random_deals(random.Random(5), 10)
+
+    with_table = A.solve_deals(deals, workers=0, tablebase=str(path))
+    assert with_table.tricks == A.solve_deals(deals, workers=0).tricks
+    assert with_table.tricks == A.solve_deals(deals, workers=1, tablebase=str(path)).tricks
+
+
+def test_empty_batch():
+    results = A.solve_deals([])
+    assert len(results.tricks) == 0
+
+
+def test_deal_of_requires_a_trick_boundary():
+    engine = trick_play_engine(0)
+    engine.apply(engine.playable_cards()[0])
+    with pytest.raises(EuchreError):
+        A.deal_of(engine)
@@ -0,0 +1,94 @@
+"""
+tests/test_batch_engine.py
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from euchre_core import MaskEngine, EuchreError, team_of
+from euchre_core.BatchEuchreEngine import BatchEuchreEngine, lowest_cards
+
+
+def lowest(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+def play_mask_engine(seed):
+    """Order up from the first seat and play the lowest legal card, as lowest_cards does."""
+    engine = MaskEngine(seed)
+    engine.start_hand()
+    deal = ([engine.hand_mask(s) for s in range(4)], engine._upcard)
+
+    engine.order_up()
+    engine.pick_up_index(lowest(engine.hand_mask(engine.dealer)))
+    engine.seat = engine.dealer + 1
+
+    while not engine.is_hand_finished():
+        engine.play_index(lowest(engine.playable_mask()))
+        if engine.is_trick_finished():
+            winner = engine.trick_winner()
+            engine.add_trick_taken(team_of(winner))
+            engine.set_order(winner)
+        else:
+            engine.next_player()
+
+    engine.score_hand()
+    return deal, engine
+
+
+def test_batch_matches_mask_engine():
+    seeds = range(50)
+    results = [play_mask_engine(seed) for seed in seeds]
+
+    batch = BatchEuchreEngine(len(seeds))
+    batch.set_deals([deal[0] for deal, _ in results], [deal[1] for deal, _ in results], 0)
+
+    discard = [lowest(int(h)) for h in batch.hands[:, 0]]
+    batch.order_up(maker=1, discard=discard)
+    batch.play(lowest_cards)
+
+    assert batch.done.all()
+    for row, (_, engine) in enumerate(results):
+        assert list(batch.tricks_taken[row]) == engine._tricks_taken
+        assert list(batch.points[row]) == engine._points
+
+
+def test_deal_is_a_partition_of_the_deck():
+    batch = BatchEuchreEngine(100, seed=1)
+    batch.deal()
+
+    for row in range(100):
+        hands = [int(h) for h in batch.hands[row]]
+        assert all(bin(h).count("1") == 5 for h in hands)
+        dealt = hands[0] | hands[1] | hands[2] | hands[3] | (1 << int(batch.upcard[row]))
+        assert bin(dealt).count("1") == 21
+
+
+def test_random_play_finishes_every_hand():
+    batch = BatchEuchreEngine(200, seed=2)
+    batch.deal()
+    batch.order_up(maker=1, discard=[lowest(int(h)) for h in batch.hands[:, 0]], alone=np.where(np.arange(200) % 2, 1, -1))
+    batch.play(lambda engine, legal: engine.random_cards(legal))
+
+    assert batch.done.all()
+    assert (batch.tricks_taken.sum(axis=1) == 5).all()
+    assert set(batch.points.sum(axis=1).tolist()) <= {1, 2, 4}
+
+
+def test_illegal_card_raises():
+    batch = BatchEuchreEngine(1, seed=3)
+    batch.deal()
+    batch.order_up(maker=1, discard=[lowest(int(batch.hands[0, 0]))])
+    other = int(batch.hands[0, 2])
+
+    with pytest.raises(EuchreError):
+        batch.step([lowest(other)])
+
+
+def test_make_rejects_downcard_suit():
+    batch = BatchEuchreEngine(1, seed=4)
+    batch.deal()
+
+    with pytest.raises(EuchreError):
+        batch.make(trump=batch.upcard // 6, maker=1)
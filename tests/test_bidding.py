@@ -0,0 +1,83 @@
+"""
+tests/test_bidding.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreEngine, EuchreError, Game
+from euchre_core.bidding import BidEvaluator
+from euchre_core.bots import bidding_bot
+from euchre_core.tournament import play_game
+
+NAMES = ["a", "b", "c", "d"]
+
+
+@pytest.fixture
+def evaluator():
+    return BidEvaluator(samples=40)
+
+
+def test_strong_hand_beats_weak_hand(evaluator):
+    make, alone = evaluator.evaluate(["J♥", "J♦", "A♥", "K♥", "Q♥"], "9♥", dealer=0, seat=1)
+    assert make > 1 and alone > make
+
+    make, alone = evaluator.evaluate(["9♣", "10♣", "9♦", "10♠", "Q♠"], "9♥", dealer=0, seat=1)
+    assert make < 0 and alone < 0
+
+
+def test_suit_relabeled_hands_share_a_cache_entry(evaluator):
+    first = evaluator.evaluate(["J♠", "J♣", "A♠", "9♦", "K♥"], "10♠", dealer=2, seat=3)
+    # ♠ <-> ♥, ♣ <-> ♦ keeps the color pairs
+    second = evaluator.evaluate(["J♥", "J♦", "A♥", "9♣", "K♠"], "10♥", dealer=3, seat=0)
+    assert first == second
+    info = evaluator.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_estimates_do_not_depend_on_cache_state():
+    hand = (["Q♦", "K♦", "A♣", "9♠", "J♥"], "A♦", 1, 1, "♠")
+    first = BidEvaluator(samples=30, seed=5).evaluate(*hand)
+
+    warm = BidEvaluator(samples=30, seed=5)
+    warm.evaluate(["9♣", "10♣", "9♦", "10♠", "Q♠"], "9♥", 0, 1)
+    assert warm.evaluate(*hand) == first
+
+
+def test_cache_is_bounded():
+    evaluator = BidEvaluator(samples=2, cache_size=3)
+    for seed in range(10):
+        engine = EuchreEngine(seed)
+        engine.start_hand()
+        evaluator.evaluate(engine.get_hand(1), engine.upcard, 0, 1)
+    assert evaluator.cache_info().currsize <= 3
+
+
+def test_downcard_suit_is_rejected(evaluator):
+    with pytest.raises(EuchreError):
+        evaluator.evaluate(["9♣", "10♣", "9♦", "10♠", "Q♠"], "9♥", 0, 1, "♥")
+
+
+def test_evaluate_game_covers_the_bidding_actions(evaluator):
+    game = Game(EuchreEngine(4), NAMES)
+    game.input("start")
+    values = evaluator.evaluate_game(game)
+    assert set(values) == set(game.legal_actions())
+
+    for _ in range(4): game.input("pass")
+    values = evaluator.evaluate_game(game)
+    assert set(values) == set(game.legal_actions())
+    assert values[("pass", None)] == 0.0
+
+    for _ in range(3): game.input("pass")
+    assert game.state == 4
+    values = evaluator.evaluate_game(game)
+    assert set(values) == set(game.legal_actions())
+
+    game.input(*evaluator.best_action(game))
+    with pytest.raises(EuchreError):
+        evaluator.evaluate_game(game)
+
+
+def test_bidding_bot_plays_games():
+    result = play_game([bidding_bot, bidding_bot], 3)
+    assert max(result.points) >= 10
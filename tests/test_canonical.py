@@ -0,0 +1,90 @@
+"""
+tests/test_canonical.py
+"""
+
+import random
+import pytest
+from euchre_core import canonical as C
+from euchre_core import deals
+from euchre_core.masks import NO_TRUMP, CARD_INDEX, to_mask, count
+from euchre_core.rules import OPPOSITE
+from euchre_core.Deck import SUITS
+from euchre_core.solver import DoubleDummy
+
+
+def test_permutations_keep_color_pairs():
+    assert len(C.SUIT_PERMUTATIONS) == 8
+    assert C.SUIT_PERMUTATIONS[0] == C.IDENTITY
+    for perm in C.SUIT_PERMUTATIONS:
+        for s, suit in enumerate(SUITS):
+            assert SUITS[perm[SUITS.index(OPPOSITE[suit])]] == OPPOSITE[SUITS[perm[s]]]
+        assert C.invert(C.invert(perm)) == perm
+        assert tuple(C.invert(perm)[perm[s]] for s in range(4)) == C.IDENTITY
+
+
+def test_permute_mask_moves_whole_suits():
+    hand = to_mask(["J♣", "A♦", "9♠"])
+    perm = (3, 2, 1, 0)
+    assert C.permute_mask(hand, perm) == to_mask(["J♠", "A♥", "9♣"])
+    assert C.permute_card(CARD_INDEX["J♣"], perm) == CARD_INDEX["J♠"]
+    assert C.permute_suit(NO_TRUMP, perm) == NO_TRUMP
+
+
+def random_deal(rng):
+    return deals.masks_at(rng.randrange(deals.NUM_DEALS))
+
+
+def test_equivalent_hands_share_a_canonical_form():
+    rng = random.Random(0)
+    for _ in range(200):
+        (hand, _, _, _), upcard = random_deal(rng)
+        form, perm = C.canonical_hand(hand, upcard)
+        assert form == (C.permute_mask(hand, perm), C.permute_card(upcard, perm), NO_TRUMP)
+        for other in C.SUIT_PERMUTATIONS:
+            image = C.canonical_hand(C.permute_mask(hand, other), C.permute_card(upcard, other))
+            assert image[0] == form
+
+
+def test_canonical_upcard_is_a_club():
+    rng = random.Random(1)
+    for _ in range(50):
+        (hand, _, _, _), upcard = random_deal(rng)
+        (_, up, _), _ = C.canonical_hand(hand, upcard)
+        assert up // 6 == 0
+
+
+def test_canonical_forms_shrink_the_key_space():
+    rng = random.Random(2)
+    keys, forms = set(), set()
+    for _ in range(3000):
+        hand = to_mask(rng.sample(list(CARD_INDEX), 5))
+        keys.add(hand)
+        forms.add(C.canonical_hand(hand, 0, 0)[0])
+    assert len(forms) < len(keys)
+
+
+def test_canonical_deal_matches_canonical_hand_for_one_hand():
+    rng = random.Random(3)
+    hands, upcard = random_deal(rng)
+    (form_hands, up, trump), perm = C.canonical_deal(hands, upcard, 2)
+    assert trump == 0
+    assert form_hands == tuple(C.permute_mask(h, perm) for h in hands)
+    assert sum(count(h) for h in form_hands) == 20
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solver_value_is_invariant(seed):
+    rng = random.Random(seed)
+    hands, _ = random_deal(rng)
+    trump = rng.randrange(4)
+    value, _ = DoubleDummy(trump).solve(list(hands), 1)
+
+    (form_hands, _, form_trump), _ = C.canonical_deal(hands, 0, trump)
+    assert DoubleDummy(form_trump).solve(list(form_hands), 1)[0] == value
+
+
+def test_canonical_cards():
+    (hand, up, trump), perm = C.canonical_cards(["J♥", "J♦", "A♥", "K♥", "9♠"], "Q♥", "♥")
+    assert trump == "♣" and up == "Q♣"
+    assert sorted(hand) == sorted(["J♣", "J♠", "A♣", "K♣", "9♦"])
+    assert perm == (2, 3, 0, 1)
@@ -56,3 +56,12 @@ def test_observation_sorted_and_has_24_lines():
     last_val = int(obs[-1].split(": ")[1])
     assert first_val == 0
     assert last_val == 19
+
+def test_of_returns_shared_precompiled_table():
+    t = CardTable.of("♥", "♣")
+    assert t is CardTable.of("♥", "♣")
+    assert t.dictionary == CardTable("♥", "♣").dictionary
+    assert CardTable.of(None, None).dictionary["A♠"] == 5
+
+def test_unknown_lead_ranks_like_no_lead():
+    assert CardTable("♥", "x").dictionary == CardTable("♥", None).dictionary
@@ -91,3 +91,11 @@ def test_effective_suit_only_left_bower_changes(trump):
     right = f"J{trump}"
     assert effective_suit(left, trump) == trump
     assert effective_suit(right, trump) == trump  # unchanged, already trump
+
+
+def test_unknown_cards_and_suits_fall_back_to_the_rule():
+    assert effective_suit("J♣", "x") == "♣"
+    assert effective_suit("8♠", "♠") == "♠"
+    assert effective_suit("J♥", "♦") == "♦"
+    assert is_left_bower("J♥", "x") is False
+    assert is_left_bower("8♣", "♠") is False
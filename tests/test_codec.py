@@ -0,0 +1,118 @@
+"""
+tests/test_codec.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreEngine, EuchreError, Game
+from euchre_core.bots import random_bot
+from euchre_core import codec
+
+
+def comparable(game):
+    return game.observation()
+
+
+def games_in_progress(seed, limit=400):
+    """Yield a game at every decision point of a random game."""
+    rng = random.Random(seed)
+    game = Game(EuchreEngine(seed), ["a", "b", "c", "d"])
+    game.input("start")
+    for _ in range(limit):
+        if game.state == 8: break
+        yield game
+        if game.state in (6, 7): game.input("continue")
+        else: game.input(*random_bot(game, rng))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_round_trip_at_every_step(seed):
+    for game in games_in_progress(seed):
+        data = codec.dumps(game)
+        assert len(data) == codec.RECORD.size
+
+        loaded = codec.loads(data)
+        assert comparable(loaded) == comparable(game)
+        assert loaded.engine.dealer_action == game.engine.dealer_action
+        assert loaded.hash == game.hash
+        assert codec.dumps(loaded) == data
+
+
+def test_loaded_game_plays_on_identically():
+    rng = random.Random(5)
+    game = Game(EuchreEngine(5), ["a", "b", "c", "d"])
+    game.input("start")
+    game.input("order")
+    game.input("up", game.engine.get_hand(game.engine.dealer)[0])
+    game.input("play", game.engine.playable_cards()[0])
+
+    loaded = codec.loads(codec.dumps(game))
+    while game.state != 7:
+        if game.state == 6:
+            game.input("continue")
+            loaded.input("continue")
+            continue
+        card = rng.choice(sorted(game.engine.playable_cards()))
+        game.input("play", card)
+        loaded.input("play", card)
+        assert loaded.hash == game.hash
+
+    assert loaded.engine.points == game.engine.points
+
+
+def test_loads_into_existing_game_keeps_rng():
+    source = next(games_in_progress(1))
+    target = Game(EuchreEngine(99), ["w", "x", "y", "z"])
+    rng = target.engine._rng
+
+    assert codec.loads(codec.dumps(source), target) is target
+    assert target.engine._rng is rng
+    assert target.state == source.state
+
+
+def test_bulk_round_trip():
+    games = [codec.loads(codec.dumps(g)) for g in games_in_progress(2, limit=60)]
+    data = codec.dumps_many(games)
+    assert len(data) == codec.BULK_HEADER.size + codec.RECORD.size * len(games)
+
+    loaded = codec.loads_many(data)
+    assert [codec.dumps(g) for g in loaded] == [codec.dumps(g) for g in games]
+
+
+def test_rejects_bad_data():
+    data = bytearray(codec.dumps(next(games_in_progress(0))))
+    data[2] = 99
+    with pytest.raises(EuchreError):
+        codec.loads(bytes(data))
+    with pytest.raises(EuchreError):
+        codec.loads_many(bytes(data))
+
+
+def test_loads_into_existing_game_clears_stale_fields():
+    target = None
+    for game in games_in_progress(3):
+        if game.engine.dealer_action is not None and target is None:
+            target = codec.loads(codec.dumps(game))
+            hands, tricks = target.engine._hands, target.engine._tricks
+
+    source = Game(EuchreEngine(4), ["a", "b", "c", "d"])
+    codec.loads(codec.dumps(source), target)
+    assert target.engine.dealer_action is None
+    assert target.last_action is None and target.last_data is None
+    assert target.engine._hands is hands and target.engine._tricks is tricks
+    assert comparable(target) == comparable(source)
+
+
+def test_hands_keep_their_order():
+    for game in games_in_progress(6, limit=40):
+        loaded = codec.loads(codec.dumps(game))
+        assert loaded.engine._hands == game.engine._hands
+        assert loaded.legal_actions() == game.legal_actions()
+
+
+def test_truncated_data_raises_euchre_error():
+    data = codec.dumps(next(games_in_progress(0)))
+    bundle = codec.dumps_many([next(games_in_progress(0))] * 2)
+    for short in (data[:-1], data[:3], b"", bundle[:-1], bundle[:4]):
+        with pytest.raises(EuchreError):
+            codec.loads(short) if short[:2] != b"EB" else codec.loads_many(short)
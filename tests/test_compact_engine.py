@@ -0,0 +1,131 @@
+"""
+tests/test_compact_engine.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreEngine, CompactEuchreEngine, EuchreError, Game, SUITS, card_suit
+from euchre_core.bots import random_bot
+from euchre_core.deals import NUM_DEALS
+from euchre_core.seeds import split_seed
+
+NAMES = ["a", "b", "c", "d"]
+
+
+def choose(game, rng):
+    # sorted so engines holding the same cards in another order choose alike
+    return rng.choice(sorted(game.legal_actions(), key=str))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_hand_matches_euchre_engine(seed):
+    compact = Game(CompactEuchreEngine(seed), NAMES)
+    strings = Game(EuchreEngine(seed), NAMES)
+    compact.input("start")
+    strings.input("start")
+    strings.engine.start_hand(split_seed(seed, 0) % NUM_DEALS)
+
+    rng = random.Random(seed)
+    while compact.state != 7:
+        assert compact.engine.hash == strings.engine.hash
+        assert sorted(compact.legal_actions(), key=str) == sorted(strings.legal_actions(), key=str)
+        if compact.engine.tricks_played < 5:
+            assert compact.engine.current_trick == strings.engine.current_trick
+        for seat in range(4):
+            assert sorted(compact.engine.get_hand(seat)) == sorted(strings.engine.get_hand(seat))
+        action = choose(compact, rng)
+        compact.input(*action)
+        strings.input(*action)
+
+    assert compact.engine.points == strings.engine.points
+    assert compact.engine.hash == strings.engine.hash
+    assert compact.engine.public_observation() == strings.engine.public_observation()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_plays_full_games(seed):
+    game = Game(CompactEuchreEngine(seed), NAMES)
+    rng = random.Random(seed)
+    while game.state != 8:
+        game.input(*random_bot(game, rng))
+    assert max(game.engine.points) >= 10
+
+
+def test_deals_follow_seed():
+    a, b = CompactEuchreEngine(3), CompactEuchreEngine(3)
+    for _ in range(3):
+        a.start_hand()
+        b.start_hand()
+        assert [a.get_hand(s) for s in range(4)] == [b.get_hand(s) for s in range(4)]
+        assert a.upcard == b.upcard
+
+
+def test_reset_matches_new_engine():
+    engine = CompactEuchreEngine(5)
+    game = Game(engine, NAMES)
+    rng = random.Random(5)
+    for _ in range(40): game.input(*random_bot(game, rng))
+
+    engine.reset(9)
+    fresh = CompactEuchreEngine(9)
+    assert engine.hash == fresh.hash
+    engine.start_hand()
+    fresh.start_hand()
+    assert engine.observation() == fresh.observation()
+
+
+def test_conversion_round_trips_mid_hand():
+    game = Game(CompactEuchreEngine(11), NAMES)
+    rng = random.Random(11)
+    while game.state != 5 or game.engine.tricks_played < 2 or not game.engine.current_trick:
+        game.input(*random_bot(game, rng))
+
+    compact = game.engine
+    engine = compact.to_engine()
+    assert engine.hash == compact.hash
+    assert engine.current_trick == compact.current_trick
+    assert engine.trick_winner() == compact.trick_winner()
+    assert CompactEuchreEngine.from_engine(engine).observation() == compact.observation()
+
+
+def test_converts_a_cloned_engine():
+    game = Game(EuchreEngine(6), NAMES)
+    rng = random.Random(6)
+    while game.engine.dealer_action is None or game.state != 5:
+        game.input(*random_bot(game, rng))
+
+    clone = game.engine.clone()
+    assert clone.dealer_action == game.engine.dealer_action
+    compact = CompactEuchreEngine.from_engine(clone)
+    assert compact.dealer_action == game.engine.dealer_action
+    assert compact.hash == game.engine.hash
+    back = compact.to_engine()
+    assert back.hash == clone.hash and back.dealer_action == clone.dealer_action
+
+
+def test_views_are_copies():
+    engine = CompactEuchreEngine(2)
+    engine.start_hand()
+    engine.get_hand(0).clear()
+    engine.player_order.clear()
+    assert len(engine.get_hand(0)) == 5
+    assert engine.player_order == [1, 2, 3, 0]
+
+
+def test_has_no_instance_dict():
+    with pytest.raises(AttributeError):
+        CompactEuchreEngine(0).extra = 1
+
+
+def test_rejects_downcard_suit_and_illegal_play():
+    engine = CompactEuchreEngine(4)
+    engine.start_hand()
+    downcard = engine.upcard
+    engine.turn_down_card()
+    with pytest.raises(EuchreError):
+        engine.trump = card_suit(downcard)
+
+    engine.trump = next(suit for suit in SUITS if suit != card_suit(downcard))
+    other = engine.get_hand(engine.seat + 1)[0]
+    with pytest.raises(EuchreError):
+        engine.play_card(other)
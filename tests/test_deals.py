@@ -0,0 +1,112 @@
+"""
+tests/test_deals.py
+"""
+
+import math
+import random
+import pytest
+from euchre_core import EuchreEngine, EuchreError, Game, MaskEngine
+from euchre_core import deals
+from euchre_core.Deck import Deck
+from euchre_core.bots import random_bot
+from euchre_core.masks import FULL_MASK, to_mask
+
+
+def test_num_deals_counts_every_deal():
+    expected = math.comb(24, 5) * math.comb(19, 5) * math.comb(14, 5) * math.comb(9, 5) * 4
+    assert deals.NUM_DEALS == expected
+    assert deals.NUM_DEALS < 2 ** 64
+
+
+@pytest.mark.parametrize("index", [0, 1, 2, 3, 4, 12345, deals.NUM_DEALS // 2, deals.NUM_DEALS - 1])
+def test_round_trip_at_edges(index):
+    hands, upcard = deals.masks_at(index)
+    assert hands[0] | hands[1] | hands[2] | hands[3] | (1 << upcard) <= FULL_MASK
+    assert all(bin(hand).count("1") == 5 for hand in hands)
+    assert deals.index_masks(hands, upcard) == index
+
+
+def test_round_trip_random_indices():
+    rng = random.Random(0)
+    for index in deals.sample_indices(rng, 2000):
+        assert deals.index_masks(*deals.masks_at(index)) == index
+
+
+def test_shuffled_deck_deals_round_trip():
+    rng = random.Random(1)
+    for _ in range(500):
+        deck = Deck()
+        deck.shuffle(rng)
+        hands, up = deck.deal()
+        index = deals.deal_index(hands, up)
+        got_hands, got_up = deals.deal_at(index)
+        assert got_up == up
+        assert [sorted(h) for h in got_hands] == [sorted(h) for h in hands]
+
+
+def test_consecutive_indices_are_distinct_deals():
+    seen = {deals.masks_at(index) for index in range(2000)}
+    assert len(seen) == 2000
+
+
+def test_bad_deals_are_rejected():
+    hands, upcard = deals.masks_at(7)
+    with pytest.raises(EuchreError):
+        deals.index_masks((hands[0], hands[0], hands[2], hands[3]), upcard)
+    with pytest.raises(EuchreError):
+        deals.index_masks(hands, (hands[0] & -hands[0]).bit_length() - 1)
+    with pytest.raises(EuchreError):
+        deals.masks_at(deals.NUM_DEALS)
+
+
+def test_shards_cover_the_range():
+    ranges = [deals.shard_range(7, shard, 1000) for shard in range(7)]
+    assert ranges[0].start == 0 and ranges[-1].stop == 1000
+    for a, b in zip(ranges, ranges[1:]): assert a.stop == b.start
+    assert sum(len(deals.shard_range(3, s)) for s in range(3)) == deals.NUM_DEALS
+
+
+def test_engines_deal_by_index():
+    index = 98765432109
+    hands, upcard = deals.deal_at(index)
+
+    engine = EuchreEngine()
+    engine.start_hand(index)
+    assert engine._hands == hands and engine.upcard == upcard
+    assert engine.deal_index == index
+
+    mask_engine = MaskEngine()
+    mask_engine.start_hand(index)
+    assert list(mask_engine._hands) == [to_mask(hand) for hand in hands]
+
+
+def test_deal_index_needs_a_deal():
+    with pytest.raises(EuchreError, match="no deal"):
+        EuchreEngine(1).deal_index
+
+
+def test_deal_index_of_a_hand_in_play():
+    rng = random.Random(2)
+    game = Game(EuchreEngine(2), list("abcd"))
+    game.input("start")
+    index = game.engine.deal_index
+    while game.state in (1, 2, 3, 4, 5):
+        game.input(*random_bot(game, rng))
+        if game.state in (1, 2, 3, 4, 5, 6): assert game.engine.deal_index == index
+
+
+def test_deal_index_after_the_dealer_plays_the_upcard():
+    engine = EuchreEngine(0)
+    engine.start_hand()
+    index = engine.deal_index
+    upcard = engine.upcard
+
+    engine.order_up()
+    engine.pick_up(engine.get_hand(engine.dealer)[0])
+    engine.set_order(engine.dealer) # the dealer leads the card picked up
+    engine.play_card(upcard)
+    assert engine.deal_index == index
+
+    engine.next_player()
+    engine.play_card(engine.playable_cards()[0])
+    assert engine.deal_index == index
@@ -3,7 +3,10 @@ tests/test_euchre_engine.py
 """
 
 import pytest
-from euchre_core import EuchreEngine, EuchreError, card_suit, team_of, partner_of
+import random
+from euchre_core import EuchreEngine, EuchreError, Game, card_suit, team_of, partner_of
+from euchre_core import bots, deals
+from euchre_core.seeds import split_seed
 
 
 @pytest.fixture
@@ -481,3 +484,305 @@ def test_trick_winner_regular_follow_suit(engine):
     ]
 
     assert engine.trick_winner() == 3
+
+
+@pytest.mark.go_alone
+def test_partner_of_lone_player_is_skipped(engine):
+    engine.start_hand()
+    seat = engine.seat
+    engine.go_alone()
+
+    engine.next_player()
+    assert engine.seat == (seat + 1) % 4
+    engine.next_player()
+    assert engine.seat == (seat + 3) % 4  # partner skipped
+
+    engine.set_order(partner_of(seat))
+    assert partner_of(seat) not in engine.player_order
+    assert engine.seat == (seat + 3) % 4
+    assert len(engine.player_order) == 3
+
+
+def state_of(engine):
+    return (
+        [list(h) for h in engine._hands],
+        [list(t) for t in engine._tricks],
+        list(engine.player_order),
+        engine.seat,
+        list(engine._tricks_taken),
+        engine.card_table,
+    )
+
+
+@pytest.mark.apply
+def test_apply_undo_restores_every_state(engine):
+    engine.start_hand()
+    engine.order_up()
+    engine.pick_up(engine.get_hand(engine.dealer)[0])
+    engine.set_order(engine.dealer + 1)
+
+    records, states = [], []
+    while not engine.is_hand_finished():
+        states.append(state_of(engine))
+        records.append(engine.apply(engine.playable_cards()[-1]))
+
+    assert sum(engine._tricks_taken) == 5
+
+    while records:
+        engine.undo(records.pop())
+        assert state_of(engine) == states.pop()
+
+
+@pytest.mark.apply
+def test_apply_scores_trick_and_winner_leads(stochastic_engine):
+    engine = stochastic_engine
+    engine._trump = "♥"
+    engine.set_order(0)
+
+    for card in ["Q♣", "K♣", "10♥"]:
+        engine.apply(card)
+    record = engine.apply("10♣")
+
+    assert record[-1] == 2
+    assert engine._tricks_taken == [1, 0]
+    assert engine.seat == 2
+    assert engine.player_order == [2, 3, 0, 1]
+
+    engine.undo(record)
+    assert engine._tricks_taken == [0, 0]
+    assert engine.seat == 3
+    assert engine.current_trick == [(0, "Q♣"), (1, "K♣"), (2, "10♥")]
+
+
+@pytest.mark.apply
+def test_apply_illegal_card_leaves_state(stochastic_engine):
+    engine = stochastic_engine
+    engine._trump = "♥"
+    engine.set_order(0)
+    engine.apply("Q♣")
+    before = state_of(engine)
+
+    with pytest.raises(EuchreError):
+        engine.apply("Q♥")  # seat 1 holds K♣, must follow
+
+    assert state_of(engine) == before
+
+
+def test_playable_cards_is_a_tuple_apart_from_the_hand(stochastic_engine):
+    engine = stochastic_engine
+    engine._trump = "♠"
+    engine.set_order(0)
+    playable = engine.playable_cards()
+    assert playable == tuple(engine.get_hand(0))
+
+    engine.apply(playable[0])
+    assert playable == ("9♣", "J♦", "A♠", "Q♣", "K♥")
+
+
+@pytest.mark.apply
+def test_apply_undo_search_counts_every_line(stochastic_engine):
+    engine = stochastic_engine
+    engine._trump = "♠"
+    engine.set_order(1)
+    before = state_of(engine)
+
+    def count(depth):
+        if depth == 0: return 1
+        total = 0
+        for card in engine.playable_cards():
+            record = engine.apply(card)
+            total += count(depth - 1)
+            engine.undo(record)
+        return total
+
+    assert count(4) > 1
+    assert state_of(engine) == before
+
+
+@pytest.mark.snapshot
+def test_snapshot_restore_round_trip(engine):
+    engine.start_hand()
+    engine.order_up()
+    engine.pick_up(engine.get_hand(engine.dealer)[0])
+    engine.set_order(engine.dealer + 1)
+    engine.apply(engine.playable_cards()[0])
+
+    before = engine.observation()
+    before = {k: repr(v) for k, v in before.items()}
+    snap = engine.snapshot()
+
+    while not engine.is_hand_finished():
+        engine.apply(engine.playable_cards()[0])
+    engine.score_hand()
+
+    engine.restore(snap)
+    assert {k: repr(v) for k, v in engine.observation().items()} == before
+    assert engine.snapshot() == snap
+
+
+@pytest.mark.snapshot
+def test_clone_is_independent(engine):
+    engine.start_hand()
+    engine.order_up()
+    engine.set_order(engine.dealer + 1)
+
+    other = engine.clone()
+    other.apply(other.playable_cards()[0])
+
+    assert engine.tricks_played == 0
+    assert engine.current_trick == []
+    assert len(engine.get_hand(engine.seat)) == 5
+    assert other.card_table is not None
+    assert other._rng is engine._rng
+    assert other.seed == engine.seed
+
+
+@pytest.mark.snapshot
+def test_clone_keeps_seed():
+    assert EuchreEngine(7).clone().seed == 7
+    assert EuchreEngine().clone(copy_rng=True).seed is None
+
+
+@pytest.mark.snapshot
+def test_clone_copies_rng_when_asked(engine):
+    other = engine.clone(copy_rng=True)
+    assert other._rng is not engine._rng
+
+    engine.start_hand()
+    other.start_hand()
+    assert other.get_hand(0) == engine.get_hand(0)
+
+
+def incremental_matches_rehash(engine):
+    incremental = engine.hash, [engine.seat_hash(s) for s in range(4)]
+    engine.rehash()
+    return incremental == (engine.hash, [engine.seat_hash(s) for s in range(4)])
+
+
+@pytest.mark.hash
+@pytest.mark.parametrize("seed", range(8))
+def test_hash_is_maintained_through_games(seed):
+    rng = random.Random(seed)
+    engine = EuchreEngine(seed)
+    game = Game(engine, ["a", "b", "c", "d"])
+    game.input("start")
+
+    seen = set()
+    while game.state != 8:
+        if game.state in (6, 7): game.input("continue")
+        else: game.input(*bots.random_bot(game, rng))
+        assert incremental_matches_rehash(engine)
+        seen.add(game.hash)
+
+    assert len(seen) > 20
+
+
+@pytest.mark.hash
+def test_hash_restored_by_undo_and_snapshot(engine):
+    engine.start_hand()
+    engine.order_up()
+    engine.pick_up(engine.get_hand(engine.dealer)[0])
+    engine.set_order(engine.dealer + 1)
+    start = engine.hash
+    snap = engine.snapshot()
+
+    records = []
+    while not engine.is_hand_finished():
+        records.append(engine.apply(engine.playable_cards()[0]))
+        assert engine.hash != start
+
+    while records:
+        engine.undo(records.pop())
+    assert engine.hash == start
+    assert incremental_matches_rehash(engine)
+
+    engine.apply(engine.playable_cards()[0])
+    engine.restore(snap)
+    assert engine.hash == start
+
+
+@pytest.mark.hash
+def test_seat_hash_ignores_other_hands(engine):
+    engine.start_hand()
+    engine.order_up()
+    engine.set_order(engine.dealer + 1)
+    leader = engine.seat
+
+    # two positions that differ only in the leader's hidden cards
+    a = engine.clone()
+    b = engine.clone()
+    b._hands[leader][0], b._hands[(leader + 1) % 4][0] = b._hands[(leader + 1) % 4][0], b._hands[leader][0]
+    b.rehash()
+
+    assert a.hash != b.hash
+    assert a.seat_hash(leader + 2) == b.seat_hash(leader + 2)
+    assert a.seat_hash(leader) != b.seat_hash(leader)
+
+
+def game_path(policies, seed, hands=None):
+    """Drive a validated Game as tournament._play does, optionally for a number of hands."""
+    game = Game(EuchreEngine(seed), ["a", "b", "c", "d"])
+    if len(policies) == 2: policies = policies * 2
+    rng = random.Random(split_seed(seed, 0))
+    played = 0
+
+    game.input("start")
+    while game.state != 8:
+        if game.state == 7:
+            played += 1
+            if played == hands: break
+        if game.state in (6, 7): game.input("continue")
+        else: game.input(*policies[game.engine.seat](game, rng))
+    return game.engine, played
+
+
+@pytest.mark.play_out
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("policies", [
+    (bots.random_bot, bots.passive_bot),
+    (bots.random_bot,) * 4,
+    (bots.passive_bot, bots.random_bot, bots.random_bot, bots.passive_bot),
+])
+def test_play_out_matches_game(seed, policies):
+    validated, hands = game_path(policies, seed)
+    engine = EuchreEngine(seed)
+
+    assert engine.play_out(policies, random.Random(split_seed(seed, 0))) == hands
+    assert engine.is_game_over()
+    assert engine.points == validated.points
+    assert engine.hash == validated.hash
+    assert engine.observation() == validated.observation()
+
+
+@pytest.mark.play_out
+@pytest.mark.parametrize("seed", range(10))
+def test_play_out_hand_by_hand(seed):
+    policies = (bots.random_bot, bots.passive_bot)
+    validated, _ = game_path(policies, seed, hands=3)
+    engine = EuchreEngine(seed)
+    rng = random.Random(split_seed(seed, 0))
+
+    for _ in range(3):
+        assert engine.play_out(policies, rng, hand_only=True) == 1
+        assert engine.is_hand_finished()
+    assert engine.dealer == validated.dealer
+    assert engine.hash == validated.hash
+
+
+@pytest.mark.play_out
+def test_place_card_skips_the_playable_check():
+    hands = [["J♦", "A♦", "9♥", "10♥", "J♥"],
+             ["9♣", "9♦", "10♦", "Q♦", "K♦"],
+             ["10♣", "10♠", "Q♠", "K♠", "A♠"],
+             ["J♣", "Q♣", "K♣", "A♣", "J♠"]]
+    engine = EuchreEngine(1)
+    engine.start_hand(deals.deal_index(hands, "Q♥"))
+    engine.order_up()
+    engine.set_order(engine.dealer + 1)
+    engine.apply("9♣")
+
+    # seat 2 holds a club, so the ten of spades is a revoke
+    with pytest.raises(EuchreError):
+        engine.play_card("10♠")
+    engine._place_card("10♠")
+    assert engine.current_trick[-1] == (2, "10♠")
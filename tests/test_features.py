@@ -0,0 +1,125 @@
+"""
+tests/test_features.py
+"""
+
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from euchre_core import EuchreEngine, CompactEuchreEngine, MaskEngine, EuchreError, Game
+from euchre_core import features as F
+from euchre_core.bots import random_bot
+from euchre_core.masks import CARD_INDEX, SUIT_INDEX
+
+NAMES = ["a", "b", "c", "d"]
+
+
+def positions(seed):
+    rng = random.Random(seed)
+    game = Game(EuchreEngine(seed), NAMES)
+    while game.state != 8:
+        yield game
+        game.input(*random_bot(game, rng))
+
+
+def cards_in(vector, offset):
+    return {i for i in range(24) if vector[offset + i]}
+
+
+def test_layout_is_contiguous():
+    assert F.NUM_FEATURES == F.SCORE + 4
+    assert F.PLAYED - F.HAND == 24 and F.TRICK - F.PLAYED == 96
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_encode_matches_seat_view(seed):
+    for game in positions(seed):
+        seat = game.engine.seat
+        vector = F.encode(game)
+        view = game.observation_for(seat)
+
+        assert cards_in(vector, F.HAND) == {CARD_INDEX[c] for c in view["hand"]}
+        assert vector[F.STATE + game.state] == 1 and vector[F.STATE:F.STATE + 9].sum() == 1
+        assert vector[F.DEALER + (view["dealer"] - seat) % 4] == 1
+        assert vector[F.TO_ACT] == 1
+
+        trump = 4 if view["trump"] is None else SUIT_INDEX[view["trump"]]
+        assert vector[F.TRUMP + trump] == 1 and vector[F.TRUMP:F.TRUMP + 5].sum() == 1
+
+        played = {CARD_INDEX[card] for trick in view["tricks"] for _, card in trick}
+        got = set()
+        for relative in range(4): got |= cards_in(vector, F.PLAYED + relative * 24)
+        assert got == played
+
+        if view["discard"] is None: assert not cards_in(vector, F.DISCARD)
+
+
+def test_seats_are_relative():
+    for game in positions(1):
+        if game.engine.maker is not None and game.state == 5: break
+    maker = game.engine.maker
+    for seat in range(4):
+        vector = F.encode(game, seat)
+        assert vector[F.MAKER + (maker - seat) % 4] == 1
+
+
+def test_trick_block_holds_current_trick_by_relative_seat():
+    for game in positions(2):
+        if game.state == 5 and len(game.engine.current_trick) == 2: break
+    vector = F.encode(game, 0)
+    for player, card in game.engine.current_trick:
+        assert vector[F.TRICK + player * 24 + CARD_INDEX[card]] == 1
+    assert vector[F.TRICK:F.UPCARD].sum() == 2
+
+
+def test_score_features():
+    game = Game(EuchreEngine(3), NAMES)
+    game.engine._points = [7, 2]
+    game.engine._tricks_taken = [1, 3]
+    assert list(F.encode(game, 1)[F.SCORE:]) == pytest.approx([0.2, 0.7, 0.6, 0.2])
+
+
+def test_batch_fills_preallocated_rows():
+    games = list(positions(4))[::7]
+    out = np.full((len(games) + 2, F.NUM_FEATURES), 9, dtype=np.float32)
+    result = F.encode_batch(games, out=out)
+
+    assert result is out
+    for row, game in enumerate(games):
+        assert np.array_equal(out[row], F.encode(game))
+    assert (out[len(games):] == 9).all()
+
+
+def test_batch_with_engines_and_fixed_seat():
+    engines = []
+    for seed in range(5):
+        engine = EuchreEngine(seed)
+        engine.start_hand()
+        engines.append(engine)
+    out = F.encode_batch(engines, 2)
+    for row, engine in enumerate(engines):
+        assert cards_in(out[row], F.HAND) == {CARD_INDEX[c] for c in engine.get_hand(2)}
+        assert out[row, F.STATE:F.STATE + 9].sum() == 0
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_every_engine_encodes_the_same(seed):
+    # MaskEngine deals like EuchreEngine, CompactEuchreEngine is copied from it
+    games = [Game(cls(seed), NAMES) for cls in (EuchreEngine, MaskEngine)]
+    rng = random.Random(seed)
+    for game in games: game.input("start")
+
+    while games[0].state != 8:
+        action = rng.choice(sorted(games[0].legal_actions(), key=str))
+        for game in games: game.input(*action)
+        compact = CompactEuchreEngine.from_engine(games[0].engine)
+        for seat in range(4):
+            expected = F.encode(games[0], seat)
+            assert np.array_equal(F.encode(games[1], seat), expected)
+            assert np.array_equal(F.encode(compact, seat), F.encode(games[0].engine, seat))
+
+
+def test_bad_output_shape():
+    with pytest.raises(EuchreError):
+        F.encode_batch([Game(EuchreEngine(), NAMES)], out=np.zeros((1, 10), dtype=np.float32))
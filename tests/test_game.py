@@ -0,0 +1,334 @@
+"""
+tests/test_game.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreEngine, CompactEuchreEngine, EuchreError, Game
+from euchre_core.bots import random_bot
+from euchre_core.Deck import Deck, SUITS
+from euchre_core import actions, codec
+from FakeEngine import FakeEngine
+
+ALL_CARDS = Deck().cards
+NAMES = ["a", "b", "c", "d"]
+
+
+def positions(seed):
+    """A game at every decision point of a random game."""
+    rng = random.Random(seed)
+    game = Game(EuchreEngine(seed), NAMES)
+    while game.state != 8:
+        yield game
+        game.input(*random_bot(game, rng))
+
+
+def copy_of(game):
+    return codec.loads(codec.dumps(game), Game(EuchreEngine(), NAMES))
+
+
+def test_fsm_transitions_with_fake_engine():
+    engine = FakeEngine()
+    game = Game(engine, NAMES)
+
+    game.input("start")
+    assert game.state == 1
+    assert engine.calls == [("start_hand",)]
+
+    game.input("order")
+    assert game.state == 2
+    game.input("up", "9♣")
+    assert ("pick_up", "9♣") in engine.calls
+    assert game.state == 5
+
+    engine._is_trick_finished = True
+    engine._trick_winner = 3
+    game.input("play", "A♠")
+    assert game.state == 6
+    assert ("add_trick_taken", 1) in engine.calls
+    assert ("set_order", 3) in engine.calls
+
+    engine._is_hand_finished = True
+    game.input("continue")
+    assert game.state == 7
+    assert ("score_hand",) in engine.calls
+
+    engine._is_game_over = True
+    game.input("continue")
+    assert game.state == 8
+
+
+def test_unhandled_action_raises():
+    game = Game(FakeEngine(), NAMES)
+    with pytest.raises(EuchreError):
+        game.input("play", "9♣")
+    assert game.state == 0
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_every_legal_action_is_accepted(seed):
+    seen = set()
+    for game in positions(seed):
+        legal = game.legal_actions()
+        assert legal
+        seen.add(game.state)
+        for action, data in legal:
+            copy_of(game).input(action, data)
+    assert {0, 1, 2, 5, 6, 7} <= seen
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_cards_and_suits_outside_the_legal_set_are_rejected(seed):
+    for game in positions(seed):
+        legal = set(game.legal_actions())
+        if game.state == 5:
+            for card in ALL_CARDS:
+                if ("play", card) in legal: continue
+                with pytest.raises(EuchreError):
+                    copy_of(game).input("play", card)
+        elif game.state in (3, 4):
+            for suit in SUITS:
+                if ("make", suit) in legal: continue
+                with pytest.raises(EuchreError):
+                    copy_of(game).input("make", suit)
+
+
+def test_bad_data_leaves_the_game_unchanged():
+    game = Game(EuchreEngine(7), NAMES)
+    game.input("start")
+    game.input("order")
+    engine = game.engine
+    before = (codec.dumps(game), game.version)
+
+    for data in ("nope", None, engine.get_hand(engine.dealer + 1)[0]):
+        with pytest.raises(EuchreError):
+            game.input("up", data)
+    assert engine.dealer_action is None
+    assert (codec.dumps(game), game.version) == before
+
+    game = Game(EuchreEngine(7), NAMES)
+    game.input("start")
+    for _ in range(4): game.input("pass")
+    before = (codec.dumps(game), game.version)
+    for action in ("make", "alone"):
+        for data in ("x", "9♣", None):
+            with pytest.raises(EuchreError):
+                game.input(action, data)
+    assert game.engine.trump is None and game.last_action == "pass"
+    assert (codec.dumps(game), game.version) == before
+
+
+def test_legal_actions_cached_until_input():
+    game = Game(EuchreEngine(1), NAMES)
+    first = game.legal_actions()
+    assert first is game.legal_actions()
+    assert first == (("start", None),)
+
+    game.input("start")
+    assert game.legal_actions() == (("pass", None), ("order", None), ("alone", None))
+
+
+def test_bidding_round_two_excludes_downcard_suit():
+    game = Game(EuchreEngine(2), NAMES)
+    game.input("start")
+    for _ in range(4): game.input("pass")
+
+    assert game.state == 3
+    down = game.engine.downcard[-1]
+    suits = {data for action, data in game.legal_actions() if action == "make"}
+    assert suits == set(SUITS) - {down}
+
+    for _ in range(3): game.input("pass")
+    assert game.state == 4
+    assert ("pass", None) not in game.legal_actions()
+
+
+def test_state_is_an_int_code():
+    game = Game(EuchreEngine(3), NAMES)
+    assert game.state == 0 and type(game.state) is int
+    game.input("start")
+    assert game.state == 1
+
+
+def test_actions_are_case_insensitive():
+    game = Game(EuchreEngine(3), NAMES)
+    game.input("START")
+    game.input("Pass")
+    assert game.state == 1
+    assert game.last_action == "pass"
+
+
+def test_input_code_matches_input():
+    rng = random.Random(4)
+    by_name = Game(EuchreEngine(4), NAMES)
+    by_code = Game(EuchreEngine(4), NAMES)
+    while by_name.state != 8:
+        action, data = random_bot(by_name, rng)
+        by_name.input(action, data)
+        by_code.input_code(actions.ACTION_CODES[action], data)
+        assert by_code.state == by_name.state
+        assert by_code.hash == by_name.hash
+        assert (by_code.last_action, by_code.last_data) == (by_name.last_action, by_name.last_data)
+
+
+def test_input_code_rejects_action_not_allowed():
+    game = Game(EuchreEngine(5), NAMES)
+    with pytest.raises(EuchreError, match="play"):
+        game.input_code(actions.PLAY, "9♣")
+    assert game.state == 0
+
+
+def test_action_ids_cover_every_pair():
+    assert actions.NUM_ACTION_IDS == 62
+    for action_id, (action, data) in enumerate(actions.ID_ACTIONS):
+        assert actions.encode_id(action, data) == action_id
+        assert actions.decode_id(action_id) == (action, data)
+
+    assert actions.encode_id("Continue", "ignored") == actions.encode_id("continue")
+    for bad in [("shuffle", None), ("play", "♣"), ("make", None)]:
+        with pytest.raises(EuchreError):
+            actions.encode_id(*bad)
+    with pytest.raises(EuchreError):
+        actions.decode_id(actions.NUM_ACTION_IDS)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_legal_mask_matches_legal_actions(seed):
+    for game in positions(seed):
+        mask = game.legal_mask()
+        ids = [i for i in range(actions.NUM_ACTION_IDS) if mask >> i & 1]
+        assert [actions.decode_id(i) for i in ids] == sorted(game.legal_actions(), key=actions.ACTION_IDS.__getitem__)
+        assert mask is game.legal_mask()
+
+
+def test_step_matches_input():
+    rng = random.Random(7)
+    by_name = Game(EuchreEngine(7), NAMES)
+    by_id = Game(EuchreEngine(7), NAMES)
+    while by_name.state != 8:
+        mask = by_id.legal_mask()
+        action_id = rng.choice([i for i in range(actions.NUM_ACTION_IDS) if mask >> i & 1])
+        by_id.step(action_id)
+        by_name.input(*actions.decode_id(action_id))
+        assert by_id.state == by_name.state
+        assert by_id.hash == by_name.hash
+        assert (by_id.last_action, by_id.last_data) == (by_name.last_action, by_name.last_data)
+    assert by_id.legal_mask() == 0
+
+
+def test_step_rejects_bad_ids():
+    game = Game(EuchreEngine(8), NAMES)
+    for action_id in (-1, actions.NUM_ACTION_IDS, actions.encode_id("play", "9♣")):
+        with pytest.raises(EuchreError):
+            game.step(action_id)
+    assert game.state == 0
+
+
+def test_game_over_ignores_input():
+    game = Game(FakeEngine(), NAMES)
+    game._state = 8
+    game.input("play", "9♣")
+    game.input_code(actions.START)
+    assert game.state == 8
+
+
+def test_observation_for_hides_other_seats():
+    game = Game(EuchreEngine(6), NAMES)
+    game.input("start")
+    game.input("order")
+    dealer = game.engine.dealer
+    card = game.engine.get_hand(dealer)[0]
+    game.input("up", card)
+
+    for seat in range(4):
+        view = game.observation_for(seat)
+        assert "hands" not in view
+        assert view["hand"] == tuple(game.engine.get_hand(seat))
+        assert view["hand_sizes"] == (5, 5, 5, 5)
+        assert view["discard"] == (card if seat == dealer else None)
+
+
+def test_observation_for_shares_no_engine_state():
+    game = Game(EuchreEngine(7), NAMES)
+    game.input("start")
+    view = game.observation_for(0)
+    for value in view.values():
+        assert not isinstance(value, (list, dict))
+
+    game.engine._hands[0].clear()
+    assert len(view["hand"]) == 5
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_observation_delta_brings_old_views_up_to_date(seed):
+    rng = random.Random(seed)
+    game = Game(EuchreEngine(seed), NAMES)
+    held = {}
+    for game in positions(seed):
+        for seat in range(4):
+            if seat not in held or rng.random() < 0.3:
+                view = held.get(seat)
+                if view is None:
+                    held[seat] = game.observation_for(seat)
+                else:
+                    view.update(game.observation_delta(view["version"], seat))
+                assert held[seat] == game.observation_for(seat)
+
+
+def test_observation_delta_after_a_card_is_small():
+    rng = random.Random(8)
+    for game in positions(8):
+        if game.state == 5 and len(game.engine.current_trick) == 1: break
+
+    version = game.observation_for(0)["version"]
+    game.input(*random_bot(game, rng))
+    delta = game.observation_delta(version, 0)
+    assert set(delta) <= {"seat", "tricks", "hand_sizes", "hand", "last_data", "version"}
+    assert delta["version"] == version + 1
+    assert game.observation_delta(game.version, 0) == {"version": game.version}
+
+
+def full_view(game, seat):
+    return {
+        **game.engine.public_observation(),
+        "state": game.state,
+        "last_action": game.last_action,
+        "last_data": game.last_data,
+        **game.engine.private_observation(seat),
+        "version": game.version,
+    }
+
+
+@pytest.mark.parametrize("engine_type", [EuchreEngine, CompactEuchreEngine])
+@pytest.mark.parametrize("seed", range(3))
+def test_views_kept_by_input_match_a_full_build(engine_type, seed):
+    rng = random.Random(seed)
+    game = Game(engine_type(seed), NAMES)
+    game.observation_for(0)
+    while game.state != 8:
+        game.input(*random_bot(game, rng))
+        assert game._live
+        for seat in range(4):
+            assert game.observation_for(seat) == full_view(game, seat)
+
+
+def test_views_held_across_reset_get_full_deltas():
+    game = next(g for g in positions(12) if g.state == 5)
+    view = game.observation_for(2)
+    version = game.version
+
+    game.reset(13)
+    assert game.version > version
+    view.update(game.observation_delta(view["version"], 2))
+    assert view == full_view(game, 2) == full_view(Game(EuchreEngine(13), NAMES), 2) | {"version": game.version}
+
+
+def test_codec_load_invalidates_views():
+    game = Game(EuchreEngine(9), NAMES)
+    view = game.observation_for(1)
+    other = Game(EuchreEngine(10), NAMES)
+    other.input("start")
+    codec.loads(codec.dumps(other), game)
+
+    view.update(game.observation_delta(view["version"], 1))
+    assert sorted(view["hand"]) == sorted(other.engine.get_hand(1))
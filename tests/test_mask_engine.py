@@ -0,0 +1,142 @@
+"""
+tests/test_mask_engine.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreEngine, MaskEngine, EuchreError, Game, team_of
+from euchre_core.masks import to_mask
+
+
+def play_hand(game, rng):
+    """Drive a Game through one hand with random legal choices."""
+    engine = game._engine
+    game.input("order")
+    game.input("up", rng.choice(sorted(engine.get_hand(engine.dealer))))
+
+    while game.state == 5:
+        game.input("play", rng.choice(sorted(engine.playable_cards())))
+        if game.state == 6:
+            game.input("continue")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_start_hand_deals_like_euchre_engine(seed):
+    strings = EuchreEngine(seed)
+    ints = MaskEngine(seed)
+    for _ in range(3):
+        strings.start_hand()
+        ints.start_hand()
+        for seat in range(4):
+            assert sorted(ints.get_hand(seat)) == sorted(strings.get_hand(seat))
+        assert ints.upcard == strings.upcard
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_game_results_match_euchre_engine(seed):
+    games = []
+    for engine in (EuchreEngine(seed), MaskEngine(seed)):
+        game = Game(engine, ["a", "b", "c", "d"])
+        game.input("start")
+        play_hand(game, random.Random(seed))
+        games.append(game)
+
+    # choices are made from sorted card lists so both paths see the same options
+    a, b = (g.observation() for g in games)
+    assert a["taken"] == b["taken"]
+    assert a["points"] == b["points"]
+    assert a["tricks"] == b["tricks"]
+
+
+def _sorted_hand(view):
+    return {**view, "hand": tuple(sorted(view["hand"]))}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_full_game_through_game_matches_euchre_engine(seed):
+    games = [Game(engine, ["a", "b", "c", "d"]) for engine in (EuchreEngine(seed), MaskEngine(seed))]
+    rng = random.Random(seed)
+    for game in games: game.input("start")
+
+    while games[0].legal_actions():
+        actions = [sorted(game.legal_actions(), key=str) for game in games]
+        assert actions[0] == actions[1]
+        action = rng.choice(actions[0])
+        for game in games: game.input(*action)
+
+        strings, ints = games
+        assert ints.hash == strings.hash
+        for seat in range(4):
+            view = ints.observation_for(seat)
+            assert _sorted_hand(view) == _sorted_hand(strings.observation_for(seat))
+            engine = ints.engine
+            assert view["hand"] == engine.private_observation(seat)["hand"]
+            assert view["hand_sizes"] == engine.public_observation()["hand_sizes"]
+
+    assert games[1].engine.is_game_over()
+    assert games[1].observation()["points"] == games[0].observation()["points"]
+
+
+def test_reset_matches_a_new_engine():
+    engine = MaskEngine(5)
+    engine.start_hand()
+    engine.reset(9)
+    fresh = MaskEngine(9)
+    assert engine.hash == fresh.hash
+    engine.start_hand()
+    fresh.start_hand()
+    assert engine.public_observation() == fresh.public_observation()
+
+
+def test_play_index_rejects_illegal_card():
+    engine = MaskEngine(123)
+    engine.start_hand()
+    other = engine.hand_mask(engine.seat + 1)
+    illegal = other.bit_length() - 1
+
+    with pytest.raises(EuchreError):
+        engine.play_index(illegal)
+
+
+def test_pick_up_rejects_card_not_in_hand():
+    engine = MaskEngine(123)
+    engine.start_hand()
+    missing = engine.get_hand(engine.dealer + 1)[0]
+
+    with pytest.raises(EuchreError):
+        engine.pick_up(missing)
+
+
+def test_trump_cannot_match_downcard_suit():
+    engine = MaskEngine(123)
+    engine.start_hand()
+    engine.turn_down_card()
+
+    with pytest.raises(EuchreError):
+        engine.trump = engine.downcard[-1]
+
+
+def test_trick_winner_and_playable_mask():
+    engine = MaskEngine(123)
+    engine._hands = [to_mask(h) for h in (
+        ["9♣", "J♦", "A♠", "Q♣", "K♥"],
+        ["10♠", "9♦", "K♣", "J♠", "Q♥"],
+        ["A♦", "10♥", "9♠", "K♦", "Q♠"],
+        ["A♥", "J♣", "10♣", "K♠", "Q♦"],
+    )]
+    engine.trump = "♥"
+    engine.set_order(0)
+
+    engine.play_card("Q♣")
+    engine.next_player()
+    assert engine.playable_cards() == ["K♣"]
+    engine.play_card("K♣")
+    engine.next_player()
+    engine.play_card("10♥")   # void in clubs, trumps in
+    engine.next_player()
+    engine.play_card("10♣")
+
+    assert engine.is_trick_finished()
+    assert engine.trick_winner() == 2
+    engine.add_trick_taken(team_of(2))
+    assert engine.tricks_played == 1
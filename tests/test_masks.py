@@ -0,0 +1,69 @@
+# tests/test_masks.py
+import pytest
+from euchre_core import masks
+from euchre_core.masks import NO_TRUMP, card_index, to_mask, from_mask
+from euchre_core.cards import effective_suit
+from euchre_core.CardTable import CardTable
+from euchre_core.Deck import Deck, SUITS
+
+ALL_CARDS = Deck().cards
+
+def test_card_index_follows_deck_order():
+    assert [masks.card_name(i) for i in range(24)] == ALL_CARDS
+    assert card_index("9♣") == 0
+    assert card_index("A♠") == 23
+
+
+def test_mask_round_trip():
+    hand = ["9♣", "J♦", "A♠", "Q♣", "K♥"]
+    mask = to_mask(hand)
+    assert masks.count(mask) == 5
+    assert sorted(from_mask(mask)) == sorted(hand)
+
+
+@pytest.mark.parametrize("trump", SUITS + [None])
+def test_effective_suit_matches_strings(trump):
+    t = masks.suit_index(trump)
+    for card in ALL_CARDS:
+        expected = masks.suit_index(effective_suit(card, trump))
+        assert masks.effective_suit(card_index(card), t) == expected
+
+
+@pytest.mark.parametrize("trump", SUITS)
+@pytest.mark.parametrize("lead", SUITS)
+def test_values_order_like_card_table(trump, lead):
+    table = CardTable(trump, lead)
+    values = masks.VALUES[masks.suit_index(trump)][masks.suit_index(lead)]
+    for a in ALL_CARDS:
+        for b in ALL_CARDS:
+            expected = table.compare(a, b)
+            actual = values[card_index(a)] - values[card_index(b)]
+            assert (expected > 0) == (actual > 0)
+
+
+@pytest.mark.parametrize("hand, lead, trump, expected", [
+    (["9♣", "J♦", "A♠"], "K♣", "♥", ["9♣"]),        # follow printed suit
+    (["9♣", "J♦", "A♠"], "K♥", "♥", ["J♦"]),        # left bower follows trump
+    (["9♣", "J♦", "A♠"], "K♦", "♥", ["9♣", "J♦", "A♠"]),  # void: anything
+    (["9♣", "J♦", "A♠"], None, "♥", ["9♣", "J♦", "A♠"]),  # leading: anything
+])
+def test_playable_mask(hand, lead, trump, expected):
+    lead_card = None if lead is None else card_index(lead)
+    mask = masks.playable_mask(to_mask(hand), lead_card, masks.suit_index(trump))
+    assert mask == to_mask(expected)
+
+
+def test_trick_winner_left_bower_beats_ace_of_trump():
+    trick = [(0, card_index("A♥")), (1, card_index("J♦")), (2, card_index("K♥")), (3, card_index("A♣"))]
+    assert masks.trick_winner(trick, masks.suit_index("♥")) == 1
+
+
+def test_trick_winner_no_trump_played():
+    trick = [(0, card_index("9♣")), (1, card_index("K♣")), (2, card_index("J♦")), (3, card_index("A♣"))]
+    assert masks.trick_winner(trick, masks.suit_index("♠")) == 3
+
+
+def test_pick_up_swaps_cards():
+    hand = to_mask(["9♣", "J♦", "A♠", "Q♣", "K♥"])
+    after = masks.pick_up(hand, card_index("A♣"), card_index("9♣"))
+    assert sorted(from_mask(after)) == sorted(["A♣", "J♦", "A♠", "Q♣", "K♥"])
@@ -0,0 +1,111 @@
+"""
+tests/test_pool.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreEngine, Game
+from euchre_core.Deck import Deck
+from euchre_core.bots import random_bot
+from euchre_core.pool import EnginePool, GamePool
+from euchre_core.tournament import play_game
+from euchre_core import bots
+
+
+def play_out(game, seed):
+    rng = random.Random(seed)
+    while game.state != 8:
+        game.input(*random_bot(game, rng))
+    return game
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_start_hand_deals_like_a_shuffled_deck(seed):
+    engine = EuchreEngine(seed)
+    engine.start_hand()
+
+    deck = Deck()
+    deck.shuffle(random.Random(seed))
+    hands, up = deck.deal()
+    assert engine._hands == hands
+    assert engine.upcard == up
+
+
+def test_start_hand_reuses_hand_and_trick_lists():
+    engine = EuchreEngine(1)
+    hands, tricks = engine._hands, engine._tricks
+    ids = [id(hand) for hand in hands] + [id(trick) for trick in tricks]
+
+    for _ in range(3): engine.start_hand()
+    assert engine._hands is hands and engine._tricks is tricks
+    assert [id(hand) for hand in hands] + [id(trick) for trick in tricks] == ids
+
+
+def test_observation_is_not_changed_by_the_next_hand():
+    engine = EuchreEngine(2)
+    engine.start_hand()
+    observation = engine.observation()
+    held = repr(observation)
+
+    engine.start_hand()
+    assert repr(observation) == held
+    assert observation["hands"] != engine.observation()["hands"]
+
+
+def test_engine_reset_matches_new_engine():
+    engine = EuchreEngine(5)
+    play_out(Game(engine, list("abcd")), 5)
+
+    assert engine.dealer_action is not None
+    engine.reset(9)
+    fresh = EuchreEngine(9)
+    assert engine.snapshot() == fresh.snapshot()
+    assert engine.hash == fresh.hash
+    assert engine.dealer_action is None
+
+    engine.start_hand()
+    fresh.start_hand()
+    assert engine.snapshot() == fresh.snapshot()
+
+
+def test_pooled_game_replays_like_a_new_game():
+    pool = GamePool()
+    game = play_out(pool.acquire(3), 3)
+    version = game.version
+    pool.release(game)
+
+    reused = pool.acquire(4)
+    assert reused is game
+    assert reused.state == 0 and reused.last_action is None and reused.engine.dealer_action is None
+    assert reused.version > version # never reused, so old views still get full deltas
+    view = reused.observation_for(0)
+    view.pop("version")
+    fresh_view = Game(EuchreEngine(4), list("0123")).observation_for(0)
+    fresh_view.pop("version")
+    assert view == fresh_view
+
+    play_out(reused, 4)
+    fresh = play_out(Game(EuchreEngine(4), list("0123")), 4)
+    assert reused.hash == fresh.hash
+    assert reused.engine.points == fresh.engine.points
+
+
+def test_pools_hand_back_released_objects():
+    engines = EnginePool(2)
+    assert len(engines) == 2
+    with engines.engine(1) as engine:
+        assert len(engines) == 1 and engine.seed == 1
+    assert len(engines) == 2
+
+    games = GamePool(1, names=["n", "e", "s", "w"])
+    with games.game(7) as game:
+        assert len(games) == 0
+        assert game.engine.seed == 7
+    assert len(games) == 1 and games.acquire() is game
+
+
+def test_play_game_with_pool_matches_without():
+    pool = GamePool(1)
+    policies = [bots.random_bot, bots.passive_bot]
+    for seed in range(5):
+        assert play_game(policies, seed, seed, pool) == play_game(policies, seed, seed)
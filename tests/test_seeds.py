@@ -0,0 +1,13 @@
+"""
+tests/test_seeds.py
+"""
+
+from euchre_core.seeds import split_seed
+
+
+def test_split_seed_is_deterministic_and_distinct():
+    seeds = [split_seed(7, i) for i in range(1000)]
+    assert seeds == [split_seed(7, i) for i in range(1000)]
+    assert len(set(seeds)) == 1000
+    assert all(0 <= s < 2 ** 64 for s in seeds)
+    assert split_seed(7, 0) != split_seed(8, 0)
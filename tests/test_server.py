@@ -0,0 +1,293 @@
+"""
+tests/test_server.py
+"""
+
+import asyncio
+import json
+import random
+import pytest
+from euchre_core import EuchreError, actions
+from euchre_core import server as S
+from euchre_core.Deck import Deck
+
+ALL_CARDS = Deck().cards
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 20))
+
+
+async def play(server, clients, table_id, seed, moves=None):
+    """
+    Drive a table with random legal actions, each sent by the seat it
+    belongs to, waiting on the view of seat 0.
+    """
+    rng = random.Random(seed)
+    game = server.tables[table_id].game
+    count = 0
+    while game.state != 8 and (moves is None or count < moves):
+        action, data = rng.choice(game.legal_actions())
+        seat = game.engine.seat if action not in ("start", "continue") else 0
+        version = game.version
+        clients[seat].act(table_id, seat, action, data)
+        await clients[0].wait_version(table_id, 0, version + 1)
+        count += 1
+    return game
+
+
+async def join_all(client, table_id):
+    for seat in range(4): await client.join(table_id, seat)
+
+
+class Mute:
+    """A raw connection that sends frames and never reads its replies."""
+    def __init__(self, writer):
+        self.writer = writer
+
+    def act(self, table_id, seat, action, data=None):
+        code, data_code = actions.encode(action, data)
+        self.writer.write(S.frame(S.ACTION, S.MOVE.pack(table_id, seat, code, data_code)))
+
+
+def test_full_game_views_follow_the_table():
+    async def main():
+        server = S.EuchreServer()
+        clients = [await server.connect_local() for _ in range(4)]
+        table_id = await clients[0].create_table(11)
+        for seat, client in enumerate(clients):
+            view = await client.join(table_id, seat)
+            assert view["state"] == 0 and view["version"] == 0
+
+        game = await play(server, clients, table_id, 11)
+        assert game.state == 8 and table_id not in server.tables
+        for seat, client in enumerate(clients):
+            view = await client.wait_version(table_id, seat, game.version)
+            assert view == _json(game.observation_for(seat))
+
+        for client in clients: await client.close()
+        await server.close()
+    run(main())
+
+
+def _json(view):
+    return json.loads(json.dumps(view, ensure_ascii=False))
+
+
+def test_seats_belong_to_the_first_join():
+    async def main():
+        server = S.EuchreServer()
+        owner, other = await server.connect_local(), await server.connect_local()
+        table_id = await owner.create_table(3)
+        await owner.join(table_id, 0)
+        await owner.join(table_id, 0)
+        with pytest.raises(EuchreError, match="taken"):
+            await other.join(table_id, 0)
+
+        other.act(table_id, 0, "start")
+        kind, _, message = await other.recv()
+        assert kind == S.ERROR and "not joined" in message
+        assert server.tables[table_id].game.state == 0
+
+        # the seat is free again once its owner leaves
+        await other.join(table_id, 1)
+        await owner.close()
+        await asyncio.sleep(0.05)
+        await other.join(table_id, 0)
+        await other.close()
+        await server.close()
+    run(main())
+
+
+def test_table_is_removed_when_its_last_subscriber_leaves():
+    async def main():
+        server = S.EuchreServer()
+        client = await server.connect_local()
+        table_id = await client.create_table(3)
+        await join_all(client, table_id)
+        task = server.tables[table_id].task
+        await client.close()
+        await asyncio.sleep(0.05)
+        assert table_id not in server.tables and task.cancelled()
+        await server.close()
+    run(main())
+
+
+def test_full_inbox_is_an_error(monkeypatch):
+    monkeypatch.setattr(S, "INBOX_SIZE", 4)
+    async def main():
+        server = S.EuchreServer()
+        client = await server.connect_local()
+        table_id = await client.create_table(3)
+        await join_all(client, table_id)
+
+        # one write, so the server reads every frame before the table runs
+        code, data_code = actions.encode("start")
+        client.writer.write(S.frame(S.ACTION, S.MOVE.pack(table_id, 0, code, data_code)) * 20)
+        replies = [await client.recv() for _ in range(19)]
+        assert {kind for kind, _, _ in replies} == {S.ERROR}
+        assert sum("inbox is full" in message for _, _, message in replies) == 16
+        view = await client.wait_version(table_id, 0, 1)
+        assert view["state"] == 1
+        await client.close()
+        await server.close()
+    run(main())
+
+
+def test_action_from_wrong_seat_is_an_error():
+    async def main():
+        server = S.EuchreServer()
+        client = await server.connect_local()
+        table_id = await client.create_table(3)
+        await join_all(client, table_id)
+        client.act(table_id, 1, "start")
+        await client.wait_version(table_id, 1, 1)
+
+        wrong = (server.tables[table_id].game.engine.seat + 1) % 4
+        client.act(table_id, wrong, "pass")
+        kind, got_table, message = await client.recv()
+        assert (kind, got_table) == (S.ERROR, table_id)
+        assert "not the seat to act" in message
+
+        client.act(table_id, server.tables[table_id].game.engine.seat, "play", "9♣")
+        kind, _, message = await client.recv()
+        assert kind == S.ERROR and "Unhandled Action" in message
+        await client.close()
+        await server.close()
+    run(main())
+
+
+def test_illegal_actions_leave_the_table_running():
+    async def main():
+        server = S.EuchreServer()
+        client = await server.connect_local()
+        table_id = await client.create_table(3)
+        game = server.tables[table_id].game
+        await join_all(client, table_id)
+        client.act(table_id, 0, "start")
+        await client.wait_version(table_id, 0, 1)
+
+        client.act(table_id, game.engine.seat, "order")
+        await client.wait_version(table_id, 0, 2)
+        dealer = game.engine.dealer
+        missing = next(card for card in ALL_CARDS if card not in game.engine.get_hand(dealer))
+
+        # an up-card the dealer does not hold, and a bad data code
+        client.act(table_id, dealer, "up", missing)
+        client.writer.write(S.frame(S.ACTION, S.MOVE.pack(table_id, dealer, actions.UP, 100)))
+        replies = [await client.recv(), await client.recv()]
+        assert {kind for kind, _, _ in replies} == {S.ERROR}
+        messages = " ".join(message for _, _, message in replies)
+        assert "not a legal up" in messages and "Unknown table, action or data" in messages
+        assert game.state == 2 and not server.tables[table_id].task.done()
+
+        client.act(table_id, dealer, "up", game.engine.get_hand(dealer)[0])
+        view = await client.wait_version(table_id, 0, 3)
+        assert view["state"] == 5
+
+        client.act(table_id, game.engine.seat, "play", missing)
+        kind, _, message = await client.recv()
+        assert kind == S.ERROR and "not a legal play" in message
+        await client.close()
+        await server.close()
+    run(main())
+
+
+def test_make_with_card_data_is_an_error():
+    async def main():
+        server = S.EuchreServer()
+        client = await server.connect_local()
+        table_id = await client.create_table(4)
+        game = server.tables[table_id].game
+        await join_all(client, table_id)
+        client.act(table_id, 0, "start")
+        await client.wait_version(table_id, 0, 1)
+        for version in range(2, 6):
+            client.act(table_id, game.engine.seat, "pass")
+            await client.wait_version(table_id, 0, version)
+        assert game.state == 3
+
+        client.writer.write(S.frame(S.ACTION, S.MOVE.pack(table_id, game.engine.seat, actions.MAKE, 0)))
+        kind, _, message = await client.recv()
+        assert kind == S.ERROR and "not a legal make" in message
+
+        suit = next(suit for _, suit in game.legal_actions() if suit is not None)
+        client.act(table_id, game.engine.seat, "make", suit)
+        view = await client.wait_version(table_id, 0, 6)
+        assert view["trump"] == suit
+        await client.close()
+        await server.close()
+    run(main())
+
+
+def test_join_unknown_table():
+    async def main():
+        server = S.EuchreServer()
+        client = await server.connect_local()
+        with pytest.raises(EuchreError):
+            await client.join(42, 0)
+        await client.close()
+        await server.close()
+    run(main())
+
+
+def test_client_that_never_reads_does_not_block_tables():
+    async def main():
+        server = S.EuchreServer()
+        listener = await server.serve_tcp("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        slow = Mute(writer)
+        clients = [await server.connect_local() for _ in range(3)]
+        tables = [await clients[0].create_table(seed) for seed in range(20)]
+        for table_id in tables:
+            for seat, client in enumerate(clients): await client.join(table_id, seat)
+            slow.writer.write(S.frame(S.JOIN, S.SEAT.pack(table_id, 3)))
+
+        # seat 3 plays through the connection that never reads
+        games = await asyncio.gather(*(play(server, clients + [slow], t, t) for t in tables))
+        assert all(game.state == 8 for game in games)
+        for client in clients: await client.close()
+        writer.close()
+        await server.close()
+    run(main())
+
+
+def test_many_tables_with_coalesced_deltas():
+    async def main():
+        server = S.EuchreServer()
+        players = [await server.connect_local() for _ in range(4)]
+        tables = [server.create_table(seed).table_id for seed in range(200)]
+        for table_id in tables:
+            for seat, client in enumerate(players): await client.join(table_id, seat)
+
+        await asyncio.gather(*(play(server, players, t, t, moves=12) for t in tables))
+        for table_id in tables:
+            game = server.tables[table_id].game
+            for seat, client in enumerate(players):
+                view = await client.wait_version(table_id, seat, game.version)
+                assert view == _json(game.observation_for(seat))
+        for client in players: await client.close()
+        await server.close()
+    run(main())
+
+
+def test_tcp_and_unix_listeners(tmp_path):
+    async def main():
+        server = S.EuchreServer()
+        listener = await server.serve_tcp("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        tcp = S.Client(*await asyncio.open_connection("127.0.0.1", port))
+        table_id = await tcp.create_table(5)
+
+        await server.serve_unix(str(tmp_path / "euchre.sock"))
+        unix = S.Client(*await asyncio.open_unix_connection(str(tmp_path / "euchre.sock")))
+        view = await unix.join(table_id, 2)
+        assert len(view["hand"]) == 0
+
+        unix.act(table_id, 2, "start")
+        view = await unix.wait_version(table_id, 2, 1)
+        assert view["state"] == 1 and len(view["hand"]) == 5
+
+        await tcp.close()
+        await unix.close()
+        await server.close()
+    run(main())
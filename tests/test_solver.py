@@ -0,0 +1,110 @@
+"""
+tests/test_solver.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreEngine, MaskEngine, EuchreError, team_of
+from euchre_core import masks
+from euchre_core.solver import DoubleDummy, solve
+
+
+def brute_force(engine):
+    """Plain minimax over apply/undo: team 0's tricks from here."""
+    if engine.is_hand_finished():
+        return 0
+    values = []
+    for card in engine.playable_cards():
+        before = engine._tricks_taken[0]
+        record = engine.apply(card)
+        values.append(engine._tricks_taken[0] - before + brute_force(engine))
+        engine.undo(record)
+    return max(values) if engine.seat % 2 == 0 else min(values)
+
+
+def trick_play_engine(seed, tricks_to_play=0, alone=False):
+    rng = random.Random(seed)
+    engine = EuchreEngine(seed)
+    engine.start_hand()
+    engine.order_up()
+    if alone: engine.go_alone()
+    engine.pick_up(engine.get_hand(engine.dealer)[0])
+    engine.set_order(engine.dealer + 1)
+
+    while engine.tricks_played < tricks_to_play:
+        engine.apply(rng.choice(engine.playable_cards()))
+    return engine
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_matches_brute_force_three_tricks_left(seed):
+    engine = trick_play_engine(seed, tricks_to_play=2)
+    before = engine._tricks_taken[0]
+    expected = brute_force(engine)
+
+    result = solve(engine)
+    assert result.tricks[0] == before + expected
+    assert sum(result.tricks) == 5
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_brute_force_mid_trick(seed):
+    engine = trick_play_engine(seed, tricks_to_play=2)
+    engine.apply(engine.playable_cards()[0])
+    engine.apply(engine.playable_cards()[-1])
+    before = engine._tricks_taken[0]
+
+    assert solve(engine).tricks[0] == before + brute_force(engine)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_brute_force_alone(seed):
+    engine = trick_play_engine(seed, tricks_to_play=1, alone=True)
+    before = engine._tricks_taken[0]
+
+    assert solve(engine).tricks[0] == before + brute_force(engine)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_best_card_keeps_the_value(seed):
+    engine = trick_play_engine(seed)
+    result = solve(engine)
+
+    # following the solver's card never changes the solved outcome
+    while not engine.is_hand_finished():
+        step = solve(engine)
+        assert step.tricks == result.tricks
+        engine.apply(step.best_card)
+
+    assert tuple(engine._tricks_taken) == result.tricks
+
+
+def test_mask_engine_is_accepted():
+    strings = trick_play_engine(3)
+    ints = MaskEngine(3)
+    ints.start_hand()
+    ints.order_up()
+    ints.pick_up(strings.discard)
+    ints.set_order(ints.dealer + 1)
+
+    assert solve(ints).tricks == solve(strings).tricks
+
+
+def test_equivalent_cards_are_merged():
+    trump = masks.suit_index("♠")
+    solver = DoubleDummy(trump)
+    hands = [
+        masks.to_mask(["A♥", "K♥", "9♣"]),
+        masks.to_mask(["Q♥", "10♣", "9♦"]),
+        masks.to_mask(["J♥", "10♥", "A♦"]),
+        masks.to_mask(["9♥", "K♦", "Q♦"]),
+    ]
+    moves = [masks.card_name(c) for c in solver._moves(hands, [], 0)]
+    assert "A♥" in moves and "K♥" not in moves
+
+
+def test_trump_required():
+    engine = EuchreEngine(1)
+    engine.start_hand()
+    with pytest.raises(EuchreError):
+        solve(engine)
@@ -0,0 +1,91 @@
+"""
+tests/test_tablebase.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreError
+from euchre_core import masks
+from euchre_core import tablebase as TB
+from euchre_core.canonical import SUIT_PERMUTATIONS, permute_mask
+from euchre_core.solver import DoubleDummy, NOBODY, solve
+from test_solver import trick_play_engine
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("tablebase") / "tablebase.bin"
+    TB.build(str(path), 2)
+    with TB.Tablebase(str(path)) as table:
+        yield table
+
+
+def random_position(rng, tricks, sitting_out=NOBODY):
+    cards = rng.sample(range(masks.NUM_CARDS), 4 * tricks)
+    hands = [0, 0, 0, 0]
+    for seat in range(4):
+        if seat == sitting_out: continue
+        for card in cards[seat * tricks:(seat + 1) * tricks]: hands[seat] |= 1 << card
+    return hands
+
+
+@pytest.mark.parametrize("sitting_out", [NOBODY, 0, 1, 2, 3])
+def test_probe_matches_search(table, sitting_out):
+    rng = random.Random(sitting_out)
+    for _ in range(300):
+        tricks = rng.choice((1, 2))
+        hands = random_position(rng, tricks, sitting_out)
+        leader = rng.choice([seat for seat in range(4) if seat != sitting_out])
+        trump = rng.randrange(4)
+
+        team0, _ = DoubleDummy(trump, sitting_out).solve(hands, leader)
+        value = table.probe(hands, leader, trump, sitting_out)
+        assert (value if leader % 2 == 0 else tricks - value) == team0
+
+
+def test_off_suit_relabeling_keeps_value(table):
+    rng = random.Random(7)
+    for _ in range(200):
+        hands = random_position(rng, 2)
+        trump = rng.randrange(4)
+        for perm in SUIT_PERMUTATIONS:
+            if perm[trump] != trump: continue
+            moved = [permute_mask(hand, perm) for hand in hands]
+            assert table.probe(moved, 1, trump) == table.probe(hands, 1, trump)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_solver_with_tablebase_agrees(table, seed):
+    for alone in (False, True):
+        engine = trick_play_engine(seed, tricks_to_play=seed % 3, alone=alone)
+        searched = solve(engine)
+        probed = solve(engine, table)
+        assert probed.tricks == searched.tricks
+        assert probed.nodes <= searched.nodes
+
+
+def test_probe_rejects_positions_outside_the_table(table):
+    hands = random_position(random.Random(0), 3)
+    with pytest.raises(EuchreError):
+        table.probe(hands, 0, 0)
+
+
+def test_build_rejects_trick_count(tmp_path):
+    with pytest.raises(EuchreError):
+        TB.build(str(tmp_path / "t.bin"), 4)
+
+
+def test_rejects_bad_files(tmp_path):
+    path = tmp_path / "t.bin"
+    TB.build(str(path), 1)
+    with TB.Tablebase(str(path)) as table:
+        assert table.tricks == 1
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-1])
+    with pytest.raises(EuchreError):
+        TB.Tablebase(str(path))
+
+    path.write_bytes(b"XXXX" + data[4:])
+    with pytest.raises(EuchreError):
+        TB.Tablebase(str(path))
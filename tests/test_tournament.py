@@ -0,0 +1,43 @@
+"""
+tests/test_tournament.py
+"""
+
+from euchre_core import tournament as T
+from euchre_core.seeds import split_seed
+from euchre_core.tournament import play_game, run_games, tournament, TournamentStats
+from euchre_core.bots import random_bot, passive_bot
+
+
+def test_play_game_finishes_and_is_reproducible():
+    result = play_game([random_bot, random_bot], split_seed(3, 5), 5)
+    assert max(result.points) >= 10
+    assert result.complete and result.winner == (0 if result.points[0] > result.points[1] else 1)
+    assert result == play_game([random_bot, random_bot], split_seed(3, 5), 5)
+
+
+def test_any_game_reproduces_from_its_index():
+    results = list(run_games([random_bot, passive_bot], 20, seed=11, workers=2, batch=3))
+    assert [r.index for r in results] == list(range(20))
+
+    again = results[13]
+    assert play_game([random_bot, passive_bot], split_seed(11, 13), 13) == again
+
+
+def test_tournament_aggregates_stream():
+    seen = []
+    stats = tournament([random_bot, random_bot], 12, seed=1, workers=0, batch=5, on_result=seen.append)
+    assert stats.games == 12 == len(seen)
+    assert sum(stats.wins) == 12
+    assert stats.points[0] == sum(r.points[0] for r in seen)
+
+
+def test_game_stopped_at_max_hands_has_no_winner(monkeypatch):
+    monkeypatch.setattr(T, "MAX_HANDS", 1)
+    result = play_game([passive_bot, passive_bot], split_seed(2, 0))
+    assert not result.complete
+    assert result.winner is None
+
+    stats = TournamentStats()
+    stats.add(result)
+    assert stats.wins == [0, 0]
+    assert stats.incomplete == 1
@@ -0,0 +1,84 @@
+"""
+tests/test_trump_table.py
+"""
+
+import random
+import pytest
+from euchre_core import EuchreError, effective_suit
+from euchre_core import deals
+from euchre_core import trump_table as T
+from euchre_core.Deck import Deck, SUITS
+from euchre_core.masks import to_mask
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("trump") / "table.bin"
+    T.build(str(path))
+    with T.TrumpTable(str(path)) as table:
+        yield table
+
+
+def by_strings(hand, trump):
+    """The features computed from card strings."""
+    suits = [effective_suit(card, trump) for card in hand]
+    trumps = suits.count(trump)
+    off_aces = sum(1 for card, suit in zip(hand, suits) if suit != trump and card[:-1] == "A")
+    voids = sum(1 for suit in SUITS if suit != trump and suit not in suits)
+    return trumps, f"J{trump}" in hand, off_aces, voids
+
+
+def test_hand_index_round_trip():
+    for index in [0, 1, deals.NUM_HANDS - 1] + random.Random(0).sample(range(deals.NUM_HANDS), 500):
+        assert deals.hand_index(deals.hand_at(index)) == index
+    assert deals.NUM_HANDS == 42504
+
+
+def test_lookup_matches_string_rules(table):
+    rng = random.Random(1)
+    cards = Deck().cards
+    for _ in range(500):
+        hand = rng.sample(cards, 5)
+        for trump in SUITS:
+            got = table.features(hand, trump)
+            assert (got.trumps, got.right, got.off_aces, got.voids) == by_strings(hand, trump)
+            assert got == T.features_of(to_mask(hand), SUITS.index(trump))
+
+
+def test_strength_orders_obvious_hands(table):
+    strong = table.features(["J♥", "J♦", "A♥", "K♥", "A♣"], "♥")
+    weak = table.features(["9♥", "10♣", "Q♦", "K♣", "9♠"], "♥")
+    assert strong == T.TrumpFeatures(4, True, True, 1, 2, 26)
+    assert weak.strength < strong.strength
+    assert weak.left is False
+
+
+def test_every_record_is_written(table):
+    for index in range(0, deals.NUM_HANDS, 997):
+        hand = deals.hand_at(index)
+        for trump in range(4):
+            assert table.lookup(hand, trump) == T.features_of(hand, trump)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"EULG" + bytes(60))
+    with pytest.raises(EuchreError):
+        T.TrumpTable(str(path))
+
+    path.write_bytes(T.HEADER.pack(b"EUTT", T.VERSION, deals.NUM_HANDS) + bytes(8))
+    with pytest.raises(EuchreError):
+        T.TrumpTable(str(path))
+
+
+def test_lookup_rejects_hands_that_are_not_five_cards(table):
+    hand = deals.hand_at(7)
+    for bad in (0, hand & (hand - 1), hand | 1 << 23 | 1 << 22, -1, 1 << 30 | hand):
+        with pytest.raises(EuchreError):
+            table.lookup(bad, 0)
+    with pytest.raises(EuchreError):
+        table.lookup(hand, 4)
+    with pytest.raises(EuchreError):
+        table.features(["9♣", "9♣", "10♣", "J♣", "Q♣"], "♣")
+    with pytest.raises(EuchreError):
+        table.features(["9♣", "10♣", "J♣", "Q♣"], "♣")